@@ -15,14 +15,16 @@ from unfold.enums import ActionVariant
 
 from django.contrib import admin, messages
 from django.db.models import Count, Q, Sum
-from django.http import HttpResponse
+from django.http import FileResponse
 from django.shortcuts import redirect
 from django.template.response import TemplateResponse
 from django.urls import reverse_lazy
 from django.utils import timezone
 from django.utils.html import format_html
 
+from assets.services.catalogue import bump_catalogue_version
 from assets.services.print_dispatch import dispatch_print_job
+from assets.services.statistics import tracking_asset_statistics
 
 from .models import (
     Asset,
@@ -403,32 +405,52 @@ class AssetAdmin(ModelAdmin):
         variant=ActionVariant.PRIMARY,
     )
     def export_selected_xlsx(self, request, queryset):
-        from .services.export import export_assets_xlsx
-
-        buffer = export_assets_xlsx(queryset)
-        response = HttpResponse(
-            buffer.getvalue(),
-            content_type="application/vnd.openxmlformats-officedocument"
-            ".spreadsheetml.sheet",
+        from .services.export import (
+            XLSX_CONTENT_TYPE,
+            export_assets_xlsx_file,
+        )
+        from .services.export_jobs import (
+            SYNC_EXPORT_MAX_ASSETS,
+            export_params,
+            request_export,
         )
+
+        asset_ids = list(queryset.values_list("pk", flat=True))
+        if len(asset_ids) > SYNC_EXPORT_MAX_ASSETS:
+            job = request_export(
+                export_params(asset_ids=asset_ids), request.user
+            )
+            return redirect("assets:export_job_status", job_id=job.job_id)
+
         from datetime import date
 
         filename = f"props-assets-export-{date.today().isoformat()}.xlsx"
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
-        return response
+        # Streamed from a spooled file; FileResponse closes it when done
+        return FileResponse(
+            export_assets_xlsx_file(queryset),
+            as_attachment=True,
+            filename=filename,
+            content_type=XLSX_CONTENT_TYPE,
+        )
 
     export_selected_xlsx.short_description = "Export selected to Excel"
 
     @action(description="Mark as active")
     def mark_active(self, request, queryset):
-        updated = queryset.exclude(status="disposed").update(status="active")
+        targets = queryset.exclude(status="disposed")
+        with tracking_asset_statistics(targets):
+            updated = targets.update(status="active")
+        bump_catalogue_version()
         messages.success(request, f"{updated} asset(s) marked as active.")
 
     mark_active.short_description = "Mark as active"
 
     @action(description="Mark as retired")
     def mark_retired(self, request, queryset):
-        updated = queryset.exclude(status="disposed").update(status="retired")
+        targets = queryset.exclude(status="disposed")
+        with tracking_asset_statistics(targets):
+            updated = targets.update(status="retired")
+        bump_catalogue_version()
         messages.success(request, f"{updated} asset(s) marked as retired.")
 
     mark_retired.short_description = "Mark as retired"
@@ -548,7 +570,9 @@ class AssetAdmin(ModelAdmin):
             cat_id = request.POST.get("category")
             if cat_id:
                 category = Category.objects.get(pk=cat_id)
-                count = queryset.update(category=category)
+                with tracking_asset_statistics(queryset):
+                    count = queryset.update(category=category)
+                bump_catalogue_version()
                 messages.success(
                     request,
                     f"{count} asset(s) category changed to {category.name}.",
@@ -0,0 +1,50 @@
+"""Build missing responsive renditions for existing asset images."""
+
+from django.core.management.base import BaseCommand
+
+from assets.models import AssetImage
+from assets.services.images import process_asset_image, variant_formats
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the WebP/AVIF srcset renditions of asset images that do "
+        "not have them yet, e.g. images uploaded before they existed, "
+        "after enabling IMAGE_AVIF_RENDITIONS, or while the broker was "
+        "down. Images still pending AI analysis are re-queued too."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--now",
+            action="store_true",
+            help="Build in this process instead of queueing Celery tasks.",
+        )
+
+    def handle(self, *args, **options):
+        from assets.tasks import process_asset_image as task
+
+        images = AssetImage.objects.exclude(image="")
+        # Never picked up, e.g. the upload could not reach the broker
+        image_ids = set(
+            images.filter(ai_processing_status="pending").values_list(
+                "pk", flat=True
+            )
+        )
+        for fmt in variant_formats():
+            image_ids.update(
+                images.exclude(renditions__format=fmt).values_list(
+                    "pk", flat=True
+                )
+            )
+        for image_id in sorted(image_ids):
+            if options["now"]:
+                process_asset_image(image_id)
+            else:
+                task.delay(image_id)
+        verb = "Built" if options["now"] else "Queued"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} renditions for {len(image_ids)} image(s)."
+            )
+        )
@@ -0,0 +1,18 @@
+"""Rebuild the scan identifier registry from source tables."""
+
+from django.core.management.base import BaseCommand
+
+from assets.services.identifiers import rebuild_identifier_registry
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the AssetIdentifier scan registry from asset barcodes, "
+        "serial barcodes, disposed-serial history and active NFC tags."
+    )
+
+    def handle(self, *args, **options):
+        count = rebuild_identifier_registry()
+        self.stdout.write(
+            self.style.SUCCESS(f"Registered {count} identifier(s).")
+        )
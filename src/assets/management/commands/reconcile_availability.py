@@ -0,0 +1,39 @@
+"""Verify and repair the maintained asset availability counters."""
+
+from django.core.management.base import BaseCommand
+
+from assets.services.availability import reconcile_availability_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare each asset's availability counters with its "
+        "transactions and serials, and optionally repair them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Rewrite counters that do not match the source tables.",
+        )
+
+    def handle(self, *args, **options):
+        mismatches = reconcile_availability_counters(fix=options["fix"])
+        for asset_pk, field, stored, expected in mismatches:
+            self.stdout.write(
+                f"Asset {asset_pk}: {field} is {stored}, expected {expected}"
+            )
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS("All counters match."))
+        elif options["fix"]:
+            self.stdout.write(
+                self.style.SUCCESS(f"Repaired {len(mismatches)} counter(s).")
+            )
+        else:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{len(mismatches)} counter(s) differ; "
+                    "run with --fix to repair."
+                )
+            )
@@ -0,0 +1,44 @@
+"""Verify and repair the maintained dashboard statistics."""
+
+from django.core.management.base import BaseCommand
+
+from assets.services.statistics import reconcile_asset_statistics
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the dashboard's asset statistics with counts from the "
+        "asset table, and optionally repair them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Correct statistics that do not match the asset table.",
+        )
+
+    def handle(self, *args, **options):
+        mismatches = reconcile_asset_statistics(fix=options["fix"])
+        for (
+            (dimension, key, department, status),
+            stored,
+            expected,
+        ) in mismatches:
+            self.stdout.write(
+                f"{dimension} {key} (department {department}, {status}): "
+                f"{stored}, expected {expected}"
+            )
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS("All statistics match."))
+        elif options["fix"]:
+            self.stdout.write(
+                self.style.SUCCESS(f"Repaired {len(mismatches)} statistic(s).")
+            )
+        else:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{len(mismatches)} statistic(s) differ; "
+                    "run with --fix to repair."
+                )
+            )
@@ -0,0 +1,167 @@
+"""Add the AssetIdentifier scan registry and backfill it."""
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+KIND_PRIORITY = {
+    "barcode": 0,
+    "serial": 1,
+    "retired_serial": 2,
+    "nfc": 3,
+}
+
+
+def backfill_identifiers(apps, schema_editor):
+    """Register every existing barcode, serial barcode and NFC tag."""
+    Asset = apps.get_model("assets", "Asset")
+    AssetSerial = apps.get_model("assets", "AssetSerial")
+    AssetIdentifier = apps.get_model("assets", "AssetIdentifier")
+    NFCTag = apps.get_model("assets", "NFCTag")
+    Transaction = apps.get_model("assets", "Transaction")
+
+    def row(kind, value, asset_id, **extra):
+        return AssetIdentifier(
+            key=value.strip().upper(),
+            value=value,
+            kind=kind,
+            priority=KIND_PRIORITY[kind],
+            asset_id=asset_id,
+            **extra,
+        )
+
+    rows = [
+        row("barcode", barcode, pk)
+        for pk, barcode in Asset.objects.exclude(barcode="").values_list(
+            "pk", "barcode"
+        )
+    ]
+    rows += [
+        row(
+            "serial",
+            barcode,
+            asset_id,
+            serial_id=pk,
+            is_disposed=status == "disposed",
+        )
+        for pk, asset_id, barcode, status in AssetSerial.objects.filter(
+            barcode__isnull=False
+        )
+        .exclude(barcode="")
+        .values_list("pk", "asset_id", "barcode", "status")
+    ]
+    rows += [
+        row(
+            "retired_serial",
+            barcode,
+            asset_id,
+            serial_id=serial_id,
+            is_disposed=True,
+        )
+        for serial_id, asset_id, barcode in Transaction.objects.filter(
+            serial__status="disposed", serial_barcode__isnull=False
+        )
+        .exclude(serial_barcode="")
+        .values_list("serial_id", "serial__asset_id", "serial_barcode")
+        .order_by()
+        .distinct()
+    ]
+    rows += [
+        row("nfc", tag_id, asset_id, nfc_tag_id=pk, serial_id=serial_id)
+        for pk, asset_id, serial_id, tag_id in NFCTag.objects.filter(
+            removed_at__isnull=True
+        ).values_list("pk", "asset_id", "serial_id", "tag_id")
+    ]
+    AssetIdentifier.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0039_asset_search_vector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AssetIdentifier",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "key",
+                    models.CharField(
+                        help_text="Normalised (upper-case) lookup key",
+                        max_length=100,
+                    ),
+                ),
+                (
+                    "value",
+                    models.CharField(
+                        help_text="Identifier as originally recorded",
+                        max_length=100,
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("barcode", "Asset barcode"),
+                            ("serial", "Serial barcode"),
+                            ("retired_serial", "Retired serial barcode"),
+                            ("nfc", "NFC tag"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("priority", models.PositiveSmallIntegerField(default=0)),
+                ("is_disposed", models.BooleanField(default=False)),
+                (
+                    "asset",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="identifiers",
+                        to="assets.asset",
+                    ),
+                ),
+                (
+                    "nfc_tag",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="identifiers",
+                        to="assets.nfctag",
+                    ),
+                ),
+                (
+                    "serial",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="identifiers",
+                        to="assets.assetserial",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["priority", "-pk"],
+                "indexes": [
+                    models.Index(
+                        fields=["key", "priority"],
+                        name="idx_identifier_key_priority",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(
+            backfill_identifiers,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
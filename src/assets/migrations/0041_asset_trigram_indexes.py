@@ -0,0 +1,48 @@
+"""Add pg_trgm GIN indexes on Asset name and barcode for autocomplete."""
+
+from django.db import migrations
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """Create trigram indexes (PostgreSQL only).
+
+    Indexed on ``UPPER(col::text)`` to match the expression Django
+    emits for ``icontains``/``istartswith`` lookups.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("""
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+        CREATE INDEX IF NOT EXISTS idx_asset_name_trgm
+            ON assets_asset
+            USING gin (UPPER(name::text) gin_trgm_ops);
+
+        CREATE INDEX IF NOT EXISTS idx_asset_barcode_trgm
+            ON assets_asset
+            USING gin (UPPER(barcode::text) gin_trgm_ops);
+        """)
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    """Drop the trigram indexes (reverse)."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("""
+        DROP INDEX IF EXISTS idx_asset_name_trgm;
+        DROP INDEX IF EXISTS idx_asset_barcode_trgm;
+        """)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0040_asset_identifier_registry"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_trigram_indexes,
+            reverse_code=drop_trigram_indexes,
+        ),
+    ]
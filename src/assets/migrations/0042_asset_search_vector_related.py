@@ -0,0 +1,310 @@
+"""Fold tags, category, department, location and serials into search_vector.
+
+Replaces the name/description-only trigger from 0039 with one that also
+indexes related text, and adds triggers on the related tables so the
+stored vector stays current when tags, categories, departments,
+locations or serials change.
+
+Weights: name A; description and tag names B; category and department
+C; location path and serial numbers D.
+"""
+
+from django.db import migrations
+
+CREATE_SQL = """
+    CREATE OR REPLACE FUNCTION assets_asset_build_search_vector(
+        p_asset_id bigint,
+        p_name text,
+        p_description text,
+        p_category_id bigint,
+        p_location_id bigint
+    ) RETURNS tsvector AS $$
+    DECLARE
+        v_tags text;
+        v_category text;
+        v_location text;
+        v_serials text;
+    BEGIN
+        SELECT string_agg(t.name, ' ') INTO v_tags
+        FROM assets_asset_tags at
+        JOIN assets_tag t ON t.id = at.tag_id
+        WHERE at.asset_id = p_asset_id;
+
+        SELECT concat_ws(' ', c.name, d.name) INTO v_category
+        FROM assets_category c
+        LEFT JOIN assets_department d ON d.id = c.department_id
+        WHERE c.id = p_category_id;
+
+        -- UNION (not UNION ALL) so a parent cycle cannot recurse forever
+        WITH RECURSIVE ancestors(id, name, parent_id) AS (
+            SELECT id, name, parent_id
+            FROM assets_location
+            WHERE id = p_location_id
+            UNION
+            SELECT l.id, l.name, l.parent_id
+            FROM assets_location l
+            JOIN ancestors a ON l.id = a.parent_id
+        )
+        SELECT string_agg(name, ' ') INTO v_location FROM ancestors;
+
+        SELECT string_agg(serial_number, ' ') INTO v_serials
+        FROM assets_assetserial
+        WHERE asset_id = p_asset_id AND NOT is_archived;
+
+        RETURN
+            setweight(to_tsvector('english', coalesce(p_name, '')), 'A') ||
+            setweight(
+                to_tsvector('english', coalesce(p_description, '')), 'B'
+            ) ||
+            setweight(to_tsvector('english', coalesce(v_tags, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(v_category, '')), 'C') ||
+            setweight(to_tsvector('english', coalesce(v_location, '')), 'D') ||
+            setweight(to_tsvector('simple', coalesce(v_serials, '')), 'D');
+    END;
+    $$ LANGUAGE plpgsql STABLE;
+
+    CREATE OR REPLACE FUNCTION assets_asset_refresh_search_vector(
+        p_asset_ids bigint[]
+    ) RETURNS void AS $$
+        UPDATE assets_asset a
+        SET search_vector = assets_asset_build_search_vector(
+            a.id, a.name, a.description, a.category_id,
+            a.current_location_id
+        )
+        WHERE a.id = ANY(p_asset_ids);
+    $$ LANGUAGE sql;
+
+    -- Asset row: recompute on insert and on searchable column changes
+    CREATE OR REPLACE FUNCTION assets_asset_search_vector_update()
+    RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := assets_asset_build_search_vector(
+            NEW.id, NEW.name, NEW.description, NEW.category_id,
+            NEW.current_location_id
+        );
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS assets_asset_search_vector_trigger
+        ON assets_asset;
+
+    CREATE TRIGGER assets_asset_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF
+            name, description, category_id, current_location_id
+        ON assets_asset
+        FOR EACH ROW
+        EXECUTE FUNCTION assets_asset_search_vector_update();
+
+    -- Rows carrying an asset_id: tag through-table and serials
+    CREATE OR REPLACE FUNCTION assets_asset_child_search_vector_update()
+    RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM assets_asset_refresh_search_vector(
+                ARRAY[OLD.asset_id]::bigint[]
+            );
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            PERFORM assets_asset_refresh_search_vector(
+                ARRAY[NEW.asset_id]::bigint[]
+            );
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS assets_asset_tags_search_vector_trigger
+        ON assets_asset_tags;
+
+    CREATE TRIGGER assets_asset_tags_search_vector_trigger
+        AFTER INSERT OR UPDATE OR DELETE
+        ON assets_asset_tags
+        FOR EACH ROW
+        EXECUTE FUNCTION assets_asset_child_search_vector_update();
+
+    DROP TRIGGER IF EXISTS assets_assetserial_search_vector_trigger
+        ON assets_assetserial;
+
+    CREATE TRIGGER assets_assetserial_search_vector_trigger
+        AFTER INSERT OR DELETE OR UPDATE OF
+            serial_number, asset_id, is_archived
+        ON assets_assetserial
+        FOR EACH ROW
+        EXECUTE FUNCTION assets_asset_child_search_vector_update();
+
+    -- Renamed tags
+    CREATE OR REPLACE FUNCTION assets_tag_search_vector_update()
+    RETURNS trigger AS $$
+    BEGIN
+        PERFORM assets_asset_refresh_search_vector(ARRAY(
+            SELECT asset_id FROM assets_asset_tags WHERE tag_id = NEW.id
+        ));
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS assets_tag_search_vector_trigger ON assets_tag;
+
+    CREATE TRIGGER assets_tag_search_vector_trigger
+        AFTER UPDATE OF name
+        ON assets_tag
+        FOR EACH ROW
+        EXECUTE FUNCTION assets_tag_search_vector_update();
+
+    -- Renamed or re-parented categories
+    CREATE OR REPLACE FUNCTION assets_category_search_vector_update()
+    RETURNS trigger AS $$
+    BEGIN
+        PERFORM assets_asset_refresh_search_vector(ARRAY(
+            SELECT id FROM assets_asset WHERE category_id = NEW.id
+        ));
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS assets_category_search_vector_trigger
+        ON assets_category;
+
+    CREATE TRIGGER assets_category_search_vector_trigger
+        AFTER UPDATE OF name, department_id
+        ON assets_category
+        FOR EACH ROW
+        EXECUTE FUNCTION assets_category_search_vector_update();
+
+    -- Renamed departments
+    CREATE OR REPLACE FUNCTION assets_department_search_vector_update()
+    RETURNS trigger AS $$
+    BEGIN
+        PERFORM assets_asset_refresh_search_vector(ARRAY(
+            SELECT a.id
+            FROM assets_asset a
+            JOIN assets_category c ON c.id = a.category_id
+            WHERE c.department_id = NEW.id
+        ));
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS assets_department_search_vector_trigger
+        ON assets_department;
+
+    CREATE TRIGGER assets_department_search_vector_trigger
+        AFTER UPDATE OF name
+        ON assets_department
+        FOR EACH ROW
+        EXECUTE FUNCTION assets_department_search_vector_update();
+
+    -- Renamed or moved locations: every asset in the subtree
+    CREATE OR REPLACE FUNCTION assets_location_search_vector_update()
+    RETURNS trigger AS $$
+    BEGIN
+        PERFORM assets_asset_refresh_search_vector(ARRAY(
+            WITH RECURSIVE subtree(id) AS (
+                SELECT NEW.id
+                UNION
+                SELECT l.id
+                FROM assets_location l
+                JOIN subtree s ON l.parent_id = s.id
+            )
+            SELECT a.id
+            FROM assets_asset a
+            WHERE a.current_location_id IN (SELECT id FROM subtree)
+        ));
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS assets_location_search_vector_trigger
+        ON assets_location;
+
+    CREATE TRIGGER assets_location_search_vector_trigger
+        AFTER UPDATE OF name, parent_id
+        ON assets_location
+        FOR EACH ROW
+        EXECUTE FUNCTION assets_location_search_vector_update();
+"""
+
+DROP_SQL = """
+    DROP TRIGGER IF EXISTS assets_asset_tags_search_vector_trigger
+        ON assets_asset_tags;
+    DROP TRIGGER IF EXISTS assets_assetserial_search_vector_trigger
+        ON assets_assetserial;
+    DROP TRIGGER IF EXISTS assets_tag_search_vector_trigger ON assets_tag;
+    DROP TRIGGER IF EXISTS assets_category_search_vector_trigger
+        ON assets_category;
+    DROP TRIGGER IF EXISTS assets_department_search_vector_trigger
+        ON assets_department;
+    DROP TRIGGER IF EXISTS assets_location_search_vector_trigger
+        ON assets_location;
+    DROP FUNCTION IF EXISTS assets_asset_child_search_vector_update();
+    DROP FUNCTION IF EXISTS assets_tag_search_vector_update();
+    DROP FUNCTION IF EXISTS assets_category_search_vector_update();
+    DROP FUNCTION IF EXISTS assets_department_search_vector_update();
+    DROP FUNCTION IF EXISTS assets_location_search_vector_update();
+
+    -- Restore the 0039 name/description-only trigger
+    CREATE OR REPLACE FUNCTION assets_asset_search_vector_update()
+    RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.name, '')), 'A') ||
+            setweight(
+                to_tsvector('english', coalesce(NEW.description, '')), 'B'
+            );
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS assets_asset_search_vector_trigger
+        ON assets_asset;
+
+    CREATE TRIGGER assets_asset_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF name, description
+        ON assets_asset
+        FOR EACH ROW
+        EXECUTE FUNCTION assets_asset_search_vector_update();
+
+    DROP FUNCTION IF EXISTS assets_asset_refresh_search_vector(bigint[]);
+    DROP FUNCTION IF EXISTS
+        assets_asset_build_search_vector(bigint, text, text, bigint, bigint);
+
+    UPDATE assets_asset
+    SET search_vector =
+        setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B');
+"""
+
+
+def create_triggers(apps, schema_editor):
+    """Install the extended triggers and backfill (PostgreSQL only)."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(CREATE_SQL)
+    schema_editor.execute("""
+        UPDATE assets_asset
+        SET search_vector = assets_asset_build_search_vector(
+            id, name, description, category_id, current_location_id
+        )
+        """)
+
+
+def drop_triggers(apps, schema_editor):
+    """Revert to the 0039 trigger (reverse)."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0041_asset_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_triggers,
+            reverse_code=drop_triggers,
+        ),
+    ]
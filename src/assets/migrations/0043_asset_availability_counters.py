@@ -0,0 +1,80 @@
+"""Add maintained availability counters to Asset and backfill them."""
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    """Compute every asset's counters from transactions and serials."""
+    Asset = apps.get_model("assets", "Asset")
+    AssetSerial = apps.get_model("assets", "AssetSerial")
+    Transaction = apps.get_model("assets", "Transaction")
+
+    def serial_count(**filters):
+        return Coalesce(
+            Subquery(
+                AssetSerial.objects.filter(
+                    asset=OuterRef("pk"), is_archived=False, **filters
+                )
+                .values("asset")
+                .annotate(count=Count("pk"))
+                .values("count")[:1],
+                output_field=models.IntegerField(),
+            ),
+            0,
+        )
+
+    outstanding = (
+        Transaction.objects.filter(asset=OuterRef("pk"))
+        .values("asset")
+        .annotate(
+            outstanding=Coalesce(
+                Sum("quantity", filter=Q(action="checkout")), 0
+            )
+            - Coalesce(Sum("quantity", filter=Q(action="checkin")), 0)
+        )
+        .values("outstanding")[:1]
+    )
+    Asset.objects.update(
+        checked_out_quantity=Coalesce(
+            Subquery(outstanding, output_field=models.IntegerField()), 0
+        ),
+        available_serial_count=serial_count(
+            status="active", checked_out_to__isnull=True
+        ),
+        checked_out_serial_count=serial_count(checked_out_to__isnull=False),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0042_asset_search_vector_related"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="asset",
+            name="available_serial_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="asset",
+            name="checked_out_quantity",
+            field=models.IntegerField(
+                default=0,
+                editable=False,
+                help_text="Outstanding checkout quantity from transactions",
+            ),
+        ),
+        migrations.AddField(
+            model_name="asset",
+            name="checked_out_serial_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            backfill_counters,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
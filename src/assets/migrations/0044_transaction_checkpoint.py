@@ -0,0 +1,63 @@
+"""Add TransactionCheckpoint for folded outstanding checkout quantities."""
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0043_asset_availability_counters"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TransactionCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("as_of_transaction_id", models.BigIntegerField(default=0)),
+                ("outstanding_quantity", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "asset",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ledger_checkpoints",
+                        to="assets.asset",
+                    ),
+                ),
+                (
+                    "serial",
+                    models.ForeignKey(
+                        blank=True,
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="assets.assetserial",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("asset", "serial"),
+                        name="unique_checkpoint_asset_serial",
+                    ),
+                    models.UniqueConstraint(
+                        condition=models.Q(("serial__isnull", True)),
+                        fields=("asset",),
+                        name="unique_checkpoint_asset_no_serial",
+                    ),
+                ],
+            },
+        ),
+    ]
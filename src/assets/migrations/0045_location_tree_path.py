@@ -0,0 +1,59 @@
+"""Add materialised tree_path and full_path to Location and backfill them."""
+
+from django.db import migrations, models
+
+
+def backfill_paths(apps, schema_editor):
+    """Compute every location's paths from the parent links."""
+    Location = apps.get_model("assets", "Location")
+    nodes = {
+        pk: (name, parent_id)
+        for pk, name, parent_id in Location.objects.values_list(
+            "pk", "name", "parent_id"
+        )
+    }
+    locations = []
+    for pk in nodes:
+        ids, names, seen, current = [], [], set(), pk
+        # Stop on a parent cycle rather than looping forever
+        while current in nodes and current not in seen:
+            seen.add(current)
+            ids.append(str(current))
+            name, current = nodes[current]
+            names.append(name)
+        locations.append(
+            Location(
+                pk=pk,
+                tree_path="".join(f"{i}/" for i in reversed(ids)),
+                full_path=" > ".join(reversed(names)),
+            )
+        )
+    Location.objects.bulk_update(
+        locations, ["tree_path", "full_path"], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0044_transaction_checkpoint"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="location",
+            name="full_path",
+            field=models.CharField(default="", editable=False, max_length=500),
+        ),
+        migrations.AddField(
+            model_name="location",
+            name="tree_path",
+            field=models.CharField(
+                db_index=True, default="", editable=False, max_length=255
+            ),
+        ),
+        migrations.RunPython(
+            backfill_paths,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
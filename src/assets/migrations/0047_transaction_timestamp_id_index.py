@@ -0,0 +1,23 @@
+"""Replace the Transaction timestamp index with (timestamp, id)."""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0046_export_job"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["timestamp", "id"], name="idx_transaction_ts_id"
+            ),
+        ),
+        migrations.RemoveIndex(
+            model_name="transaction",
+            name="idx_transaction_timestamp",
+        ),
+    ]
@@ -0,0 +1,120 @@
+"""Add the maintained AssetStatistic table and backfill it."""
+
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_statistics(apps, schema_editor):
+    """Count every asset into its category, location and tag rows."""
+    Asset = apps.get_model("assets", "Asset")
+    AssetStatistic = apps.get_model("assets", "AssetStatistic")
+    dept = "category__department_id"
+    counts = Counter()
+    for row in (
+        Asset.objects.values("category_id", dept, "status")
+        .annotate(n=Count("pk"))
+        .order_by()
+    ):
+        key = (row["category_id"] or 0, row[dept] or 0, row["status"])
+        counts[("category", *key)] += row["n"]
+    for row in (
+        Asset.objects.filter(checked_out_to__isnull=False)
+        .values("category_id", dept)
+        .annotate(n=Count("pk"))
+        .order_by()
+    ):
+        key = (row["category_id"] or 0, row[dept] or 0, "checked_out")
+        counts[("category", *key)] += row["n"]
+    for row in (
+        Asset.objects.values("current_location_id", dept, "status")
+        .annotate(n=Count("pk"))
+        .order_by()
+    ):
+        key = (row["current_location_id"] or 0, row[dept] or 0, row["status"])
+        counts[("location", *key)] += row["n"]
+    for row in (
+        Asset.tags.through.objects.values(
+            "tag_id", "asset__category__department_id", "asset__status"
+        )
+        .annotate(n=Count("pk"))
+        .order_by()
+    ):
+        key = (
+            row["tag_id"],
+            row["asset__category__department_id"] or 0,
+            row["asset__status"],
+        )
+        counts[("tag", *key)] += row["n"]
+    AssetStatistic.objects.bulk_create(
+        [
+            AssetStatistic(
+                dimension=dimension,
+                key=key,
+                department_key=department_key,
+                status=status,
+                count=count,
+            )
+            for (dimension, key, department_key, status), count in (
+                counts.items()
+            )
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0049_bulk_job"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AssetStatistic",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "dimension",
+                    models.CharField(
+                        choices=[
+                            ("category", "Category"),
+                            ("location", "Location"),
+                            ("tag", "Tag"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("key", models.BigIntegerField(default=0)),
+                ("department_key", models.BigIntegerField(default=0)),
+                ("status", models.CharField(max_length=20)),
+                ("count", models.IntegerField(default=0)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=(
+                            "dimension",
+                            "key",
+                            "department_key",
+                            "status",
+                        ),
+                        name="unique_asset_statistic",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(
+            backfill_statistics,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
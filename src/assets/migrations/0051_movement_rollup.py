@@ -0,0 +1,82 @@
+"""Add daily MovementRollup reporting table and its watermark."""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0050_asset_statistic"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RollupWatermark",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=50, unique=True)),
+                ("as_of_transaction_id", models.BigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="MovementRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[
+                            ("checkout", "Check Out"),
+                            ("checkin", "Check In"),
+                            ("transfer", "Transfer"),
+                            ("audit", "Audit"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("department_key", models.BigIntegerField(default=0)),
+                ("category_key", models.BigIntegerField(default=0)),
+                ("location_key", models.BigIntegerField(default=0)),
+                ("count", models.IntegerField(default=0)),
+                ("quantity", models.IntegerField(default=0)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["day", "department_key"],
+                        name="idx_rollup_day_department",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=(
+                            "day",
+                            "action",
+                            "department_key",
+                            "category_key",
+                            "location_key",
+                        ),
+                        name="unique_movement_rollup",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+"""Add AssetImage.ai_rendition for the upload image pipeline."""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0051_movement_rollup"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="assetimage",
+            name="ai_rendition",
+            field=models.ImageField(
+                blank=True, null=True, upload_to="ai_renditions/"
+            ),
+        ),
+    ]
@@ -0,0 +1,62 @@
+"""Add AssetImageRendition for responsive WebP/AVIF image variants."""
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0052_assetimage_ai_rendition"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AssetImageRendition",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("grid", "Grid"), ("detail", "Detail")],
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "format",
+                    models.CharField(
+                        choices=[("webp", "WebP"), ("avif", "AVIF")],
+                        max_length=10,
+                    ),
+                ),
+                ("width", models.PositiveIntegerField()),
+                ("height", models.PositiveIntegerField()),
+                ("file", models.FileField(upload_to="renditions/")),
+                (
+                    "image",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="renditions",
+                        to="assets.assetimage",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["kind", "format", "width"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("image", "kind", "format", "width"),
+                        name="unique_asset_image_rendition",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+"""Move the ledger checkpoint watermark into a RollupWatermark row."""
+
+from django.db import migrations
+from django.db.models import Max
+
+
+def seed_watermark(apps, schema_editor):
+    RollupWatermark = apps.get_model("assets", "RollupWatermark")
+    TransactionCheckpoint = apps.get_model("assets", "TransactionCheckpoint")
+    watermark = TransactionCheckpoint.objects.aggregate(
+        watermark=Max("as_of_transaction_id")
+    )["watermark"]
+    RollupWatermark.objects.update_or_create(
+        name="ledger-checkpoints",
+        defaults={"as_of_transaction_id": watermark or 0},
+    )
+
+
+def drop_watermark(apps, schema_editor):
+    RollupWatermark = apps.get_model("assets", "RollupWatermark")
+    RollupWatermark.objects.filter(name="ledger-checkpoints").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0053_asset_image_rendition"),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_watermark, drop_watermark),
+    ]
@@ -1,6 +1,8 @@
 """Models for PROPS asset management."""
 
+import logging
 import uuid
+from contextlib import nullcontext
 from io import BytesIO
 
 import barcode
@@ -14,9 +16,19 @@ from django.core.exceptions import ValidationError
 from django.core.files.base import ContentFile
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import IntegrityError, models
+from django.db import transaction as db_transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
 from django.urls import reverse
 from django.utils import timezone
 
+logger = logging.getLogger(__name__)
+
 
 class Department(models.Model):
     """Organisational team or domain within the society."""
@@ -87,6 +99,41 @@ class Category(models.Model):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        old_department_id = None
+        if self.pk is not None:
+            old_department_id = (
+                Category.objects.filter(pk=self.pk)
+                .values_list("department_id", flat=True)
+                .first()
+            )
+        if old_department_id in (None, self.department_id):
+            super().save(*args, **kwargs)
+            return
+        # The category's assets move to another department's statistics
+        from .services.statistics import tracking_asset_statistics
+
+        with tracking_asset_statistics(self.assets.all()):
+            super().save(*args, **kwargs)
+
+
+class LocationQuerySet(models.QuerySet):
+    """Hierarchy lookups over the materialised ``tree_path``."""
+
+    def subtree(self, location):
+        """The location and all of its descendants."""
+        if not location.tree_path:
+            return self.none()
+        return self.filter(tree_path__startswith=location.tree_path)
+
+    def descendants_of(self, location):
+        """All descendants of the location, excluding itself."""
+        return self.subtree(location).exclude(pk=location.pk)
+
+    def ancestors_of(self, location):
+        """The location's ancestors, root first."""
+        return self.filter(pk__in=location.ancestor_ids).order_by("tree_path")
+
 
 class Location(models.Model):
     """Physical place where assets can be stored."""
@@ -109,8 +156,16 @@ class Location(models.Model):
             "(all assets checked out to a single borrower)."
         ),
     )
+    # Materialised hierarchy, maintained by save(): pks from the root
+    # down to this location ("1/5/12/"), and the display path.
+    tree_path = models.CharField(
+        max_length=255, default="", editable=False, db_index=True
+    )
+    full_path = models.CharField(max_length=500, default="", editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = LocationQuerySet.as_manager()
+
     class Meta:
         ordering = ["name"]
         constraints = [
@@ -126,113 +181,132 @@ class Location(models.Model):
         ]
 
     def __str__(self):
-        return self.full_path
-
-    @property
-    def full_path(self):
-        """Return the full hierarchical path."""
-        parts = [self.name]
-        current = self.parent
-        while current:
-            parts.insert(0, current.name)
-            current = current.parent
-        return " > ".join(parts)
+        return self.full_path or self.name
 
     def get_absolute_url(self):
         return reverse("assets:location_detail", kwargs={"pk": self.pk})
 
+    @property
+    def path_ids(self):
+        """Pks from the root down to this location, from ``tree_path``."""
+        return [int(pk) for pk in self.tree_path.split("/") if pk]
+
+    @property
+    def ancestor_ids(self):
+        """Pks of the ancestors, root first."""
+        return self.path_ids[:-1]
+
     def clean(self):
         super().clean()
         if self.parent:
             # Prevent circular references
-            current = self.parent
-            depth = 1
-            while current:
-                if current.pk == self.pk:
-                    raise ValidationError(
-                        "A location cannot be its own ancestor."
-                    )
-                current = current.parent
-                depth += 1
+            chain = self.parent.path_ids
+            if self.pk is not None and (
+                self.pk in chain or self.parent.pk == self.pk
+            ):
+                raise ValidationError("A location cannot be its own ancestor.")
             # Max 4 levels of nesting
-            if depth > 3:
+            if len(chain) + 1 > 3:
                 raise ValidationError(
                     "Maximum nesting depth of 4 levels exceeded."
                 )
 
-    def get_descendants(self):
-        """Return all descendant locations using iterative batch queries."""
-        descendants = []
-        current_level = list(self.children.all())
-        while current_level:
-            descendants.extend(current_level)
-            current_ids = [loc.pk for loc in current_level]
-            current_level = list(
-                Location.objects.filter(parent_id__in=current_ids)
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and not {
+            "name",
+            "parent",
+            "parent_id",
+        }.intersection(update_fields):
+            super().save(*args, **kwargs)
+            return
+
+        old_tree_path, old_full_path = self.tree_path, self.full_path
+        if self.pk is not None:
+            stored = (
+                Location.objects.filter(pk=self.pk)
+                .values_list("tree_path", "full_path")
+                .first()
             )
-        return descendants
+            if stored:
+                old_tree_path, old_full_path = stored
+
+        parent = self.parent if self.parent_id else None
+        if parent is not None:
+            self.full_path = f"{parent.full_path} > {self.name}"
+        else:
+            self.full_path = self.name
+        parent_tree_path = parent.tree_path if parent else ""
+        if self.pk is not None:
+            self.tree_path = f"{parent_tree_path}{self.pk}/"
+        if update_fields is not None:
+            kwargs["update_fields"] = {
+                *update_fields,
+                "tree_path",
+                "full_path",
+            }
+
+        with db_transaction.atomic():
+            super().save(*args, **kwargs)
+            if not self.tree_path:
+                # New row: the path needs the pk just assigned
+                self.tree_path = f"{parent_tree_path}{self.pk}/"
+                Location.objects.filter(pk=self.pk).update(
+                    tree_path=self.tree_path
+                )
+            elif old_tree_path and (
+                old_tree_path != self.tree_path
+                or old_full_path != self.full_path
+            ):
+                self._rewrite_descendant_paths(old_tree_path, old_full_path)
+
+    def _rewrite_descendant_paths(self, old_tree_path, old_full_path):
+        """Re-prefix descendants' paths after a rename or move."""
+        from django.db.models.functions import Concat, Substr
+
+        Location.objects.filter(tree_path__startswith=old_tree_path).exclude(
+            pk=self.pk
+        ).update(
+            tree_path=Concat(
+                models.Value(self.tree_path),
+                Substr("tree_path", len(old_tree_path) + 1),
+                output_field=models.CharField(),
+            ),
+            full_path=Concat(
+                models.Value(self.full_path),
+                Substr("full_path", len(old_full_path) + 1),
+                output_field=models.CharField(),
+            ),
+        )
+
+    def get_ancestors(self):
+        """Return the ancestor locations, root first, in one query."""
+        return list(Location.objects.ancestors_of(self))
+
+    def get_descendants(self):
+        """Return all descendant locations in one query."""
+        return list(Location.objects.descendants_of(self))
 
 
 class AssetManager(models.Manager):
     """Custom manager with shared queryset builder for Asset."""
 
     def with_related(self):
-        """Apply the standard select_related and prefetch_related calls.
-
-        Includes annotations so that ``is_checked_out`` can avoid
-        per-row queries for both serialised and non-serialised assets.
-        """
-        from django.db.models import Q, Sum
-        from django.db.models.functions import Coalesce
-
-        return (
-            self.select_related(
-                "category",
-                "category__department",
-                "current_location",
-                "checked_out_to",
-            )
-            .prefetch_related(
-                "tags",
-                models.Prefetch(
-                    "images",
-                    queryset=AssetImage.objects.filter(is_primary=True),
-                    to_attr="primary_images",
-                ),
-            )
-            .annotate(
-                _has_checked_out_serial=models.Exists(
-                    AssetSerial.objects.filter(
-                        asset=models.OuterRef("pk"),
-                        checked_out_to__isnull=False,
-                        is_archived=False,
-                    )
-                ),
-                _outstanding_checkout_qty=models.Subquery(
-                    Transaction.objects.filter(
-                        asset=models.OuterRef("pk"),
-                    )
-                    .values("asset")
-                    .annotate(
-                        outstanding=Coalesce(
-                            Sum(
-                                "quantity",
-                                filter=Q(action="checkout"),
-                            ),
-                            0,
-                        )
-                        - Coalesce(
-                            Sum(
-                                "quantity",
-                                filter=Q(action="checkin"),
-                            ),
-                            0,
-                        ),
-                    )
-                    .values("outstanding")[:1],
-                    output_field=models.IntegerField(),
-                ),
-            )
+        """Apply the standard select_related and prefetch_related calls."""
+        return self.select_related(
+            "category",
+            "category__department",
+            "current_location",
+            "checked_out_to",
+        ).prefetch_related(
+            "tags",
+            models.Prefetch(
+                "images",
+                queryset=AssetImage.objects.filter(
+                    is_primary=True
+                ).prefetch_related("renditions"),
+                to_attr="primary_images",
+            ),
         )
 
 
@@ -361,6 +435,49 @@ class Asset(models.Model):
 
     search_vector = SearchVectorField(null=True, editable=False)
 
+    # Availability counters maintained by services/availability.py;
+    # never written by Asset.save()
+    checked_out_quantity = models.IntegerField(
+        default=0,
+        editable=False,
+        help_text="Outstanding checkout quantity from transactions",
+    )
+    available_serial_count = models.PositiveIntegerField(
+        default=0, editable=False
+    )
+    checked_out_serial_count = models.PositiveIntegerField(
+        default=0, editable=False
+    )
+
+    COUNTER_FIELDS = (
+        "checked_out_quantity",
+        "available_serial_count",
+        "checked_out_serial_count",
+    )
+
+    # Fields that place an asset in the dashboard statistics
+    # (services/statistics.py), in ``statistic_state()`` order
+    STATISTIC_FIELDS = (
+        "status",
+        "category",
+        "current_location",
+        "checked_out_to",
+    )
+
+    # Fields read by the list filters, facets and text search
+    # (services/bulk.py); a save changing one bumps the catalogue
+    # version. Borrower and timestamp changes alone do not.
+    CATALOGUE_FIELDS = (
+        "name",
+        "description",
+        "barcode",
+        "status",
+        "category",
+        "current_location",
+        "condition",
+        "is_kit",
+    )
+
     objects = AssetManager()
 
     class Meta:
@@ -407,8 +524,74 @@ class Asset(models.Model):
     def get_absolute_url(self):
         return reverse("assets:asset_detail", kwargs={"pk": self.pk})
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if all(
+            cls._meta.get_field(name).attname in instance.__dict__
+            for name in cls.STATISTIC_FIELDS
+        ):
+            instance._saved_statistic_state = instance.statistic_state()
+        if all(
+            cls._meta.get_field(name).attname in instance.__dict__
+            for name in cls.CATALOGUE_FIELDS
+        ):
+            instance._saved_catalogue_state = instance.catalogue_state()
+        return instance
+
+    def statistic_state(self):
+        """The values placing this asset in the dashboard statistics."""
+        return (
+            self.status,
+            self.category_id,
+            self.current_location_id,
+            self.checked_out_to_id,
+        )
+
+    def catalogue_state(self):
+        """The values of ``CATALOGUE_FIELDS``, in order."""
+        return tuple(
+            getattr(self, self._meta.get_field(name).attname)
+            for name in self.CATALOGUE_FIELDS
+        )
+
+    @staticmethod
+    def _written_state(fields, state, saved_state, update_fields):
+        """The part of ``state`` stored by a save with ``update_fields``."""
+        if update_fields is None:
+            return state
+        return tuple(
+            (
+                value
+                if name in update_fields or f"{name}_id" in update_fields
+                else saved
+            )
+            for name, value, saved in zip(fields, state, saved_state)
+        )
+
+    def _written_statistic_state(self, saved_state, update_fields):
+        """The statistic state stored by a save with ``update_fields``."""
+        return self._written_state(
+            self.STATISTIC_FIELDS,
+            self.statistic_state(),
+            saved_state,
+            update_fields,
+        )
+
     def save(self, *args, **kwargs):
+        from .services.catalogue import bump_catalogue_version
+        from .services.statistics import (
+            record_asset_change,
+            tracking_asset_statistics,
+        )
+
         is_new = self._state.adding
+        saved_state = (
+            None if is_new else self.__dict__.get("_saved_statistic_state")
+        )
+        saved_catalogue = (
+            None if is_new else self.__dict__.get("_saved_catalogue_state")
+        )
 
         # S2.2.3-11: When marking a checked-out asset as lost/stolen,
         # set current_location to the checkout destination (last known
@@ -428,16 +611,62 @@ class Asset(models.Model):
 
         if not self.barcode:
             self.barcode = self._generate_barcode()
+        save_kwargs = kwargs
+        if not is_new and kwargs.get("update_fields") is None:
+            # Counters are updated atomically in the database; writing
+            # back possibly stale in-memory values would undo that
+            save_kwargs = {
+                **kwargs,
+                "update_fields": [
+                    f.name
+                    for f in self._meta.concrete_fields
+                    if not f.primary_key and f.name not in self.COUNTER_FIELDS
+                ],
+            }
+        # Without the state loaded from the database, count the
+        # asset's statistics before and after the write instead
+        stats_tracker = nullcontext()
+        if not is_new and saved_state is None:
+            stats_tracker = tracking_asset_statistics([self.pk])
         max_attempts = 5
-        for attempt in range(max_attempts):
-            try:
-                super().save(*args, **kwargs)
-                break
-            except IntegrityError:
-                if attempt >= max_attempts - 1:
-                    raise
-                # Barcode collision — regenerate and retry
-                self.barcode = self._generate_barcode()
+        with stats_tracker:
+            for attempt in range(max_attempts):
+                try:
+                    super().save(*args, **save_kwargs)
+                    break
+                except IntegrityError:
+                    if attempt >= max_attempts - 1:
+                        raise
+                    # Barcode collision — regenerate and retry
+                    self.barcode = self._generate_barcode()
+        update_fields = kwargs.get("update_fields")
+        if is_new:
+            new_state = self.statistic_state()
+            record_asset_change(self, None, new_state)
+        elif saved_state is not None:
+            new_state = self._written_statistic_state(
+                saved_state, update_fields
+            )
+            record_asset_change(self, saved_state, new_state)
+        else:
+            new_state = self.statistic_state()
+        self._saved_statistic_state = new_state
+        # Without the state loaded from the database, assume a change
+        new_catalogue = self.catalogue_state()
+        if saved_catalogue is not None:
+            new_catalogue = self._written_state(
+                self.CATALOGUE_FIELDS,
+                new_catalogue,
+                saved_catalogue,
+                update_fields,
+            )
+        if saved_catalogue is None or new_catalogue != saved_catalogue:
+            bump_catalogue_version()
+        self._saved_catalogue_state = new_catalogue
+        if update_fields is None or "barcode" in update_fields:
+            from .services.identifiers import sync_asset_barcode
+
+            sync_asset_barcode(self)
         if not self.barcode_image:
             self._generate_barcode_image()
         # Link any matching VirtualBarcode when a new asset is created
@@ -545,29 +774,17 @@ class Asset(models.Model):
     def is_checked_out(self):
         """Return whether the asset has any units checked out.
 
-        Uses the ``_has_checked_out_serial`` annotation from
-        ``with_related()`` when available to avoid N+1 queries.
+        Reads the maintained availability counters (see
+        ``services/availability.py``).
 
         V500: For non-serialised assets, True when checked_out_to
         is set OR when transaction-tracked quantity is outstanding.
         """
         if self.is_serialised:
-            # Use annotation from with_related() if available
-            if hasattr(self, "_has_checked_out_serial"):
-                return self._has_checked_out_serial
-            return self.serials.filter(
-                checked_out_to__isnull=False,
-                is_archived=False,
-            ).exists()
-        # Use annotation from with_related() if available
-        if hasattr(self, "_outstanding_checkout_qty"):
-            outstanding = self._outstanding_checkout_qty or 0
-            if outstanding > 0:
-                return True
-            return self.checked_out_to is not None
-        if self.checked_out_to is not None:
-            return True
-        return self.available_count < self.quantity
+            return self.checked_out_serial_count > 0
+        return (
+            self.checked_out_quantity > 0 or self.checked_out_to_id is not None
+        )
 
     @property
     def effective_quantity(self):
@@ -625,34 +842,17 @@ class Asset(models.Model):
         """Number of units available for checkout.
 
         V500: For non-serialised assets, tracks outstanding quantity
-        via checkout/checkin transaction sums. Falls back to
-        checked_out_to when no transactions exist (backward compat).
+        via checkout/checkin transaction sums (maintained in
+        ``checked_out_quantity``). Falls back to checked_out_to when
+        no transactions exist (backward compat).
         """
         if self.is_serialised:
-            return self.serials.filter(
-                status="active",
-                checked_out_to__isnull=True,
-                is_archived=False,
-            ).count()
-        from django.db.models import Sum
-
-        checkout_sum = (
-            self.transactions.filter(action="checkout").aggregate(
-                total=Sum("quantity")
-            )["total"]
-            or 0
-        )
-        checkin_sum = (
-            self.transactions.filter(action="checkin").aggregate(
-                total=Sum("quantity")
-            )["total"]
-            or 0
-        )
-        outstanding = checkout_sum - checkin_sum
+            return self.available_serial_count
+        outstanding = self.checked_out_quantity
         if outstanding > 0:
             return max(0, self.quantity - outstanding)
         # No transaction-tracked checkouts; fall back to FK
-        if self.checked_out_to is not None:
+        if self.checked_out_to_id is not None:
             return max(0, self.quantity - 1)
         return self.quantity
 
@@ -697,6 +897,10 @@ class AssetImage(models.Model):
     detail_thumbnail = models.ImageField(
         upload_to="detail_thumbnails/", blank=True, null=True
     )
+    # Pre-sized JPEG for AI analysis, made by the upload pipeline
+    ai_rendition = models.ImageField(
+        upload_to="ai_renditions/", blank=True, null=True
+    )
     caption = models.CharField(max_length=200, blank=True)
     is_primary = models.BooleanField(default=False)
     uploaded_at = models.DateTimeField(auto_now_add=True)
@@ -770,6 +974,18 @@ class AssetImage(models.Model):
     def __str__(self):
         return f"Image for {self.asset.name}"
 
+    def srcset(self, kind, fmt):
+        """``srcset`` value for one kind and format of rendition.
+
+        Reads ``renditions.all()``, so a prefetch of ``renditions``
+        serves every call.
+        """
+        return ", ".join(
+            f"{r.file.url} {r.width}w"
+            for r in self.renditions.all()
+            if r.kind == kind and r.format == fmt
+        )
+
     def save(self, *args, **kwargs):
         is_new = self._state.adding
         if self.is_primary:
@@ -782,66 +998,68 @@ class AssetImage(models.Model):
         ):
             self.is_primary = True
         super().save(*args, **kwargs)
-        if is_new and self.image and not self.thumbnail:
-            self._generate_thumbnail()
         if is_new and self.image:
-            try:
-                from .tasks import generate_detail_thumbnail
+            # Renditions and AI dispatch happen off the request path
+            # (services/images.py), once the row is visible to workers
+            pk = self.pk
+            db_transaction.on_commit(lambda: _queue_image_pipeline(pk))
 
-                generate_detail_thumbnail.delay(self.pk)
-            except Exception:
-                pass  # Celery/Redis unavailable; task skipped
 
-    def _generate_thumbnail(self):
-        """Generate a 300x300 max thumbnail and cap original at 3264px."""
-        try:
-            from io import BytesIO
+def _queue_image_pipeline(image_id):
+    """Queue the upload pipeline for one image.
 
-            from PIL import Image
+    A broker outage must not fail the upload; the image stays
+    ``pending`` and ``build_image_renditions`` picks it up later.
+    """
+    from .tasks import process_asset_image
 
-            from django.core.files.base import ContentFile
+    try:
+        process_asset_image.delay(image_id)
+    except Exception:
+        logger.exception(
+            "Could not queue the image pipeline for image %s", image_id
+        )
 
-            img = Image.open(self.image)
 
-            # Cap original at 3264px longest edge
-            longest = max(img.size)
-            if longest > 3264:
-                scale = 3264 / longest
-                new_size = (
-                    int(img.size[0] * scale),
-                    int(img.size[1] * scale),
-                )
-                img = img.resize(new_size, Image.LANCZOS)
-                if img.mode in ("RGBA", "P"):
-                    img = img.convert("RGB")
-                buf = BytesIO()
-                img.save(buf, format="JPEG", quality=90)
-                buf.seek(0)
-                self.image.save(
-                    self.image.name.split("/")[-1],
-                    ContentFile(buf.getvalue()),
-                    save=False,
-                )
+class AssetImageRendition(models.Model):
+    """Responsive WebP/AVIF variant of an asset image at one width.
+
+    Made by the upload pipeline (``services.images``) alongside the
+    JPEG fields on ``AssetImage``, and served through ``srcset`` by
+    the ``asset_picture`` template tag.
+    """
 
-            # Generate 300px grid thumbnail
-            grid_img = Image.open(self.image)
-            grid_img.thumbnail((300, 300), Image.LANCZOS)
+    KIND_CHOICES = [
+        ("grid", "Grid"),
+        ("detail", "Detail"),
+    ]
+    FORMAT_CHOICES = [
+        ("webp", "WebP"),
+        ("avif", "AVIF"),
+    ]
 
-            if grid_img.mode in ("RGBA", "P"):
-                grid_img = grid_img.convert("RGB")
+    image = models.ForeignKey(
+        AssetImage, on_delete=models.CASCADE, related_name="renditions"
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    file = models.FileField(upload_to="renditions/")
 
-            thumb_io = BytesIO()
-            grid_img.save(thumb_io, format="JPEG", quality=80)
-            thumb_io.seek(0)
+    class Meta:
+        ordering = ["kind", "format", "width"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["image", "kind", "format", "width"],
+                name="unique_asset_image_rendition",
+            ),
+        ]
 
-            thumb_name = (
-                f"thumb_{self.image.name.split('/')[-1].rsplit('.', 1)[0]}.jpg"
-            )
-            self.thumbnail.save(
-                thumb_name, ContentFile(thumb_io.getvalue()), save=True
-            )
-        except (ImportError, Exception):
-            pass
+    def __str__(self):
+        return (
+            f"{self.kind} {self.format} {self.width}w of image {self.image_id}"
+        )
 
 
 class NFCTag(models.Model):
@@ -897,6 +1115,12 @@ class NFCTag(models.Model):
         status = "active" if not self.removed_at else "removed"
         return f"{self.tag_id} ({status}) - {self.asset.name}"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        from .services.identifiers import sync_nfc_tag
+
+        sync_nfc_tag(self)
+
     @property
     def is_active(self):
         return self.removed_at is None
@@ -993,8 +1217,10 @@ class Transaction(models.Model):
     class Meta:
         ordering = ["-timestamp"]
         indexes = [
+            # (timestamp, id) also serves keyset pages and audit export
+            # resumption, which tie-break on id
             models.Index(
-                fields=["timestamp"], name="idx_transaction_timestamp"
+                fields=["timestamp", "id"], name="idx_transaction_ts_id"
             ),
             models.Index(fields=["action"], name="idx_transaction_action"),
             models.Index(
@@ -1012,7 +1238,11 @@ class Transaction(models.Model):
             raise ValidationError(
                 "Transactions are immutable and cannot be modified."
             )
-        super().save(*args, **kwargs)
+        from .services.availability import apply_transaction_counters
+
+        with db_transaction.atomic():
+            super().save(*args, **kwargs)
+            apply_transaction_counters([self])
 
     def delete(self, *args, **kwargs):
         raise ValidationError(
@@ -1020,6 +1250,157 @@ class Transaction(models.Model):
         )
 
 
+class TransactionCheckpoint(models.Model):
+    """Outstanding checkout quantity folded up to a transaction.
+
+    One row per (asset, serial) pair that has checkout/checkin history,
+    holding the net outstanding quantity over every transaction with a
+    pk up to ``as_of_transaction_id``. All rows share the same
+    watermark, held in the ``ledger-checkpoints`` ``RollupWatermark``
+    row, so outstanding quantity is the checkpoint plus a sum over
+    newer transactions only. Transactions are immutable, which is
+    what keeps folded totals valid. Maintained by
+    ``services.availability.advance_ledger_checkpoints``.
+    """
+
+    asset = models.ForeignKey(
+        Asset, on_delete=models.CASCADE, related_name="ledger_checkpoints"
+    )
+    # No FK constraint: deleting a serial nulls it on the transactions
+    # but the folded quantity must stay with the asset's total.
+    serial = models.ForeignKey(
+        "AssetSerial",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    as_of_transaction_id = models.BigIntegerField(default=0)
+    outstanding_quantity = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["asset", "serial"],
+                name="unique_checkpoint_asset_serial",
+            ),
+            models.UniqueConstraint(
+                fields=["asset"],
+                condition=models.Q(serial__isnull=True),
+                name="unique_checkpoint_asset_no_serial",
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"Checkpoint {self.asset_id}/{self.serial_id} "
+            f"@{self.as_of_transaction_id}: {self.outstanding_quantity}"
+        )
+
+
+class AssetStatistic(models.Model):
+    """Maintained asset count behind the dashboard's totals.
+
+    One row per (dimension, key, department, status): the number of
+    assets in that category, location or tag, belonging to that
+    department, with that status. ``0`` stands for "none" in ``key``
+    and ``department_key``. Maintained by ``services.statistics``.
+    """
+
+    DIMENSION_CHOICES = [
+        ("category", "Category"),
+        ("location", "Location"),
+        ("tag", "Tag"),
+    ]
+    # Pseudo-status counting checked-out assets (category rows only)
+    CHECKED_OUT = "checked_out"
+
+    dimension = models.CharField(max_length=20, choices=DIMENSION_CHOICES)
+    key = models.BigIntegerField(default=0)
+    department_key = models.BigIntegerField(default=0)
+    status = models.CharField(max_length=20)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dimension", "key", "department_key", "status"],
+                name="unique_asset_statistic",
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.dimension} {self.key}/{self.department_key} "
+            f"{self.status}: {self.count}"
+        )
+
+
+class MovementRollup(models.Model):
+    """Daily movement counts for reporting.
+
+    One row per (day, action, department, category, location): how
+    many transactions of that action fell on that local day and their
+    summed quantity. ``0`` stands for "none" in the ``*_key`` fields.
+    Built incrementally by ``services.movement_rollups``.
+    """
+
+    ACTION_CHOICES = [
+        ("checkout", "Check Out"),
+        ("checkin", "Check In"),
+        ("transfer", "Transfer"),
+        ("audit", "Audit"),
+    ]
+
+    day = models.DateField()
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES)
+    department_key = models.BigIntegerField(default=0)
+    category_key = models.BigIntegerField(default=0)
+    location_key = models.BigIntegerField(default=0)
+    count = models.IntegerField(default=0)
+    quantity = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    "day",
+                    "action",
+                    "department_key",
+                    "category_key",
+                    "location_key",
+                ],
+                name="unique_movement_rollup",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["day", "department_key"],
+                name="idx_rollup_day_department",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.action}: {self.count}"
+
+
+class RollupWatermark(models.Model):
+    """Highest transaction id folded into a rollup table.
+
+    One row per table (``movement-rollups``, ``ledger-checkpoints``);
+    writers lock their row to serialise runs.
+    """
+
+    name = models.CharField(max_length=50, unique=True)
+    as_of_transaction_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @{self.as_of_transaction_id}"
+
+
 class AssetSerial(models.Model):
     """Individual serialised unit of a parent asset."""
 
@@ -1090,9 +1471,22 @@ class AssetSerial(models.Model):
             ),
         ]
 
+    # Fields that feed the parent's serial availability counters
+    COUNTED_FIELDS = {"asset", "status", "checked_out_to", "is_archived"}
+
     def __str__(self):
         return f"{self.asset.name} #{self.serial_number}"
 
+    def _refresh_asset_counters(self):
+        from .services.availability import (
+            SERIAL_COUNTER_FIELDS,
+            refresh_serial_counters,
+        )
+
+        refresh_serial_counters([self.asset_id])
+        if AssetSerial.asset.is_cached(self):
+            self.asset.refresh_from_db(fields=SERIAL_COUNTER_FIELDS)
+
     def clean(self):
         super().clean()
         # Parent must be serialised
@@ -1123,6 +1517,20 @@ class AssetSerial(models.Model):
         # Capture barcode before save for disposal tracking
         _barcode_before = self.barcode
         super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or self.COUNTED_FIELDS & set(update_fields):
+            self._refresh_asset_counters()
+        if update_fields is None or {"asset", "barcode", "status"} & set(
+            update_fields
+        ):
+            from .services.identifiers import sync_serial_identifiers
+
+            sync_serial_identifiers(
+                self,
+                retired_barcode=(
+                    _barcode_before if self.status == "disposed" else None
+                ),
+            )
         # S7.10.5: Clear barcode on disposal to free for reuse
         # S7.16.9: Auto-unpin from kit components on disposal
         if self.status == "disposed":
@@ -1164,10 +1572,86 @@ class AssetSerial(models.Model):
                     is_archived=False,
                 ).exists()
                 if has_active_serials:
-                    Asset.objects.filter(pk=parent.pk).update(
-                        status="disposed"
+                    from .services.statistics import (
+                        tracking_asset_statistics,
                     )
 
+                    with tracking_asset_statistics([parent.pk]):
+                        Asset.objects.filter(pk=parent.pk).update(
+                            status="disposed"
+                        )
+
+
+class AssetIdentifier(models.Model):
+    """Registry of scannable codes for single-lookup scan resolution.
+
+    Maps asset barcodes, serial barcodes, retired (disposed) serial
+    barcodes and active NFC tag UIDs to the asset and serial they
+    resolve to. Rows are kept current by the source models' save
+    paths (see ``services/identifiers.py``).
+    """
+
+    KIND_CHOICES = [
+        ("barcode", "Asset barcode"),
+        ("serial", "Serial barcode"),
+        ("retired_serial", "Retired serial barcode"),
+        ("nfc", "NFC tag"),
+    ]
+
+    # Resolution order when one code matches more than one kind
+    KIND_PRIORITY = {
+        "barcode": 0,
+        "serial": 1,
+        "retired_serial": 2,
+        "nfc": 3,
+    }
+
+    key = models.CharField(
+        max_length=100,
+        help_text="Normalised (upper-case) lookup key",
+    )
+    value = models.CharField(
+        max_length=100, help_text="Identifier as originally recorded"
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    priority = models.PositiveSmallIntegerField(default=0)
+    asset = models.ForeignKey(
+        Asset,
+        on_delete=models.CASCADE,
+        related_name="identifiers",
+    )
+    serial = models.ForeignKey(
+        AssetSerial,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="identifiers",
+    )
+    nfc_tag = models.ForeignKey(
+        NFCTag,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="identifiers",
+    )
+    is_disposed = models.BooleanField(default=False)
+
+    class Meta:
+        ordering = ["priority", "-pk"]
+        indexes = [
+            models.Index(
+                fields=["key", "priority"],
+                name="idx_identifier_key_priority",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.value} ({self.get_kind_display()})"
+
+    def save(self, *args, **kwargs):
+        self.priority = self.KIND_PRIORITY.get(self.kind, 0)
+        super().save(*args, **kwargs)
+
 
 class VirtualBarcode(models.Model):
     """Tracks pre-printed barcodes not yet assigned to assets."""
@@ -1909,3 +2393,319 @@ class PrintRequest(models.Model):
                 self.error_message = error_message
 
         self.save()
+
+
+class ExportJob(models.Model):
+    """Asset export built in the background by a Celery task.
+
+    Jobs are keyed by ``signature`` (export parameters plus the
+    catalogue version), so identical requests share one job and file.
+    """
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    ]
+
+    IN_FLIGHT_STATUSES = ("pending", "running")
+
+    job_id = models.UUIDField(default=uuid.uuid4, unique=True)
+    signature = models.CharField(max_length=64)
+    params = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default="pending",
+    )
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    file = models.FileField(upload_to="exports/", blank=True)
+    error_message = models.TextField(blank=True, default="")
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="export_jobs",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["signature", "status"],
+                name="idx_exportjob_sig_status",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["signature"],
+                condition=models.Q(status__in=["pending", "running"]),
+                name="unique_in_flight_export_signature",
+            ),
+        ]
+
+    def __str__(self):
+        return f"ExportJob {self.job_id} ({self.get_status_display()})"
+
+    @property
+    def is_in_flight(self):
+        return self.status in self.IN_FLIGHT_STATUSES
+
+    @property
+    def progress_percent(self):
+        """Rows written as a percentage of the total (0-100)."""
+        if self.status == "completed":
+            return 100
+        if not self.total:
+            return 0
+        return min(100, self.processed * 100 // self.total)
+
+
+class ImportJob(models.Model):
+    """Bulk asset import from an uploaded CSV or XLSX file.
+
+    The file is validated first (a dry run that creates nothing); the
+    import itself only runs once the user confirms a clean validation.
+    """
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("validating", "Validating"),
+        ("validated", "Ready to import"),
+        ("invalid", "Invalid"),
+        ("queued", "Queued"),
+        ("importing", "Importing"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    ]
+
+    IN_FLIGHT_STATUSES = ("pending", "validating", "queued", "importing")
+
+    job_id = models.UUIDField(default=uuid.uuid4, unique=True)
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default="pending",
+    )
+    file = models.FileField(upload_to="imports/")
+    original_filename = models.CharField(max_length=255, blank=True)
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Validation errors as {row, message} objects",
+    )
+    error_message = models.TextField(blank=True, default="")
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="import_jobs",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"ImportJob {self.job_id} ({self.get_status_display()})"
+
+    @property
+    def is_in_flight(self):
+        return self.status in self.IN_FLIGHT_STATUSES
+
+    @property
+    def progress_percent(self):
+        """Rows imported as a percentage of the total (0-100)."""
+        if self.status == "completed":
+            return 100
+        if not self.total:
+            return 0
+        return min(100, self.processed * 100 // self.total)
+
+
+class BulkJob(models.Model):
+    """A bulk asset operation processed in chunks.
+
+    ``asset_ids`` is the target set captured when the job is created;
+    ``cursor`` is the highest asset pk handled so far, so a job that
+    stops part-way resumes with the next chunk.
+    """
+
+    ACTION_CHOICES = [
+        ("transfer", "Transfer"),
+        ("status_change", "Status change"),
+        ("checkout", "Check out"),
+        ("checkin", "Check in"),
+    ]
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    ]
+
+    IN_FLIGHT_STATUSES = ("pending", "running")
+
+    RESULT_LABELS = {
+        "transfer": "transferred",
+        "status_change": "updated",
+        "checkout": "checked out",
+        "checkin": "checked in",
+    }
+
+    job_id = models.UUIDField(default=uuid.uuid4, unique=True)
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES)
+    params = models.JSONField(default=dict, blank=True)
+    asset_ids = models.JSONField(default=list)
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default="pending",
+    )
+    cursor = models.PositiveIntegerField(default=0)
+    deferred_ids = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Assets locked elsewhere when their chunk ran",
+    )
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    succeeded = models.PositiveIntegerField(default=0)
+    skipped_count = models.PositiveIntegerField(default=0)
+    skipped = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Skip and failure messages (capped)",
+    )
+    error_message = models.TextField(blank=True, default="")
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="bulk_jobs",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["status", "heartbeat_at"],
+                name="idx_bulkjob_status_heartbeat",
+            ),
+        ]
+
+    def __str__(self):
+        return f"BulkJob {self.job_id} ({self.get_action_display()})"
+
+    @property
+    def is_in_flight(self):
+        return self.status in self.IN_FLIGHT_STATUSES
+
+    @property
+    def result_label(self):
+        """Past-tense verb for the action, e.g. "transferred"."""
+        return self.RESULT_LABELS[self.action]
+
+    @property
+    def progress_percent(self):
+        """Assets processed as a percentage of the total (0-100)."""
+        if self.status == "completed":
+            return 100
+        if not self.total:
+            return 0
+        return min(100, self.processed * 100 // self.total)
+
+
+# Catalogue-derived caches (facets, search results, exports) are keyed
+# on the catalogue version; any write that can change them bumps it.
+# Asset saves bump from ``Asset.save`` when a ``CATALOGUE_FIELDS``
+# value changes, so checkouts leave the caches warm.
+CATALOGUE_MODELS = (AssetSerial, Category, Department, Location, Tag)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_catalogue_on_write(sender, **kwargs):
+    """Bump the catalogue version when a catalogue model changes."""
+    if sender in CATALOGUE_MODELS:
+        from .services.catalogue import bump_catalogue_version
+
+        bump_catalogue_version()
+
+
+@receiver(post_delete, sender=Asset)
+def bump_catalogue_on_asset_delete(sender, **kwargs):
+    """Bump the catalogue version when an asset is deleted."""
+    from .services.catalogue import bump_catalogue_version
+
+    bump_catalogue_version()
+
+
+@receiver(post_delete, sender=AssetSerial)
+def refresh_counters_on_serial_delete(sender, instance, **kwargs):
+    """Recount the parent's serial counters when a serial is deleted."""
+    from .services.availability import refresh_serial_counters
+
+    refresh_serial_counters([instance.asset_id])
+
+
+@receiver(pre_delete, sender=Asset)
+def remove_statistics_on_asset_delete(sender, instance, **kwargs):
+    """Take a deleted asset out of the dashboard statistics."""
+    from .services.statistics import record_removed_assets
+
+    record_removed_assets([instance.pk])
+
+
+@receiver(m2m_changed, sender=Asset.tags.through)
+def track_statistics_on_tag_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """Move the tag statistics of assets whose tags change."""
+    from .services.statistics import (
+        apply_statistics_delta,
+        count_asset_statistics,
+    )
+
+    if action.startswith("pre_"):
+        if not reverse:
+            asset_ids = [instance.pk]
+        elif pk_set is not None:
+            asset_ids = list(pk_set)
+        else:
+            asset_ids = list(instance.assets.values_list("pk", flat=True))
+        instance._tag_statistics_before = (
+            asset_ids,
+            count_asset_statistics(asset_ids, ("tag",)),
+        )
+    elif action.startswith("post_"):
+        before = instance.__dict__.pop("_tag_statistics_before", None)
+        if before is not None:
+            asset_ids, counts = before
+            apply_statistics_delta(
+                counts, count_asset_statistics(asset_ids, ("tag",))
+            )
+
+
+@receiver(m2m_changed, sender=Asset.tags.through)
+def bump_catalogue_on_tag_change(sender, action, **kwargs):
+    """Bump the catalogue version when asset tags are changed."""
+    if action in ("post_add", "post_remove", "post_clear"):
+        from .services.catalogue import bump_catalogue_version
+
+        bump_catalogue_version()
@@ -14,6 +14,54 @@ def is_ai_enabled() -> bool:
     return bool(getattr(settings, "ANTHROPIC_API_KEY", ""))
 
 
+def encode_image_for_ai(img, max_dimension: int = None) -> bytes:
+    """Scale a decoded image by longest edge and encode it as JPEG.
+
+    Quality fallback chain: q80 -> q70 -> q60 to stay under 1MB.
+    """
+    from io import BytesIO
+
+    from PIL import Image
+
+    if max_dimension is None:
+        max_dimension = getattr(settings, "AI_MAX_IMAGE_DIMENSION", 1568)
+
+    width, height = img.size
+    longest = max(width, height)
+
+    if longest > max_dimension:
+        scale = max_dimension / longest
+        new_width = int(width * scale)
+        new_height = int(height * scale)
+        img = img.resize((new_width, new_height), Image.LANCZOS)
+
+    # Convert to RGB if necessary (for JPEG)
+    if img.mode in ("RGBA", "P"):
+        img = img.convert("RGB")
+
+    output = BytesIO()
+    img.save(output, format="JPEG", quality=80)
+    output.seek(0)
+
+    # Ensure under 1MB with progressive quality reduction
+    result = output.getvalue()
+    if len(result) > 1024 * 1024:
+        # Try quality 70 first
+        output = BytesIO()
+        img.save(output, format="JPEG", quality=70)
+        output.seek(0)
+        result = output.getvalue()
+
+    if len(result) > 1024 * 1024:
+        # Then try quality 60
+        output = BytesIO()
+        img.save(output, format="JPEG", quality=60)
+        output.seek(0)
+        result = output.getvalue()
+
+    return result
+
+
 def resize_image_for_ai(
     image_bytes: bytes,
     max_dimension: int = None,
@@ -25,51 +73,17 @@ def resize_image_for_ai(
     Falls back to max_pixels for backward compatibility.
     Returns (resized_bytes, media_type).
 
-    Quality fallback chain: q80 -> q70 -> q60 to stay under 1MB.
+    Uploads already carry an ``ai_rendition`` from the image pipeline
+    (``services/images.py``); this decodes from scratch for older
+    images. See ``encode_image_for_ai`` for the quality chain.
     """
-    if max_dimension is None:
-        max_dimension = getattr(settings, "AI_MAX_IMAGE_DIMENSION", 1568)
     try:
         from io import BytesIO
 
         from PIL import Image
 
         img = Image.open(BytesIO(image_bytes))
-
-        width, height = img.size
-        longest = max(width, height)
-
-        if longest > max_dimension:
-            scale = max_dimension / longest
-            new_width = int(width * scale)
-            new_height = int(height * scale)
-            img = img.resize((new_width, new_height), Image.LANCZOS)
-
-        # Convert to RGB if necessary (for JPEG)
-        if img.mode in ("RGBA", "P"):
-            img = img.convert("RGB")
-
-        output = BytesIO()
-        img.save(output, format="JPEG", quality=80)
-        output.seek(0)
-
-        # Ensure under 1MB with progressive quality reduction
-        result = output.getvalue()
-        if len(result) > 1024 * 1024:
-            # Try quality 70 first
-            output = BytesIO()
-            img.save(output, format="JPEG", quality=70)
-            output.seek(0)
-            result = output.getvalue()
-
-        if len(result) > 1024 * 1024:
-            # Then try quality 60
-            output = BytesIO()
-            img.save(output, format="JPEG", quality=60)
-            output.seek(0)
-            result = output.getvalue()
-
-        return result, "image/jpeg"
+        return encode_image_for_ai(img, max_dimension), "image/jpeg"
     except ImportError:
         logger.warning("Pillow not installed, sending original image")
         return image_bytes, "image/jpeg"
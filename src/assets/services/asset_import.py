@@ -0,0 +1,597 @@
+"""Bulk asset import from CSV or XLSX files.
+
+An upload becomes an ``ImportJob``. ``validate_import_job`` is the dry
+run: every row is parsed and checked against categories, locations and
+existing barcodes with a fixed number of set-based queries, whatever
+the row count, and the errors are stored on the job. Once the user
+confirms a clean validation, ``run_import_job`` re-validates and
+creates the assets in batches of IMPORT_BATCH_SIZE:
+
+- barcodes are allocated per prefix in blocks, with one collision
+  query per block instead of a save-and-retry per asset;
+- assets, tag links and serials are written with ``bulk_create``;
+- identifiers, serial counters, dashboard statistics and virtual
+  barcode links are brought up to date once per batch;
+- serial barcodes skip codes already in the identifier registry;
+- Code128 images for assets and serials are rendered afterwards by
+  the ``render_barcode_images`` task.
+
+``bulk_create`` sends no ``post_save`` signals, so the catalogue
+version is bumped once when the import finishes.
+"""
+
+import csv
+import io
+import logging
+import uuid
+from collections import defaultdict
+from itertools import islice
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from ..models import (
+    Asset,
+    AssetIdentifier,
+    AssetSerial,
+    Category,
+    ImportJob,
+    Location,
+    Tag,
+    VirtualBarcode,
+)
+from .availability import refresh_serial_counters
+from .barcode import generate_code128_image, generate_serial_barcode_string
+from .catalogue import bump_catalogue_version
+from .identifiers import normalise_identifier, sync_asset_identifiers
+from .statistics import record_new_assets
+
+logger = logging.getLogger(__name__)
+
+IMPORT_BATCH_SIZE = 500
+MAX_IMPORT_ROWS = 20000
+MAX_STORED_ERRORS = 200
+
+IMPORT_FILE_TYPES = (".csv", ".xlsx")
+
+IMPORT_COLUMNS = (
+    "name",
+    "description",
+    "category",
+    "department",
+    "location",
+    "status",
+    "condition",
+    "quantity",
+    "barcode",
+    "purchase_price",
+    "estimated_value",
+    "notes",
+    "tags",
+    "serials",
+)
+
+# Columns copied onto Asset after Field.clean()
+_ASSET_FIELDS = (
+    "name",
+    "description",
+    "status",
+    "condition",
+    "quantity",
+    "barcode",
+    "purchase_price",
+    "estimated_value",
+    "notes",
+)
+
+IMPORT_STATUSES = ("active", "draft")
+
+
+class ImportFileError(Exception):
+    """The uploaded file cannot be read as an import sheet."""
+
+
+def _column_key(header) -> str:
+    return str(header or "").strip().lower().replace(" ", "_")
+
+
+def _cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def read_import_rows(fileobj, filename: str) -> list[dict]:
+    """Read an import sheet into ``{column: text}`` dicts.
+
+    The first row is the header; blank rows are skipped. Each dict
+    carries its 1-based sheet row number under ``"_row"``.
+
+    Raises:
+        ImportFileError: Unsupported type, unreadable file, missing
+            ``name`` column, unknown columns or too many rows.
+    """
+    if filename.lower().endswith(".xlsx"):
+        import openpyxl
+
+        try:
+            wb = openpyxl.load_workbook(
+                fileobj, read_only=True, data_only=True
+            )
+        except Exception as exc:
+            raise ImportFileError(f"Could not read workbook: {exc}")
+        try:
+            sheet_rows = [
+                [_cell(v) for v in row]
+                for row in wb.active.iter_rows(values_only=True)
+            ]
+        finally:
+            wb.close()
+    elif filename.lower().endswith(".csv"):
+        try:
+            text = fileobj.read().decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise ImportFileError("CSV files must be UTF-8 encoded.")
+        sheet_rows = [
+            [_cell(v) for v in row] for row in csv.reader(io.StringIO(text))
+        ]
+    else:
+        raise ImportFileError("Upload a .csv or .xlsx file.")
+
+    if not sheet_rows:
+        raise ImportFileError("The file is empty.")
+    header = [_column_key(h) for h in sheet_rows[0]]
+    unknown = sorted({h for h in header if h and h not in IMPORT_COLUMNS})
+    if unknown:
+        raise ImportFileError(f"Unknown column(s): {', '.join(unknown)}.")
+    if "name" not in header:
+        raise ImportFileError("The file has no 'name' column.")
+
+    rows = []
+    for number, values in enumerate(sheet_rows[1:], start=2):
+        if not any(values):
+            continue
+        row = {
+            key: value for key, value in zip(header, values) if key and value
+        }
+        row["_row"] = number
+        rows.append(row)
+    if len(rows) > MAX_IMPORT_ROWS:
+        raise ImportFileError(
+            f"Imports are limited to {MAX_IMPORT_ROWS} rows per file."
+        )
+    return rows
+
+
+def _split(value: str, separator: str) -> list[str]:
+    return [part.strip() for part in value.split(separator) if part.strip()]
+
+
+def _lookups(rows):
+    """Resolve every category, location and barcode in a few queries."""
+    category_names = {r["category"].lower() for r in rows if "category" in r}
+    categories = defaultdict(list)
+    for pk, name, department, prefix in (
+        Category.objects.annotate(lname=Lower("name"))
+        .filter(lname__in=category_names)
+        .values_list(
+            "pk", "lname", "department__name", "department__barcode_prefix"
+        )
+    ):
+        categories[name].append((pk, (department or "").lower(), prefix))
+
+    location_keys = {r["location"].lower() for r in rows if "location" in r}
+    locations_by_path, locations_by_name = {}, defaultdict(list)
+    for pk, path, name in (
+        Location.objects.filter(is_active=True)
+        .annotate(lpath=Lower("full_path"), lname=Lower("name"))
+        .filter(Q(lpath__in=location_keys) | Q(lname__in=location_keys))
+        .values_list("pk", "lpath", "lname")
+    ):
+        locations_by_path[path] = pk
+        locations_by_name[name].append(pk)
+
+    # Registry keys are normalised, so scans (and this check) ignore case
+    keys = {normalise_identifier(r["barcode"]) for r in rows if "barcode" in r}
+    taken = set(
+        AssetIdentifier.objects.filter(key__in=keys).values_list(
+            "key", flat=True
+        )
+    )
+    return categories, locations_by_path, locations_by_name, taken
+
+
+def _clean_row(row, lookups, seen_barcodes):
+    """Return ``(parsed, messages)`` for one sheet row."""
+    categories, locations_by_path, locations_by_name, taken = lookups
+    errors = []
+    parsed = {"row": row["_row"], "status": "active"}
+
+    for name in _ASSET_FIELDS:
+        raw = row.get(name, "")
+        if not raw and name != "name":
+            continue
+        field = Asset._meta.get_field(name)
+        if field.choices:
+            raw = raw.lower()
+        try:
+            parsed[name] = field.clean(raw, None)
+        except ValidationError as exc:
+            errors.extend(f"{name}: {m}" for m in exc.messages)
+    if parsed.get("status") not in IMPORT_STATUSES:
+        errors.append("status: imported assets must be active or draft.")
+
+    prefix = None
+    if "category" in row:
+        matches = categories.get(row["category"].lower(), [])
+        department = row.get("department", "").lower()
+        if department:
+            matches = [m for m in matches if m[1] == department]
+        if len(matches) == 1:
+            parsed["category_id"], _, prefix = matches[0]
+        elif not matches:
+            errors.append(f"category: '{row['category']}' not found.")
+        else:
+            errors.append(
+                f"category: '{row['category']}' exists in several "
+                "departments; add a department column."
+            )
+    parsed["prefix"] = prefix or getattr(settings, "BARCODE_PREFIX", "ASSET")
+
+    if "location" in row:
+        key = row["location"].lower()
+        pk = locations_by_path.get(key)
+        if pk is None and len(locations_by_name.get(key, [])) == 1:
+            pk = locations_by_name[key][0]
+        if pk is None:
+            errors.append(
+                f"location: '{row['location']}' not found or ambiguous; "
+                "use the full path (e.g. 'Store > Shelf A')."
+            )
+        parsed["current_location_id"] = pk
+
+    if parsed.get("status") == "active" and not (
+        "category" in row and "location" in row
+    ):
+        errors.append("Active assets need a category and a location.")
+
+    barcode = parsed.get("barcode")
+    if barcode:
+        key = normalise_identifier(barcode)
+        if key in taken:
+            errors.append(f"barcode: '{barcode}' is already in use.")
+        elif key in seen_barcodes:
+            errors.append(f"barcode: '{barcode}' appears more than once.")
+        seen_barcodes.add(key)
+
+    parsed["tags"] = _split(row.get("tags", ""), ",")
+    too_long = [t for t in parsed["tags"] if len(t) > 50]
+    if too_long:
+        errors.append(f"tags: '{too_long[0]}' is longer than 50 characters.")
+
+    serials = _split(row.get("serials", ""), ";")
+    if serials:
+        if "quantity" in row:
+            errors.append("Give either a quantity or serials, not both.")
+        if len(set(serials)) != len(serials):
+            errors.append("serials: serial numbers must be unique.")
+        if any(len(s) > 100 for s in serials):
+            errors.append("serials: serial numbers are limited to 100 chars.")
+    parsed["serials"] = serials
+    return parsed, errors
+
+
+def validate_import_rows(rows: list[dict]):
+    """Dry-run validation of sheet rows.
+
+    Returns:
+        ``(parsed_rows, errors)``; ``errors`` is a list of
+        ``{"row": n, "message": text}`` dicts, empty when every row
+        can be imported.
+    """
+    lookups = _lookups(rows)
+    seen_barcodes = set()
+    parsed_rows, errors = [], []
+    for row in rows:
+        parsed, messages = _clean_row(row, lookups, seen_barcodes)
+        parsed_rows.append(parsed)
+        errors.extend({"row": row["_row"], "message": m} for m in messages)
+    return parsed_rows, errors
+
+
+def allocate_barcodes(prefix: str, count: int) -> list[str]:
+    """Allocate ``count`` unused ``PREFIX-XXXXXXXX`` barcodes.
+
+    Candidates are checked against assets and serials one block at a
+    time; only colliding candidates are redrawn.
+    """
+    allocated = set()
+    while len(allocated) < count:
+        candidates = {
+            f"{prefix}-{uuid.uuid4().hex[:8].upper()}"
+            for _ in range(count - len(allocated))
+        } - allocated
+        candidates -= set(
+            Asset.objects.filter(barcode__in=candidates).values_list(
+                "barcode", flat=True
+            )
+        )
+        candidates -= set(
+            AssetSerial.objects.filter(barcode__in=candidates).values_list(
+                "barcode", flat=True
+            )
+        )
+        allocated |= candidates
+    return list(allocated)
+
+
+def _tag_ids(parsed_rows) -> dict:
+    """Map lower-cased tag names to pks, creating missing tags."""
+    names = {}
+    for parsed in parsed_rows:
+        for tag in parsed["tags"]:
+            names.setdefault(tag.lower(), tag)
+    existing = dict(
+        Tag.objects.annotate(lname=Lower("name"))
+        .filter(lname__in=names)
+        .values_list("lname", "pk")
+    )
+    missing = [name for key, name in names.items() if key not in existing]
+    if missing:
+        Tag.objects.bulk_create(
+            [Tag(name=name) for name in missing], ignore_conflicts=True
+        )
+        existing = dict(
+            Tag.objects.annotate(lname=Lower("name"))
+            .filter(lname__in=names)
+            .values_list("lname", "pk")
+        )
+    return existing
+
+
+def _serial_barcodes(assets, batch) -> dict[int, list[str]]:
+    """Generate ``{ASSET}-S{NNN}`` barcodes for each asset's serials.
+
+    Like ``create_serial``, an index whose code is already registered
+    is skipped for the next one. Candidates are checked against the
+    identifier registry one round at a time; only colliding serials
+    are redrawn.
+    """
+    wanted = {a.pk: len(p["serials"]) for a, p in zip(assets, batch)}
+    barcodes = {pk: [] for pk in wanted}
+    next_index = dict.fromkeys(wanted, 1)
+    asset_barcodes = {a.pk: a.barcode for a in assets}
+    # The batch's own barcodes are not registered until after this
+    batch_keys = {normalise_identifier(a.barcode) for a in assets}
+    while True:
+        candidates = {}
+        for pk, count in wanted.items():
+            start = next_index[pk]
+            next_index[pk] = start + count - len(barcodes[pk])
+            for i in range(start, next_index[pk]):
+                code = generate_serial_barcode_string(asset_barcodes[pk], i)
+                candidates[normalise_identifier(code)] = (pk, code)
+        if not candidates:
+            return barcodes
+        taken = batch_keys | set(
+            AssetIdentifier.objects.filter(key__in=candidates).values_list(
+                "key", flat=True
+            )
+        )
+        for key, (pk, code) in candidates.items():
+            if key not in taken:
+                barcodes[pk].append(code)
+
+
+def _import_batch(batch, tag_ids, user) -> list[int]:
+    """Create one batch of assets with their tags and serials."""
+    missing = defaultdict(list)
+    for parsed in batch:
+        if not parsed.get("barcode"):
+            missing[parsed["prefix"]].append(parsed)
+    for prefix, rows in missing.items():
+        for parsed, code in zip(rows, allocate_barcodes(prefix, len(rows))):
+            parsed["barcode"] = code
+
+    assets = Asset.objects.bulk_create(
+        [
+            Asset(
+                **{f: p[f] for f in _ASSET_FIELDS if f in p},
+                category_id=p.get("category_id"),
+                current_location_id=p.get("current_location_id"),
+                is_serialised=bool(p["serials"]),
+                created_by=user,
+            )
+            for p in batch
+        ]
+    )
+    Through = Asset.tags.through
+    Through.objects.bulk_create(
+        [
+            Through(asset_id=asset.pk, tag_id=tag_ids[tag.lower()])
+            for asset, p in zip(assets, batch)
+            for tag in {t.lower(): t for t in p["tags"]}.values()
+        ],
+        ignore_conflicts=True,
+    )
+    serial_barcodes = _serial_barcodes(assets, batch)
+    AssetSerial.objects.bulk_create(
+        [
+            AssetSerial(
+                asset_id=asset.pk,
+                serial_number=number,
+                barcode=barcode,
+                current_location_id=asset.current_location_id,
+            )
+            for asset, p in zip(assets, batch)
+            for number, barcode in zip(p["serials"], serial_barcodes[asset.pk])
+        ]
+    )
+
+    asset_ids = [asset.pk for asset in assets]
+    sync_asset_identifiers(asset_ids)
+    record_new_assets(asset_ids)
+    serialised = [a.pk for a in assets if a.is_serialised]
+    if serialised:
+        refresh_serial_counters(serialised)
+    by_barcode = {asset.barcode: asset.pk for asset in assets}
+    virtual = list(
+        VirtualBarcode.objects.filter(
+            barcode__in=by_barcode, assigned_to_asset__isnull=True
+        )
+    )
+    now = timezone.now()
+    for vb in virtual:
+        vb.assigned_to_asset_id = by_barcode[vb.barcode]
+        vb.assigned_at = now
+    VirtualBarcode.objects.bulk_update(
+        virtual, ["assigned_to_asset", "assigned_at"]
+    )
+    return asset_ids
+
+
+def _load_rows(job: ImportJob) -> list[dict]:
+    with job.file.open("rb") as f:
+        return read_import_rows(io.BytesIO(f.read()), job.original_filename)
+
+
+def _fail(job_id, message, status="failed") -> None:
+    ImportJob.objects.filter(pk=job_id).update(
+        status=status, error_message=message, completed_at=timezone.now()
+    )
+
+
+def validate_import_job(job_id: int) -> None:
+    """Dry-run a pending job and mark it validated or invalid."""
+    claimed = ImportJob.objects.filter(pk=job_id, status="pending").update(
+        status="validating"
+    )
+    if not claimed:
+        return
+    job = ImportJob.objects.get(pk=job_id)
+    try:
+        rows = _load_rows(job)
+        _, errors = validate_import_rows(rows)
+    except ImportFileError as exc:
+        _fail(job_id, str(exc), status="invalid")
+        return
+    except Exception as exc:
+        logger.exception("Import validation %s failed", job.job_id)
+        _fail(job_id, str(exc)[:1000])
+        return
+    ImportJob.objects.filter(pk=job_id).update(
+        status="invalid" if errors else "validated",
+        total=len(rows),
+        errors=errors[:MAX_STORED_ERRORS],
+        error_message=(
+            f"{len(errors)} problem{'s' if len(errors) != 1 else ''} "
+            "found; nothing was imported."
+            if errors
+            else ""
+        ),
+    )
+
+
+def queue_import_job(job: ImportJob) -> bool:
+    """Queue a validated job for import; False if it is not validated."""
+    queued = ImportJob.objects.filter(pk=job.pk, status="validated").update(
+        status="queued"
+    )
+    if queued:
+        from assets.tasks import run_asset_import
+
+        transaction.on_commit(lambda: run_asset_import.delay(job.pk))
+    return bool(queued)
+
+
+def run_import_job(job_id: int) -> None:
+    """Import a queued job's rows in batches, recording progress.
+
+    The file is validated again first, since the catalogue may have
+    changed since the dry run. Batches are committed one at a time;
+    if one fails, the job records how many assets were created.
+    """
+    claimed = ImportJob.objects.filter(pk=job_id, status="queued").update(
+        status="importing", processed=0, created_count=0
+    )
+    if not claimed:
+        return
+    job = ImportJob.objects.get(pk=job_id)
+    created = 0
+    try:
+        parsed_rows, errors = validate_import_rows(_load_rows(job))
+        if errors:
+            ImportJob.objects.filter(pk=job_id).update(
+                errors=errors[:MAX_STORED_ERRORS]
+            )
+            _fail(
+                job_id,
+                "The catalogue changed since validation; nothing was "
+                "imported.",
+                status="invalid",
+            )
+            return
+        tag_ids = _tag_ids(parsed_rows)
+        rows = iter(parsed_rows)
+        while batch := list(islice(rows, IMPORT_BATCH_SIZE)):
+            with transaction.atomic():
+                asset_ids = _import_batch(batch, tag_ids, job.requested_by)
+                transaction.on_commit(
+                    lambda ids=asset_ids: _queue_barcode_images(ids)
+                )
+            created += len(asset_ids)
+            ImportJob.objects.filter(pk=job_id).update(
+                processed=created, created_count=created
+            )
+    except Exception as exc:
+        logger.exception("Import job %s failed", job.job_id)
+        _fail(
+            job_id,
+            f"Import stopped after {created} asset"
+            f"{'s' if created != 1 else ''}: {exc}"[:1000],
+        )
+        return
+    finally:
+        if created:
+            bump_catalogue_version()
+    ImportJob.objects.filter(pk=job_id).update(
+        status="completed", completed_at=timezone.now()
+    )
+
+
+def _queue_barcode_images(asset_ids) -> None:
+    from assets.tasks import render_barcode_images
+
+    render_barcode_images.delay(asset_ids)
+
+
+def render_missing_barcode_images(asset_ids) -> int:
+    """Render Code128 images for assets and their serials that have none.
+
+    Writes only the image column, so no save side effects run.
+    Returns the number of images rendered.
+    """
+    rendered = 0
+    for queryset in (
+        Asset.objects.filter(pk__in=asset_ids),
+        AssetSerial.objects.filter(asset_id__in=asset_ids),
+    ):
+        for obj in queryset.only("pk", "barcode", "barcode_image"):
+            if obj.barcode_image or not obj.barcode:
+                continue
+            obj.barcode_image.save(
+                f"{obj.barcode}.png",
+                generate_code128_image(obj.barcode),
+                save=False,
+            )
+            queryset.model.objects.filter(pk=obj.pk).update(
+                barcode_image=obj.barcode_image.name
+            )
+            rendered += 1
+    return rendered
@@ -0,0 +1,347 @@
+"""Maintained availability counters on Asset.
+
+``Asset`` stores three counters so availability checks are column
+reads rather than scans of transaction history or serial rows:
+
+- ``checked_out_quantity``: checkout minus checkin quantity over the
+  asset's transactions.
+- ``available_serial_count``: active, not checked out, not archived
+  serials.
+- ``checked_out_serial_count``: checked-out, not archived serials.
+
+``Transaction.save`` and the bulk services apply checkout/checkin
+deltas with ``apply_transaction_counters``; ``AssetSerial`` writes
+recount the serial columns with ``refresh_serial_counters``. Paths
+that move transactions or serials between assets with
+``queryset.update()`` call ``refresh_availability_counters``.
+``reconcile_availability_counters`` (the ``reconcile_availability``
+command) verifies every asset against the source tables.
+
+Recomputing ``checked_out_quantity`` does not scan an asset's whole
+transaction history: ``TransactionCheckpoint`` rows hold the
+outstanding quantity folded up to a shared watermark transaction, and
+only newer transactions are summed on top. The watermark is kept in
+the ``ledger-checkpoints`` ``RollupWatermark`` row, which is also the
+lock serialising checkpoint writers. The
+``checkpoint_transaction_ledger`` task advances it with
+``advance_ledger_checkpoints``.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import models, transaction
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from assets.models import (
+    Asset,
+    AssetSerial,
+    RollupWatermark,
+    Transaction,
+    TransactionCheckpoint,
+)
+
+SERIAL_COUNTER_FIELDS = ("available_serial_count", "checked_out_serial_count")
+COUNTER_FIELDS = ("checked_out_quantity",) + SERIAL_COUNTER_FIELDS
+
+_QUANTITY_DELTA = {"checkout": 1, "checkin": -1}
+
+# Transactions younger than this are left for the next checkpoint run,
+# so a pk allocated by a still-open transaction is not skipped over.
+CHECKPOINT_LAG = timedelta(minutes=5)
+WATERMARK_NAME = "ledger-checkpoints"
+
+
+def _outstanding_sum():
+    return Coalesce(
+        Sum("quantity", filter=Q(action="checkout")), 0
+    ) - Coalesce(Sum("quantity", filter=Q(action="checkin")), 0)
+
+
+def _watermark():
+    """The checkpoint watermark as an expression (0 before any run).
+
+    Evaluated in the same statement as the sums that depend on it, so
+    a concurrent checkpoint run cannot be counted twice.
+    """
+    return Coalesce(
+        Subquery(
+            RollupWatermark.objects.filter(name=WATERMARK_NAME).values(
+                "as_of_transaction_id"
+            )[:1]
+        ),
+        0,
+    )
+
+
+def _serial_count(**filters):
+    return Coalesce(
+        Subquery(
+            AssetSerial.objects.filter(
+                asset=OuterRef("pk"), is_archived=False, **filters
+            )
+            .values("asset")
+            .annotate(count=Count("pk"))
+            .values("count")[:1],
+            output_field=models.IntegerField(),
+        ),
+        0,
+    )
+
+
+def expected_counters():
+    """Counter values recomputed from source tables, as expressions.
+
+    Outstanding quantity is the asset's checkpoints plus the
+    transactions after the checkpoint watermark.
+    """
+    checkpointed = (
+        TransactionCheckpoint.objects.filter(asset=OuterRef("pk"))
+        .values("asset")
+        .annotate(total=Sum("outstanding_quantity"))
+        .values("total")[:1]
+    )
+    recent = (
+        Transaction.objects.filter(asset=OuterRef("pk"), pk__gt=_watermark())
+        .values("asset")
+        .annotate(outstanding=_outstanding_sum())
+        .values("outstanding")[:1]
+    )
+    return {
+        "checked_out_quantity": Coalesce(
+            Subquery(checkpointed, output_field=models.IntegerField()), 0
+        )
+        + Coalesce(Subquery(recent, output_field=models.IntegerField()), 0),
+        "available_serial_count": _serial_count(
+            status="active", checked_out_to__isnull=True
+        ),
+        "checked_out_serial_count": _serial_count(
+            checked_out_to__isnull=False
+        ),
+    }
+
+
+def checked_out_expression():
+    """``Asset.is_checked_out`` as a boolean query expression.
+
+    Lets the bulk services classify a whole target set in the query
+    that loads it.
+    """
+    return models.Case(
+        models.When(
+            Q(is_serialised=True, checked_out_serial_count__gt=0)
+            | (
+                Q(is_serialised=False)
+                & (
+                    Q(checked_out_quantity__gt=0)
+                    | Q(checked_out_to__isnull=False)
+                )
+            ),
+            then=models.Value(True),
+        ),
+        default=models.Value(False),
+        output_field=models.BooleanField(),
+    )
+
+
+def apply_transaction_counters(transactions) -> None:
+    """Apply the checkout/checkin quantities of new transactions.
+
+    One atomic ``F()`` update per distinct delta, so a bulk checkout
+    of N single units is one UPDATE rather than N. In-memory assets
+    attached to the transactions are updated to match.
+    """
+    deltas = defaultdict(int)
+    for txn in transactions:
+        sign = _QUANTITY_DELTA.get(txn.action)
+        if sign:
+            deltas[txn.asset_id] += sign * txn.quantity
+    by_delta = defaultdict(list)
+    for asset_id, delta in deltas.items():
+        if delta:
+            by_delta[delta].append(asset_id)
+    for delta, asset_ids in by_delta.items():
+        Asset.objects.filter(pk__in=asset_ids).update(
+            checked_out_quantity=F("checked_out_quantity") + delta
+        )
+    for txn in transactions:
+        sign = _QUANTITY_DELTA.get(txn.action)
+        if sign and Transaction.asset.is_cached(txn):
+            txn.asset.checked_out_quantity += sign * txn.quantity
+
+
+def refresh_serial_counters(asset_ids) -> None:
+    """Recount the serial counters of the given assets."""
+    expected = expected_counters()
+    Asset.objects.filter(pk__in=asset_ids).update(
+        **{field: expected[field] for field in SERIAL_COUNTER_FIELDS}
+    )
+
+
+def refresh_availability_counters(asset_ids) -> None:
+    """Recompute every counter of the given assets from source."""
+    Asset.objects.filter(pk__in=asset_ids).update(**expected_counters())
+
+
+def reconcile_availability_counters(fix=False, batch_size=1000):
+    """Compare stored counters with the source tables.
+
+    Args:
+        fix: Rewrite the counters of assets that disagree.
+        batch_size: Assets checked per query.
+
+    Returns:
+        List of ``(asset_pk, field, stored, expected)`` tuples, one
+        per mismatched counter.
+    """
+    expected = {f"expected_{k}": v for k, v in expected_counters().items()}
+    mismatches = []
+    last_pk = 0
+    while True:
+        rows = list(
+            Asset.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .annotate(**expected)
+            .values("pk", *COUNTER_FIELDS, *expected)[:batch_size]
+        )
+        if not rows:
+            break
+        last_pk = rows[-1]["pk"]
+        stale = []
+        for row in rows:
+            for field in COUNTER_FIELDS:
+                if row[field] != row[f"expected_{field}"]:
+                    mismatches.append(
+                        (
+                            row["pk"],
+                            field,
+                            row[field],
+                            row[f"expected_{field}"],
+                        )
+                    )
+                    stale.append(row["pk"])
+        if fix and stale:
+            refresh_availability_counters(stale)
+    return mismatches
+
+
+def _lock_ledger_checkpoints() -> int:
+    """Serialise checkpoint writers and return the current watermark.
+
+    Locks the watermark row, creating it on first use, so runs are
+    serialised even before any checkpoint exists. Must be called
+    inside a transaction.
+    """
+    RollupWatermark.objects.get_or_create(name=WATERMARK_NAME)
+    return (
+        RollupWatermark.objects.select_for_update()
+        .get(name=WATERMARK_NAME)
+        .as_of_transaction_id
+    )
+
+
+def _ledger_deltas(transactions):
+    """Net outstanding quantity per (asset_id, serial_id) pair."""
+    return {
+        (row["asset_id"], row["serial_id"]): row["delta"]
+        for row in transactions.filter(action__in=_QUANTITY_DELTA)
+        .order_by()
+        .values("asset_id", "serial_id")
+        .annotate(delta=_outstanding_sum())
+    }
+
+
+def advance_ledger_checkpoints(lag=CHECKPOINT_LAG) -> int:
+    """Fold settled transactions into the ledger checkpoints.
+
+    Transactions after the current watermark and created more than
+    ``lag`` ago are added to their (asset, serial) checkpoint, then
+    every checkpoint moves to the new watermark.
+
+    Args:
+        lag: Minimum age of a transaction before it is folded in.
+
+    Returns:
+        The new watermark transaction id.
+    """
+    with transaction.atomic():
+        watermark = _lock_ledger_checkpoints()
+        cutoff = timezone.now() - lag
+        target = (
+            Transaction.objects.filter(pk__gt=watermark)
+            .filter(Q(created_at__lte=cutoff) | Q(created_at__isnull=True))
+            .aggregate(target=Max("pk"))["target"]
+        )
+        if target is None:
+            return watermark
+
+        deltas = _ledger_deltas(
+            Transaction.objects.filter(pk__gt=watermark, pk__lte=target)
+        )
+        existing = {
+            (cp.asset_id, cp.serial_id): cp
+            for cp in TransactionCheckpoint.objects.filter(
+                asset_id__in={asset_id for asset_id, _ in deltas}
+            )
+        }
+        changed, created = [], []
+        for (asset_id, serial_id), delta in deltas.items():
+            if not delta:
+                continue
+            checkpoint = existing.get((asset_id, serial_id))
+            if checkpoint is None:
+                created.append(
+                    TransactionCheckpoint(
+                        asset_id=asset_id,
+                        serial_id=serial_id,
+                        as_of_transaction_id=target,
+                        outstanding_quantity=delta,
+                    )
+                )
+            else:
+                checkpoint.outstanding_quantity += delta
+                changed.append(checkpoint)
+        TransactionCheckpoint.objects.bulk_update(
+            changed, ["outstanding_quantity"], batch_size=1000
+        )
+        TransactionCheckpoint.objects.bulk_create(created, batch_size=1000)
+        TransactionCheckpoint.objects.update(
+            as_of_transaction_id=target, updated_at=timezone.now()
+        )
+        RollupWatermark.objects.filter(name=WATERMARK_NAME).update(
+            as_of_transaction_id=target, updated_at=timezone.now()
+        )
+    return target
+
+
+def rebuild_ledger_checkpoints(asset_ids) -> None:
+    """Recompute the checkpoints of the given assets at the watermark.
+
+    For paths that move transactions between assets with
+    ``queryset.update()``, which invalidates folded totals.
+    """
+    with transaction.atomic():
+        watermark = _lock_ledger_checkpoints()
+        TransactionCheckpoint.objects.filter(asset_id__in=asset_ids).delete()
+        if not watermark:
+            return
+        deltas = _ledger_deltas(
+            Transaction.objects.filter(
+                asset_id__in=asset_ids, pk__lte=watermark
+            )
+        )
+        TransactionCheckpoint.objects.bulk_create(
+            [
+                TransactionCheckpoint(
+                    asset_id=asset_id,
+                    serial_id=serial_id,
+                    as_of_transaction_id=watermark,
+                    outstanding_quantity=delta,
+                )
+                for (asset_id, serial_id), delta in deltas.items()
+                if delta
+            ],
+            batch_size=1000,
+        )
@@ -5,7 +5,14 @@ from django.db import transaction as db_transaction
 from django.db.models import F
 
 from ..models import Asset, AssetSerial, Category, Location, Transaction
+from .availability import (
+    apply_transaction_counters,
+    checked_out_expression,
+    refresh_serial_counters,
+)
+from .catalogue import bump_catalogue_version
 from .search import build_asset_search
+from .statistics import tracking_asset_statistics
 
 User = get_user_model()
 
@@ -33,19 +40,21 @@ def validate_filter_params(params: dict) -> dict:
     }
 
 
-def build_asset_filter_queryset(filters: dict):
+def build_asset_filter_queryset(filters: dict, queryset=None):
     """V271: Shared queryset builder for asset filtering.
 
-    Used by asset_list, bulk_actions, and print_all_filtered_labels
-    to ensure consistent filter logic.
+    Used by asset_list, export_assets, bulk_actions, and
+    print_all_filtered_labels to ensure consistent filter logic.
 
     Args:
         filters: Dict with keys from ALLOWED_FILTER_FIELDS.
+        queryset: Base Asset queryset (default ``Asset.objects.all()``).
 
     Returns:
         Queryset of Asset objects (not materialised).
     """
-    queryset = Asset.objects.all()
+    if queryset is None:
+        queryset = Asset.objects.all()
 
     status = filters.get("status", "")
     if status:
@@ -53,7 +62,9 @@ def build_asset_filter_queryset(filters: dict):
 
     q = filters.get("q", "")
     if q:
-        queryset = build_asset_search(queryset, q, include_nfc=True)
+        queryset = build_asset_search(
+            queryset, q, include_nfc=True, include_category=True
+        )
 
     department = filters.get("department", "")
     if department:
@@ -190,11 +201,17 @@ def bulk_transfer(asset_ids: list[int], location_id: int, user) -> dict:
             )
             for asset in eligible_assets
         ]
-        with db_transaction.atomic():
+        eligible_ids = [a.pk for a in eligible_assets]
+        with (
+            db_transaction.atomic(),
+            tracking_asset_statistics(eligible_ids, ("location",)),
+        ):
             Transaction.objects.bulk_create(transactions)
-            Asset.objects.filter(
-                pk__in=[a.pk for a in eligible_assets]
-            ).update(current_location=location)
+            apply_transaction_counters(transactions)
+            Asset.objects.filter(pk__in=eligible_ids).update(
+                current_location=location
+            )
+        bump_catalogue_version()
 
     return {
         "transferred": len(eligible_assets),
@@ -239,7 +256,9 @@ def bulk_status_change(
             failures.append(f"{asset.name}: {exc}")
 
     if valid_assets:
-        Asset.objects.bulk_update(valid_assets, ["status"])
+        with tracking_asset_statistics([a.pk for a in valid_assets]):
+            Asset.objects.bulk_update(valid_assets, ["status"])
+        bump_catalogue_version()
 
     return len(valid_assets), failures
 
@@ -262,17 +281,36 @@ def bulk_edit(
         category = Category.objects.get(pk=category_id)
         # V259: Only draft assets can have category bulk-assigned
         draft_qs = Asset.objects.filter(pk__in=asset_ids, status="draft")
-        count = draft_qs.update(category=category)
+        with tracking_asset_statistics(draft_qs):
+            count = draft_qs.update(category=category)
 
     if location_id:
         location = Location.objects.get(pk=location_id, is_active=True)
         all_qs = Asset.objects.filter(pk__in=asset_ids)
-        loc_count = all_qs.update(current_location=location)
+        with tracking_asset_statistics(all_qs, ("location",)):
+            loc_count = all_qs.update(current_location=location)
         count = max(count, loc_count)
 
+    if count:
+        bump_catalogue_version()
     return count
 
 
+def _partition_checked_out(queryset):
+    """Load the targets and split them by ``is_checked_out``.
+
+    Eligibility comes from one annotated query over the whole target
+    set rather than a property read per asset.
+
+    Returns ``(checked_out, not_checked_out)`` lists of assets.
+    """
+    checked_out: list[Asset] = []
+    not_checked_out: list[Asset] = []
+    for asset in queryset.annotate(is_out=checked_out_expression()):
+        (checked_out if asset.is_out else not_checked_out).append(asset)
+    return checked_out, not_checked_out
+
+
 def bulk_checkout(
     asset_ids: list[int],
     borrower_id: int,
@@ -295,18 +333,11 @@ def bulk_checkout(
         extra["due_date"] = due_date
 
     borrower = User.objects.get(pk=borrower_id)
-    assets = list(
+    # Separate checked-out assets (skip) from eligible ones
+    checked_out, eligible = _partition_checked_out(
         Asset.objects.filter(pk__in=asset_ids, status__in=["active", "draft"])
     )
-
-    # Separate checked-out assets (skip) from eligible ones
-    skipped: list[str] = []
-    eligible: list[Asset] = []
-    for asset in assets:
-        if asset.is_checked_out:
-            skipped.append(asset.name)
-        else:
-            eligible.append(asset)
+    skipped = [asset.name for asset in checked_out]
 
     if eligible:
         # Batch-set home_location for eligible assets that don't
@@ -323,18 +354,24 @@ def bulk_checkout(
                 asset=asset,
                 user=performed_by,
                 action="checkout",
-                from_location=asset.current_location,
+                from_location_id=asset.current_location_id,
                 borrower=borrower,
                 notes=notes,
                 **extra,
             )
             for asset in eligible
         ]
-        with db_transaction.atomic():
+        eligible_ids = [a.pk for a in eligible]
+        with (
+            db_transaction.atomic(),
+            tracking_asset_statistics(eligible_ids, ("category",)),
+        ):
             Transaction.objects.bulk_create(transactions)
-            Asset.objects.filter(pk__in=[a.pk for a in eligible]).update(
+            apply_transaction_counters(transactions)
+            Asset.objects.filter(pk__in=eligible_ids).update(
                 checked_out_to=borrower
             )
+        bump_catalogue_version()
 
     return {"checked_out": len(eligible), "skipped": skipped}
 
@@ -358,14 +395,10 @@ def bulk_checkin(
         extra = {"timestamp": timestamp, "is_backdated": True}
 
     location = Location.objects.get(pk=location_id, is_active=True)
-    assets = list(Asset.objects.filter(pk__in=asset_ids))
-    skipped: list[str] = []
-    eligible: list[Asset] = []
-    for asset in assets:
-        if not asset.is_checked_out:
-            skipped.append(asset.name)
-        else:
-            eligible.append(asset)
+    eligible, not_checked_out = _partition_checked_out(
+        Asset.objects.filter(pk__in=asset_ids)
+    )
+    skipped = [asset.name for asset in not_checked_out]
 
     if eligible:
         transactions = [
@@ -373,19 +406,25 @@ def bulk_checkin(
                 asset=asset,
                 user=performed_by,
                 action="checkin",
-                from_location=asset.current_location,
+                from_location_id=asset.current_location_id,
                 to_location=location,
                 notes=notes,
                 **extra,
             )
             for asset in eligible
         ]
-        with db_transaction.atomic():
+        eligible_ids = [a.pk for a in eligible]
+        with (
+            db_transaction.atomic(),
+            tracking_asset_statistics(eligible_ids, ("category", "location")),
+        ):
             Transaction.objects.bulk_create(transactions)
-            Asset.objects.filter(pk__in=[a.pk for a in eligible]).update(
+            apply_transaction_counters(transactions)
+            Asset.objects.filter(pk__in=eligible_ids).update(
                 checked_out_to=None,
                 current_location=location,
             )
+        bump_catalogue_version()
 
     return {"checked_in": len(eligible), "skipped": skipped}
 
@@ -413,19 +452,15 @@ def bulk_checkin_to_home(
     if timestamp:
         extra = {"timestamp": timestamp, "is_backdated": True}
 
-    assets = list(
-        Asset.objects.filter(pk__in=asset_ids).select_related(
-            "current_location", "home_location"
-        )
+    checked_out, not_checked_out = _partition_checked_out(
+        Asset.objects.filter(pk__in=asset_ids)
     )
-    skipped: list[str] = []
+    skipped = [asset.name for asset in not_checked_out]
     no_home: list[str] = []
     eligible: list[Asset] = []
     serialised_eligible: list[Asset] = []
-    for asset in assets:
-        if not asset.is_checked_out:
-            skipped.append(asset.name)
-        elif not asset.home_location:
+    for asset in checked_out:
+        if not asset.home_location_id:
             no_home.append(asset.name)
         elif asset.is_serialised:
             serialised_eligible.append(asset)
@@ -433,8 +468,12 @@ def bulk_checkin_to_home(
             eligible.append(asset)
 
     checked_in = 0
+    targets = [a.pk for a in eligible + serialised_eligible]
 
-    with db_transaction.atomic():
+    with (
+        db_transaction.atomic(),
+        tracking_asset_statistics(targets, ("category", "location")),
+    ):
         # --- Non-serialised assets: bulk operations ---
         if eligible:
             transactions = [
@@ -442,72 +481,96 @@ def bulk_checkin_to_home(
                     asset=asset,
                     user=performed_by,
                     action="checkin",
-                    from_location=asset.current_location,
-                    to_location=asset.home_location,
+                    from_location_id=asset.current_location_id,
+                    to_location_id=asset.home_location_id,
                     notes=notes,
                     **extra,
                 )
                 for asset in eligible
             ]
             Transaction.objects.bulk_create(transactions)
+            apply_transaction_counters(transactions)
             for asset in eligible:
                 asset.checked_out_to = None
-                asset.current_location = asset.home_location
+                asset.current_location_id = asset.home_location_id
             Asset.objects.bulk_update(
                 eligible, ["checked_out_to", "current_location"]
             )
+            bump_catalogue_version()
             checked_in += len(eligible)
 
-        # --- Serialised assets: per-serial transactions ---
-        for asset in serialised_eligible:
-            home = asset.home_location
-            checked_out_serials = list(
-                AssetSerial.objects.filter(
-                    asset=asset,
-                    checked_out_to__isnull=False,
-                    is_archived=False,
-                ).select_related("current_location")
+        # --- Serialised assets: per-serial transactions, batched
+        # across all assets ---
+        if serialised_eligible:
+            checked_in += _checkin_serials_to_home(
+                serialised_eligible, performed_by, notes, extra, skipped
             )
-            if not checked_out_serials:
-                skipped.append(asset.name)
-                continue
-
-            serial_txns = [
-                Transaction(
-                    asset=asset,
-                    user=performed_by,
-                    action="checkin",
-                    from_location=serial.current_location,
-                    to_location=home,
-                    serial=serial,
-                    notes=notes,
-                    **extra,
-                )
-                for serial in checked_out_serials
-            ]
-            Transaction.objects.bulk_create(serial_txns)
-            for serial in checked_out_serials:
-                serial.checked_out_to = None
-                serial.current_location = home
-            AssetSerial.objects.bulk_update(
-                checked_out_serials,
-                ["checked_out_to", "current_location"],
-            )
-
-            # Clear parent asset if no serials remain checked out
-            still_out = AssetSerial.objects.filter(
-                asset=asset,
-                checked_out_to__isnull=False,
-                is_archived=False,
-            ).exists()
-            if not still_out:
-                asset.checked_out_to = None
-            asset.current_location = home
-            asset.save(update_fields=["checked_out_to", "current_location"])
-            checked_in += 1
 
     return {
         "checked_in": checked_in,
         "skipped": skipped,
         "no_home": no_home,
     }
+
+
+def _checkin_serials_to_home(assets, performed_by, notes, extra, skipped):
+    """Check in every checked-out serial of ``assets`` to its home.
+
+    One query loads the serials of all assets, and the transactions,
+    serial updates and counter refresh are each issued once for the
+    whole set. Assets with no checked-out serials are appended to
+    ``skipped``.
+
+    Returns the number of assets checked in.
+    """
+    by_asset = {asset.pk: asset for asset in assets}
+    serials = list(
+        AssetSerial.objects.filter(
+            asset_id__in=by_asset,
+            checked_out_to__isnull=False,
+            is_archived=False,
+        ).order_by("asset_id", "pk")
+    )
+    done = {serial.asset_id for serial in serials}
+    skipped.extend(asset.name for asset in assets if asset.pk not in done)
+    if not serials:
+        return 0
+
+    serial_txns = []
+    for serial in serials:
+        asset = by_asset[serial.asset_id]
+        serial_txns.append(
+            Transaction(
+                asset=asset,
+                user=performed_by,
+                action="checkin",
+                from_location_id=serial.current_location_id,
+                to_location_id=asset.home_location_id,
+                serial=serial,
+                notes=notes,
+                **extra,
+            )
+        )
+        serial.checked_out_to = None
+        serial.current_location_id = asset.home_location_id
+    Transaction.objects.bulk_create(serial_txns)
+    apply_transaction_counters(serial_txns)
+    AssetSerial.objects.bulk_update(
+        serials, ["checked_out_to", "current_location"]
+    )
+    refresh_serial_counters(done)
+
+    # Clear the parent's borrower unless serials remain checked out
+    still_out = set(
+        AssetSerial.objects.filter(
+            asset_id__in=done,
+            checked_out_to__isnull=False,
+            is_archived=False,
+        ).values_list("asset_id", flat=True)
+    )
+    Asset.objects.filter(pk__in=done).update(
+        current_location=F("home_location")
+    )
+    Asset.objects.filter(pk__in=done - still_out).update(checked_out_to=None)
+    bump_catalogue_version()
+    return len(done)
@@ -0,0 +1,250 @@
+"""Chunked, resumable execution of bulk asset operations.
+
+Transfers, status changes, checkouts and check-ins run through a
+``BulkJob`` instead of one transaction over the whole selection. The
+target pks are processed in ascending chunks of BULK_CHUNK_SIZE; each
+chunk is its own atomic block that locks its assets with
+``select_for_update(skip_locked=True)``, so row locks are held for one
+chunk at a time and assets being checked out elsewhere are stepped
+over rather than waited on. Stepped-over assets are retried at the
+end, this time waiting for the lock.
+
+Each chunk saves the job's cursor and counts in the same atomic block
+as its writes, so a job whose worker died resumes where it stopped
+without applying any chunk twice (``resume_stale_bulk_jobs``
+re-queues jobs whose heartbeat is older than BULK_STALE_AFTER).
+
+Selections of up to SYNC_BULK_MAX_ASSETS run inside the request;
+larger ones are handed to the ``run_bulk_job`` task and the UI polls
+the job's status page.
+"""
+
+import logging
+from datetime import timedelta
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ..models import Asset, BulkJob
+from .bulk import (
+    bulk_checkin,
+    bulk_checkout,
+    bulk_status_change,
+    bulk_transfer,
+)
+
+logger = logging.getLogger(__name__)
+
+BULK_CHUNK_SIZE = 200
+SYNC_BULK_MAX_ASSETS = 500
+BULK_STALE_AFTER = timedelta(minutes=10)
+MAX_STORED_MESSAGES = 200
+
+
+def _timestamp(params):
+    value = params.get("timestamp")
+    return parse_datetime(value) if value else None
+
+
+def _transfer(asset_ids, params, user):
+    result = bulk_transfer(asset_ids, params["location_id"], user)
+    return result["transferred"], result["skipped"]
+
+
+def _status_change(asset_ids, params, user):
+    return bulk_status_change(asset_ids, params["new_status"], user)
+
+
+def _checkout(asset_ids, params, user):
+    result = bulk_checkout(
+        asset_ids,
+        params["borrower_id"],
+        user,
+        notes=params.get("notes", ""),
+        timestamp=_timestamp(params),
+    )
+    return result["checked_out"], result["skipped"]
+
+
+def _checkin(asset_ids, params, user):
+    result = bulk_checkin(
+        asset_ids,
+        params["location_id"],
+        user,
+        notes=params.get("notes", ""),
+        timestamp=_timestamp(params),
+    )
+    return result["checked_in"], result["skipped"]
+
+
+# action -> fn(asset_ids, params, user) -> (succeeded, skip messages)
+BULK_ACTIONS = {
+    "transfer": _transfer,
+    "status_change": _status_change,
+    "checkout": _checkout,
+    "checkin": _checkin,
+}
+
+
+def _run_chunk(job, chunk, user, skip_locked=True) -> None:
+    """Apply the job's action to one chunk under row locks.
+
+    The chunk's writes and the job's progress commit together. With
+    ``skip_locked`` the chunk comes from the cursor walk: the cursor
+    moves past it and assets locked by another transaction are
+    deferred. Otherwise it is the head of ``deferred_ids``, which is
+    consumed.
+    """
+    with transaction.atomic():
+        locked = list(
+            Asset.objects.select_for_update(skip_locked=skip_locked)
+            .filter(pk__in=chunk)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        succeeded, messages = (0, [])
+        if locked:
+            succeeded, messages = BULK_ACTIONS[job.action](
+                locked, job.params, user
+            )
+        if not skip_locked:
+            consumed = len(chunk)
+            job.deferred_ids = job.deferred_ids[consumed:]
+            _record(job, consumed, succeeded, messages)
+            return
+        busy = []
+        if len(locked) < len(chunk):
+            # Missing pks are either locked elsewhere or deleted
+            busy = list(
+                Asset.objects.filter(pk__in=chunk)
+                .exclude(pk__in=locked)
+                .values_list("pk", flat=True)
+            )
+        job.cursor = chunk[-1]
+        job.deferred_ids = job.deferred_ids + busy
+        _record(job, len(chunk) - len(busy), succeeded, messages)
+
+
+def _record(job, handled, succeeded, messages) -> None:
+    job.processed += handled
+    job.succeeded += succeeded
+    job.skipped_count += len(messages)
+    room = MAX_STORED_MESSAGES - len(job.skipped)
+    if room > 0:
+        job.skipped += list(messages)[:room]
+    job.heartbeat_at = timezone.now()
+    job.save(
+        update_fields=[
+            "cursor",
+            "deferred_ids",
+            "processed",
+            "succeeded",
+            "skipped_count",
+            "skipped",
+            "heartbeat_at",
+        ]
+    )
+
+
+def execute_bulk_job(job_id: int) -> bool:
+    """Run (or resume) a bulk job to completion.
+
+    Claims a pending job, or a running one whose heartbeat is stale,
+    so concurrent deliveries of the same job do not both run it.
+
+    Returns:
+        False if the job could not be claimed.
+    """
+    now = timezone.now()
+    claimed = (
+        BulkJob.objects.filter(pk=job_id)
+        .filter(
+            Q(status="pending")
+            | Q(status="running", heartbeat_at__lt=now - BULK_STALE_AFTER)
+        )
+        .update(status="running", heartbeat_at=now)
+    )
+    if not claimed:
+        return False
+    job = BulkJob.objects.select_related("requested_by").get(pk=job_id)
+    user = job.requested_by
+
+    try:
+        remaining = iter(sorted(pk for pk in job.asset_ids if pk > job.cursor))
+        while chunk := list(islice(remaining, BULK_CHUNK_SIZE)):
+            _run_chunk(job, chunk, user)
+
+        # Stepped-over assets: wait for the other writers this time
+        while job.deferred_ids:
+            chunk = job.deferred_ids[:BULK_CHUNK_SIZE]
+            _run_chunk(job, chunk, user, skip_locked=False)
+    except Exception as exc:
+        logger.exception("Bulk job %s failed", job.job_id)
+        BulkJob.objects.filter(pk=job_id).update(
+            status="failed",
+            error_message=str(exc)[:1000],
+            completed_at=timezone.now(),
+        )
+        return True
+
+    BulkJob.objects.filter(pk=job_id).update(
+        status="completed", completed_at=timezone.now()
+    )
+    return True
+
+
+def start_bulk_job(action: str, asset_ids, params: dict, user) -> BulkJob:
+    """Create a bulk job and run it now or in the background.
+
+    Args:
+        action: One of ``BULK_ACTIONS``.
+        asset_ids: Target asset pks.
+        params: JSON-serialisable action parameters
+            (``location_id``, ``new_status``, ``borrower_id``,
+            ``notes``, ``timestamp`` as an ISO string).
+        user: The user performing the operation.
+
+    Returns:
+        The job; completed already when the selection was small
+        enough to run inline.
+    """
+    if action not in BULK_ACTIONS:
+        raise ValueError(f"Unknown bulk action: {action}")
+    asset_ids = sorted({int(pk) for pk in asset_ids})
+    job = BulkJob.objects.create(
+        action=action,
+        params=params,
+        asset_ids=asset_ids,
+        total=len(asset_ids),
+        requested_by=user,
+    )
+    if job.total > SYNC_BULK_MAX_ASSETS:
+        from assets.tasks import run_bulk_job
+
+        transaction.on_commit(lambda: run_bulk_job.delay(job.pk))
+        return job
+    execute_bulk_job(job.pk)
+    job.refresh_from_db()
+    return job
+
+
+def resume_stale_bulk_jobs() -> int:
+    """Re-queue bulk jobs whose worker appears to have stopped.
+
+    Returns the number of jobs re-queued.
+    """
+    from assets.tasks import run_bulk_job
+
+    cutoff = timezone.now() - BULK_STALE_AFTER
+    stale = list(
+        BulkJob.objects.filter(
+            Q(status="running", heartbeat_at__lt=cutoff)
+            | Q(status="pending", created_at__lt=cutoff)
+        ).values_list("pk", flat=True)
+    )
+    for job_id in stale:
+        run_bulk_job.delay(job_id)
+    return len(stale)
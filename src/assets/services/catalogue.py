@@ -0,0 +1,66 @@
+"""Asset catalogue version counter.
+
+Caches derived from the asset catalogue (facet counts, search results,
+exports) include the current version in their keys, so bumping it
+invalidates them all at once without tracking individual keys.
+
+The version is bumped by signal handlers on writes to tags,
+categories, departments, locations and serials, by ``Asset.save`` when
+one of ``Asset.CATALOGUE_FIELDS`` changes (see ``models.py``), and
+explicitly by services that write with ``queryset.update()``.
+
+Checkouts change only the borrower, so they leave the version alone.
+Caches that also show borrowers key on ``get_ledger_version``, which
+adds the newest transaction id: every checkout records one.
+"""
+
+import time
+
+from django.core.cache import cache
+from django.db import transaction as db_transaction
+from django.db.models import Max
+
+CATALOGUE_VERSION_KEY = "asset_catalogue_version"
+
+
+def _seed_version() -> None:
+    # Seed from the clock so a version evicted from the cache never
+    # restarts below one that cached entries were stored under
+    cache.add(CATALOGUE_VERSION_KEY, time.time_ns() // 1000, timeout=None)
+
+
+def get_catalogue_version() -> int:
+    """Return the current catalogue version."""
+    version = cache.get(CATALOGUE_VERSION_KEY)
+    if version is None:
+        _seed_version()
+        version = cache.get(CATALOGUE_VERSION_KEY, 0)
+    return version
+
+
+def get_ledger_version() -> tuple:
+    """Return the catalogue version and the newest transaction id."""
+    from ..models import Transaction
+
+    return (
+        get_catalogue_version(),
+        Transaction.objects.aggregate(newest=Max("pk"))["newest"] or 0,
+    )
+
+
+def _increment() -> None:
+    try:
+        cache.incr(CATALOGUE_VERSION_KEY)
+    except ValueError:
+        _seed_version()
+
+
+def bump_catalogue_version() -> None:
+    """Invalidate catalogue-derived caches.
+
+    Bumps immediately and again once the surrounding transaction
+    commits, so a reader that cached pre-commit data under the new
+    version cannot keep serving it.
+    """
+    _increment()
+    db_transaction.on_commit(_increment)
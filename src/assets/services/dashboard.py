@@ -0,0 +1,189 @@
+"""Shared dashboard aggregates.
+
+The dashboard's status, department, category, location and tag counts
+depend only on the viewer's scope: every role except department
+manager sees the global figures, and a department manager sees those
+of the departments they manage. Aggregates are therefore cached per
+scope rather than per user, together with the ledger version they
+were computed at (see ``catalogue.py``), as the checked-out total
+moves with every checkout.
+
+A request that finds an entry from an older version serves it as is
+and queues ``refresh_dashboard_aggregates``; a per-scope lock keeps
+that to one refresh in flight however many users load the dashboard
+at once. Only a scope with no entry at all is computed in the request.
+
+The counts themselves are read from the maintained ``AssetStatistic``
+table rather than aggregated over assets.
+"""
+
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from ..models import AssetStatistic, Category, Department, Location, Tag
+from .catalogue import get_ledger_version
+
+# Entries are replaced by refreshes, not expired; the timeout only
+# bounds how long an unvisited scope occupies the cache.
+DASHBOARD_CACHE_TIMEOUT = 60 * 60 * 24  # seconds
+# Backstop for a refresh whose worker died before releasing the lock
+DASHBOARD_REFRESH_LOCK_TTL = 300  # seconds
+
+
+def dashboard_scope(dept_ids=None) -> str:
+    """Cache scope for a managed-department set (None for global)."""
+    if dept_ids is None:
+        return "global"
+    signature = ",".join(str(pk) for pk in sorted(set(dept_ids)))
+    return "depts-" + hashlib.md5(signature.encode()).hexdigest()
+
+
+def _cache_key(dept_ids) -> str:
+    return f"dashboard_aggregates:{dashboard_scope(dept_ids)}"
+
+
+def _lock_key(dept_ids) -> str:
+    return f"dashboard_aggregates_refresh:{dashboard_scope(dept_ids)}"
+
+
+def _statistic_total(dimension, key, dept_ids=None, **filters):
+    """Summed ``AssetStatistic`` counts for the outer row, as a
+    subquery matching ``key`` (``"key"`` or ``"department_key"``)."""
+    rows = AssetStatistic.objects.filter(
+        dimension=dimension, **{key: OuterRef("pk")}, **filters
+    )
+    if dept_ids is not None:
+        rows = rows.filter(department_key__in=dept_ids)
+    return Coalesce(
+        Subquery(
+            rows.values(key).annotate(total=Sum("count")).values("total")[:1],
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def compute_dashboard_aggregates(dept_ids=None) -> dict:
+    """Compute the aggregate counts for the dashboard.
+
+    Reads the maintained ``AssetStatistic`` rows (see
+    ``statistics.py``), so the cost follows the number of categories,
+    locations and tags, not the number of assets.
+
+    Args:
+        dept_ids: Department pks to restrict the counts to, or None
+            for the global figures.
+    """
+    scoped = dept_ids is not None
+
+    # Status totals: every asset has exactly one category row
+    totals = AssetStatistic.objects.filter(dimension="category")
+    if scoped:
+        totals = totals.filter(department_key__in=dept_ids)
+    status_counts = dict(
+        totals.values("status")
+        .annotate(total=Sum("count"))
+        .values_list("status", "total")
+    )
+
+    # Per-department counts
+    dept_qs = Department.objects.filter(is_active=True)
+    if scoped:
+        dept_qs = dept_qs.filter(pk__in=dept_ids)
+    dept_counts = list(
+        dept_qs.annotate(
+            asset_count=_statistic_total(
+                "category", "department_key", status="active"
+            )
+        )
+        .order_by("-asset_count")
+        .values("name", "asset_count")[:10]
+    )
+
+    # Per-category counts
+    cat_qs = Category.objects.all()
+    if scoped:
+        cat_qs = cat_qs.filter(department__in=dept_ids)
+    cat_counts = list(
+        cat_qs.annotate(
+            asset_count=_statistic_total("category", "key", status="active")
+        )
+        .order_by("-asset_count")
+        .values("name", "asset_count")[:10]
+    )
+
+    # Per-location counts
+    loc_counts = list(
+        Location.objects.filter(is_active=True)
+        .annotate(
+            asset_count=_statistic_total(
+                "location", "key", dept_ids, status="active"
+            )
+        )
+        .order_by("-asset_count")
+        .values("pk", "name", "asset_count")[:10]
+    )
+    total_locations = Location.objects.filter(is_active=True).count()
+
+    # Top 10 tags
+    tag_qs = Tag.objects.annotate(
+        asset_count=_statistic_total("tag", "key", dept_ids)
+    )
+    if scoped:
+        tag_qs = tag_qs.filter(asset_count__gt=0)
+    top_tags = list(
+        tag_qs.order_by("-asset_count").values("name", "asset_count")[:10]
+    )
+
+    return {
+        "total_active": status_counts.get("active", 0),
+        "total_draft": status_counts.get("draft", 0),
+        "total_checked_out": status_counts.get(AssetStatistic.CHECKED_OUT, 0),
+        "total_missing": status_counts.get("missing", 0),
+        "dept_counts": dept_counts,
+        "cat_counts": cat_counts,
+        "loc_counts": loc_counts,
+        "total_locations": total_locations,
+        "top_tags": top_tags,
+    }
+
+
+def refresh_dashboard_aggregates(dept_ids=None) -> dict:
+    """Recompute and store a scope's aggregates, releasing its lock.
+
+    The version is read before computing, so a write that lands while
+    the counts are being computed leaves the entry stale.
+    """
+    try:
+        version = get_ledger_version()
+        aggregates = compute_dashboard_aggregates(dept_ids)
+        cache.set(
+            _cache_key(dept_ids),
+            {"version": version, "aggregates": aggregates},
+            DASHBOARD_CACHE_TIMEOUT,
+        )
+    finally:
+        cache.delete(_lock_key(dept_ids))
+    return aggregates
+
+
+def get_dashboard_aggregates(dept_ids=None) -> dict:
+    """Return a scope's aggregates, possibly stale.
+
+    Computes in the request only when the scope has no entry. An
+    entry from an older ledger version is returned as is and one
+    background refresh is queued for it.
+    """
+    entry = cache.get(_cache_key(dept_ids))
+    if entry is None:
+        return refresh_dashboard_aggregates(dept_ids)
+    if entry["version"] != get_ledger_version() and cache.add(
+        _lock_key(dept_ids), 1, DASHBOARD_REFRESH_LOCK_TTL
+    ):
+        from assets.tasks import refresh_dashboard_aggregates as task
+
+        task.delay(None if dept_ids is None else sorted(dept_ids))
+    return entry["aggregates"]
@@ -1,9 +1,18 @@
-"""Excel export service for assets."""
+"""Excel export service for assets.
+
+Workbooks are built with openpyxl's write-only mode, which streams
+rows to disk instead of holding a cell object per value, and written
+to a spooled temporary file so only small exports stay in memory.
+"""
 
 from io import BytesIO
+from itertools import chain, islice
+from tempfile import SpooledTemporaryFile
 
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill
+from openpyxl.utils import get_column_letter
 
 from django.db.models import Sum
 
@@ -13,13 +22,104 @@ from ..models import Asset
 ITERATOR_THRESHOLD = 1000
 ITERATOR_CHUNK_SIZE = 1000
 
+# Rows buffered to estimate column widths before streaming the rest
+# (write-only sheets need widths before the first row is written)
+WIDTH_SAMPLE_ROWS = 200
+MAX_COLUMN_WIDTH = 50
+
+# Exports larger than this spill from memory to a temporary file
+SPOOL_MAX_SIZE = 10 * 1024 * 1024
+
+XLSX_CONTENT_TYPE = (
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+)
+
+ASSET_HEADERS = [
+    "Name",
+    "Description",
+    "Barcode",
+    "Category",
+    "Department",
+    "Location",
+    "Condition",
+    "Status",
+    "Purchase Price",
+    "Estimated Value",
+    "Tags",
+    "Quantity",
+    "Created Date",
+    "Last Updated",
+    "Checked Out To",
+]
+
+
+def _set_column_widths(ws, rows) -> None:
+    """Size columns from a sample of rows, capped at MAX_COLUMN_WIDTH."""
+    widths = {}
+    for row in rows:
+        for col_idx, value in enumerate(row, 1):
+            length = len(str(value if value is not None else ""))
+            widths[col_idx] = max(widths.get(col_idx, 0), length)
+    for col_idx, width in widths.items():
+        ws.column_dimensions[get_column_letter(col_idx)].width = min(
+            width + 2, MAX_COLUMN_WIDTH
+        )
 
-def export_assets_xlsx(queryset=None) -> BytesIO:
-    """Export assets to an Excel workbook.
 
-    Returns a BytesIO containing the .xlsx file.
-    Uses .iterator() for exports exceeding 1,000 assets to
-    avoid memory pressure.
+def _asset_row(asset) -> list:
+    location_display = ""
+    if asset.checked_out_to:
+        location_display = (
+            f"Checked out to {asset.checked_out_to.get_display_name()}"
+        )
+    elif asset.current_location:
+        location_display = str(asset.current_location)
+    elif asset.status == "active":
+        location_display = "Unknown"
+
+    return [
+        asset.name,
+        asset.description or "",
+        asset.barcode,
+        asset.category.name if asset.category else "",
+        (
+            asset.category.department.name
+            if asset.category and asset.category.department
+            else ""
+        ),
+        location_display,
+        asset.get_condition_display(),
+        asset.get_status_display(),
+        float(asset.purchase_price) if asset.purchase_price else "",
+        float(asset.estimated_value) if asset.estimated_value else "",
+        ", ".join(t.name for t in asset.tags.all()),
+        asset.quantity,
+        (
+            asset.created_at.strftime("%Y-%m-%dT%H:%M:%S")
+            if asset.created_at
+            else ""
+        ),
+        (
+            asset.updated_at.strftime("%Y-%m-%dT%H:%M:%S")
+            if asset.updated_at
+            else ""
+        ),
+        (asset.checked_out_to.get_full_name() if asset.checked_out_to else ""),
+    ]
+
+
+def write_assets_xlsx(fileobj, queryset=None, progress=None) -> None:
+    """Write the asset export workbook to a binary file object.
+
+    Uses a write-only workbook and ``.iterator()`` for exports
+    exceeding 1,000 assets, so memory stays flat as the export grows.
+    Column widths are estimated from the first WIDTH_SAMPLE_ROWS rows.
+
+    Args:
+        fileobj: Writable, seekable binary file object.
+        queryset: Assets to export; defaults to all assets.
+        progress: Optional callable receiving ``(processed, total)``
+            every ITERATOR_CHUNK_SIZE rows and once at the end.
     """
     if queryset is None:
         queryset = Asset.objects.select_related(
@@ -30,12 +130,7 @@ def export_assets_xlsx(queryset=None) -> BytesIO:
             "created_by",
         ).prefetch_related("tags")
 
-    wb = openpyxl.Workbook()
-
-    # Summary sheet
-    ws_summary = wb.active
-    ws_summary.title = "Summary"
-    header_font = Font(bold=True)
+    wb = openpyxl.Workbook(write_only=True)
     header_fill = PatternFill(
         start_color="F59E0B", end_color="F59E0B", fill_type="solid"
     )
@@ -43,21 +138,11 @@ def export_assets_xlsx(queryset=None) -> BytesIO:
     from django.conf import settings
 
     total_count = queryset.count()
+    if progress:
+        progress(0, total_count)
 
-    ws_summary.append([f"{settings.SITE_NAME} Asset Export"])
-    ws_summary["A1"].font = Font(bold=True, size=14)
-    ws_summary.append([])
-    ws_summary.append(["Total Assets", total_count])
-    ws_summary.append(["Active", queryset.filter(status="active").count()])
-    ws_summary.append(["Draft", queryset.filter(status="draft").count()])
-    ws_summary.append(
-        [
-            "Checked Out",
-            queryset.filter(checked_out_to__isnull=False).count(),
-        ]
-    )
-
-    ws_summary.append([])
+    # Summary sheet
+    ws_summary = wb.create_sheet("Summary")
     # Calculate totals using database aggregation (avoids loading
     # all rows into Python memory)
     agg = queryset.aggregate(
@@ -66,33 +151,29 @@ def export_assets_xlsx(queryset=None) -> BytesIO:
     )
     total_purchase = float(agg["total_purchase"] or 0)
     total_estimated = float(agg["total_estimated"] or 0)
-    ws_summary.append(["Total Purchase Price", f"${total_purchase:,.2f}"])
-    ws_summary.append(["Total Estimated Value", f"${total_estimated:,.2f}"])
+    summary_rows = [
+        [],
+        ["Total Assets", total_count],
+        ["Active", queryset.filter(status="active").count()],
+        ["Draft", queryset.filter(status="draft").count()],
+        [
+            "Checked Out",
+            queryset.filter(checked_out_to__isnull=False).count(),
+        ],
+        [],
+        ["Total Purchase Price", f"${total_purchase:,.2f}"],
+        ["Total Estimated Value", f"${total_estimated:,.2f}"],
+    ]
+    title = f"{settings.SITE_NAME} Asset Export"
+    _set_column_widths(ws_summary, [[title], *summary_rows])
+    title_cell = WriteOnlyCell(ws_summary, value=title)
+    title_cell.font = Font(bold=True, size=14)
+    ws_summary.append([title_cell])
+    for row in summary_rows:
+        ws_summary.append(row)
 
     # Assets sheet
     ws_assets = wb.create_sheet("Assets")
-    headers = [
-        "Name",
-        "Description",
-        "Barcode",
-        "Category",
-        "Department",
-        "Location",
-        "Condition",
-        "Status",
-        "Purchase Price",
-        "Estimated Value",
-        "Tags",
-        "Quantity",
-        "Created Date",
-        "Last Updated",
-        "Checked Out To",
-    ]
-    ws_assets.append(headers)
-    for col_idx, _header in enumerate(headers, 1):
-        cell = ws_assets.cell(row=1, column=col_idx)
-        cell.font = header_font
-        cell.fill = header_fill
 
     # Use .iterator() for large datasets to reduce memory pressure
     use_iterator = total_count > ITERATOR_THRESHOLD
@@ -101,65 +182,49 @@ def export_assets_xlsx(queryset=None) -> BytesIO:
         if use_iterator
         else queryset
     )
+    rows = map(_asset_row, asset_iter)
+    sample = list(islice(rows, WIDTH_SAMPLE_ROWS))
+    _set_column_widths(ws_assets, [ASSET_HEADERS, *sample])
+
+    header_cells = []
+    for header in ASSET_HEADERS:
+        cell = WriteOnlyCell(ws_assets, value=header)
+        cell.font = Font(bold=True)
+        cell.fill = header_fill
+        header_cells.append(cell)
+    ws_assets.append(header_cells)
+    processed = 0
+    for row in chain(sample, rows):
+        ws_assets.append(row)
+        processed += 1
+        if progress and processed % ITERATOR_CHUNK_SIZE == 0:
+            progress(processed, total_count)
+    if progress:
+        progress(processed, total_count)
 
-    for asset in asset_iter:
-        location_display = ""
-        if asset.checked_out_to:
-            location_display = (
-                f"Checked out to {asset.checked_out_to.get_display_name()}"
-            )
-        elif asset.current_location:
-            location_display = str(asset.current_location)
-        elif asset.status == "active":
-            location_display = "Unknown"
-
-        ws_assets.append(
-            [
-                asset.name,
-                asset.description or "",
-                asset.barcode,
-                asset.category.name if asset.category else "",
-                (
-                    asset.category.department.name
-                    if asset.category and asset.category.department
-                    else ""
-                ),
-                location_display,
-                asset.get_condition_display(),
-                asset.get_status_display(),
-                float(asset.purchase_price) if asset.purchase_price else "",
-                float(asset.estimated_value) if asset.estimated_value else "",
-                ", ".join(t.name for t in asset.tags.all()),
-                asset.quantity,
-                (
-                    asset.created_at.strftime("%Y-%m-%dT%H:%M:%S")
-                    if asset.created_at
-                    else ""
-                ),
-                (
-                    asset.updated_at.strftime("%Y-%m-%dT%H:%M:%S")
-                    if asset.updated_at
-                    else ""
-                ),
-                (
-                    asset.checked_out_to.get_full_name()
-                    if asset.checked_out_to
-                    else ""
-                ),
-            ]
-        )
+    wb.save(fileobj)
 
-    # Auto-size columns
-    for ws in [ws_summary, ws_assets]:
-        for column_cells in ws.columns:
-            max_length = max(
-                len(str(cell.value or "")) for cell in column_cells
-            )
-            ws.column_dimensions[column_cells[0].column_letter].width = min(
-                max_length + 2, 50
-            )
 
+def export_assets_xlsx(queryset=None) -> BytesIO:
+    """Export assets to an Excel workbook.
+
+    Returns a BytesIO containing the .xlsx file. Responses should use
+    ``export_assets_xlsx_file`` instead, which spools to disk.
+    """
     buffer = BytesIO()
-    wb.save(buffer)
+    write_assets_xlsx(buffer, queryset)
     buffer.seek(0)
     return buffer
+
+
+def export_assets_xlsx_file(queryset=None) -> SpooledTemporaryFile:
+    """Export assets to a spooled temporary file, rewound for reading.
+
+    The file stays in memory up to SPOOL_MAX_SIZE and moves to disk
+    beyond that; serve it with ``FileResponse``, which streams it in
+    blocks and closes it.
+    """
+    spool = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    write_assets_xlsx(spool, queryset)
+    spool.seek(0)
+    return spool
@@ -0,0 +1,197 @@
+"""Background asset export jobs.
+
+``request_export`` returns the job for an export request, reusing an
+in-flight or recently completed job with the same signature (export
+parameters plus catalogue version), so identical requests from several
+users build one file. The ``run_export_job`` task calls
+``build_export_job`` to write the workbook to default storage (S3 when
+configured), recording progress on the job as it goes. Finished files
+are served through a signed, expiring download link rather than a
+media URL.
+"""
+
+import hashlib
+import json
+import logging
+from datetime import timedelta
+from tempfile import SpooledTemporaryFile
+
+from django.core import signing
+from django.core.files import File
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Asset, ExportJob
+from .bulk import build_asset_filter_queryset, validate_filter_params
+from .catalogue import get_ledger_version
+from .export import SPOOL_MAX_SIZE, write_assets_xlsx
+from .result_cache import cached_asset_pks
+
+logger = logging.getLogger(__name__)
+
+# Exports up to this many assets are streamed within the request
+SYNC_EXPORT_MAX_ASSETS = 2000
+
+# A completed file is reused for identical requests for this long
+EXPORT_REUSE_WINDOW = timedelta(hours=24)
+
+# In-flight jobs older than this are presumed lost with their worker
+EXPORT_STALE_AFTER = timedelta(minutes=30)
+
+DOWNLOAD_LINK_MAX_AGE = 3600  # seconds
+_DOWNLOAD_SALT = "assets.export_job.download"
+
+
+def export_params(
+    filters: dict | None = None,
+    include_disposed: bool = False,
+    asset_ids=None,
+) -> dict:
+    """Build the JSON-serialisable parameters stored on an ExportJob.
+
+    Args:
+        filters: Filter parameters from ``validate_filter_params``.
+        include_disposed: Keep disposed assets in a filtered export.
+        asset_ids: Export exactly these assets instead (admin action).
+    """
+    if asset_ids is not None:
+        return {"asset_ids": sorted(asset_ids)}
+    return {
+        "filters": filters or {},
+        "include_disposed": bool(include_disposed),
+    }
+
+
+def export_queryset(params: dict):
+    """Return the asset queryset described by export ``params``."""
+    queryset = Asset.objects.with_related().select_related("created_by")
+    if "asset_ids" in params:
+        return queryset.filter(pk__in=params["asset_ids"])
+    filters = validate_filter_params(params.get("filters", {}))
+    pks = cached_asset_pks(filters)
+    if pks is not None:
+        queryset = queryset.filter(pk__in=pks)
+    else:
+        queryset = build_asset_filter_queryset(filters, queryset)
+    # Exclude disposed by default unless explicitly included
+    if not params.get("include_disposed"):
+        queryset = queryset.exclude(status="disposed")
+    return queryset
+
+
+def export_signature(params: dict) -> str:
+    """Hash of the export parameters and current ledger version."""
+    payload = json.dumps(
+        {"params": params, "version": get_ledger_version()},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def request_export(params: dict, user) -> ExportJob:
+    """Return an export job for ``params``, queueing one if needed.
+
+    An in-flight job with the same signature, or one completed within
+    EXPORT_REUSE_WINDOW, is returned instead of starting another.
+    """
+    signature = export_signature(params)
+    now = timezone.now()
+    ExportJob.objects.filter(
+        signature=signature,
+        status__in=ExportJob.IN_FLIGHT_STATUSES,
+        created_at__lt=now - EXPORT_STALE_AFTER,
+    ).update(
+        status="failed",
+        error_message="Export timed out.",
+        completed_at=now,
+    )
+
+    existing = (
+        ExportJob.objects.filter(signature=signature)
+        .filter(
+            Q(status__in=ExportJob.IN_FLIGHT_STATUSES)
+            | Q(
+                status="completed",
+                completed_at__gte=now - EXPORT_REUSE_WINDOW,
+            )
+        )
+        .order_by("-created_at")
+        .first()
+    )
+    if existing is not None:
+        return existing
+
+    try:
+        with transaction.atomic():
+            job = ExportJob.objects.create(
+                signature=signature, params=params, requested_by=user
+            )
+    except IntegrityError:
+        # Lost the race to an identical request
+        return ExportJob.objects.get(
+            signature=signature, status__in=ExportJob.IN_FLIGHT_STATUSES
+        )
+
+    from assets.tasks import run_export_job
+
+    transaction.on_commit(lambda: run_export_job.delay(job.pk))
+    return job
+
+
+def build_export_job(job_id: int) -> None:
+    """Write the export file for a pending job and mark it completed.
+
+    Claims the job atomically, so a duplicate task delivery is a no-op.
+    Failures are recorded on the job rather than retried.
+    """
+    claimed = ExportJob.objects.filter(pk=job_id, status="pending").update(
+        status="running"
+    )
+    if not claimed:
+        return
+    job = ExportJob.objects.get(pk=job_id)
+
+    def progress(processed, total):
+        ExportJob.objects.filter(pk=job_id).update(
+            processed=processed, total=total
+        )
+
+    try:
+        with SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as spool:
+            write_assets_xlsx(
+                spool, export_queryset(job.params), progress=progress
+            )
+            spool.seek(0)
+            job.file.save(f"{job.job_id}.xlsx", File(spool), save=False)
+    except Exception as exc:
+        logger.exception("Export job %s failed", job.job_id)
+        ExportJob.objects.filter(pk=job_id).update(
+            status="failed",
+            error_message=str(exc)[:1000],
+            completed_at=timezone.now(),
+        )
+        return
+
+    ExportJob.objects.filter(pk=job_id).update(
+        status="completed", file=job.file.name, completed_at=timezone.now()
+    )
+
+
+def export_download_url(job: ExportJob) -> str:
+    """Signed download link for a completed job, valid for an hour."""
+    token = signing.TimestampSigner(salt=_DOWNLOAD_SALT).sign(str(job.job_id))
+    url = reverse("assets:export_job_download", args=[job.job_id])
+    return f"{url}?token={token}"
+
+
+def verify_download_token(job: ExportJob, token: str) -> bool:
+    """Check a download token was issued for ``job`` and has not expired."""
+    try:
+        value = signing.TimestampSigner(salt=_DOWNLOAD_SALT).unsign(
+            token, max_age=DOWNLOAD_LINK_MAX_AGE
+        )
+    except signing.BadSignature:
+        return False
+    return value == str(job.job_id)
@@ -0,0 +1,168 @@
+"""Faceted filter counts for the asset list.
+
+For each filter dimension, counts how many assets in the current result
+would remain if that value were selected. Each dimension is counted
+against the result filtered by every *other* active filter (so picking
+a category still shows the alternatives), with one grouped aggregate
+query per dimension.
+
+Results are cached per filter signature and keyed on the catalogue
+version (see ``catalogue.py``), so any catalogue write invalidates
+them. Checkouts do not, so the "Checked Out" location count can lag
+by up to ``FACET_CACHE_TTL``.
+"""
+
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.db.models import Count
+
+from ..models import Asset, Category, Department, Location, Tag
+from .bulk import build_asset_filter_queryset
+from .catalogue import get_catalogue_version
+
+FACET_DIMENSIONS = (
+    "department",
+    "category",
+    "location",
+    "tag",
+    "condition",
+    "status",
+)
+
+FACET_CACHE_TTL = 300  # seconds
+
+# Dimension -> (value field, label field) on Asset
+_GROUP_FIELDS = {
+    "department": ("category__department_id", "category__department__name"),
+    "category": ("category_id", "category__name"),
+    "location": ("current_location_id", "current_location__name"),
+}
+
+_LABEL_MODELS = {
+    "department": Department,
+    "category": Category,
+    "location": Location,
+    "tag": Tag,
+}
+
+_CHOICE_LABELS = {
+    "condition": dict(Asset.CONDITION_CHOICES),
+    "status": dict(Asset.STATUS_CHOICES),
+}
+
+
+def _facet_cache_key(filters: dict) -> str:
+    signature = json.dumps(filters, sort_keys=True)
+    digest = hashlib.md5(signature.encode()).hexdigest()
+    return f"asset_facets:{get_catalogue_version()}:{digest}"
+
+
+def _matching_assets(filters: dict, dimension: str):
+    """Assets matching every filter except ``dimension``'s own."""
+    others = {k: v for k, v in filters.items() if k != dimension}
+    base = build_asset_filter_queryset(others)
+    # Subquery drops the DISTINCT (tag joins) before grouping
+    return Asset.objects.filter(pk__in=base.values("pk")).order_by()
+
+
+def _count_dimension(filters: dict, dimension: str) -> list[dict]:
+    assets = _matching_assets(filters, dimension)
+
+    if dimension == "tag":
+        rows = (
+            Asset.tags.through.objects.filter(asset__in=assets)
+            .values_list("tag_id", "tag__name")
+            .annotate(count=Count("asset_id"))
+            .order_by()
+        )
+    elif dimension in _GROUP_FIELDS:
+        value_field, label_field = _GROUP_FIELDS[dimension]
+        rows = (
+            assets.filter(**{f"{value_field}__isnull": False})
+            .values_list(value_field, label_field)
+            .annotate(count=Count("pk"))
+            .order_by()
+        )
+    else:
+        labels = _CHOICE_LABELS[dimension]
+        rows = [
+            (value, labels.get(value, value), count)
+            for value, count in assets.values_list(dimension)
+            .annotate(count=Count("pk"))
+            .order_by()
+        ]
+
+    facets = [
+        {"value": str(value), "label": label, "count": count}
+        for value, label, count in rows
+    ]
+
+    if dimension == "location":
+        checked_out = assets.filter(checked_out_to__isnull=False).count()
+        if checked_out:
+            facets.append(
+                {
+                    "value": "checked_out",
+                    "label": "Checked Out",
+                    "count": checked_out,
+                }
+            )
+
+    facets.sort(key=lambda f: str(f["label"]).lower())
+    return facets
+
+
+def _selected_label(dimension: str, value: str):
+    if dimension in _CHOICE_LABELS:
+        return _CHOICE_LABELS[dimension].get(value)
+    if value == "checked_out":
+        return "Checked Out"
+    model = _LABEL_MODELS[dimension]
+    return (
+        model.objects.filter(pk=value).values_list("name", flat=True).first()
+        if value.isdigit()
+        else None
+    )
+
+
+def _ensure_selected(
+    facets: list[dict], dimension: str, selected: str
+) -> None:
+    """Keep the active selection listed even when it matches nothing."""
+    if not selected or any(f["value"] == selected for f in facets):
+        return
+    label = _selected_label(dimension, selected)
+    if label is not None:
+        facets.insert(0, {"value": selected, "label": label, "count": 0})
+
+
+def compute_asset_facets(filters: dict) -> dict[str, list[dict]]:
+    """Return facet counts for the asset list's current filters.
+
+    Args:
+        filters: Filter parameters as accepted by
+            ``build_asset_filter_queryset`` (see
+            ``validate_filter_params``).
+
+    Returns:
+        Dict mapping each of ``FACET_DIMENSIONS`` to a list of
+        ``{"value", "label", "count"}`` dicts sorted by label. A
+        selected value with no matches is listed first with a count
+        of 0 so the dropdown can still show it.
+    """
+    cache_key = _facet_cache_key(filters)
+    facets = cache.get(cache_key)
+    if facets is None:
+        facets = {
+            dimension: _count_dimension(filters, dimension)
+            for dimension in FACET_DIMENSIONS
+        }
+        cache.set(cache_key, facets, FACET_CACHE_TTL)
+
+    for dimension in FACET_DIMENSIONS:
+        _ensure_selected(
+            facets[dimension], dimension, filters.get(dimension, "")
+        )
+    return facets
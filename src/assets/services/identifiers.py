@@ -0,0 +1,274 @@
+"""Scan identifier registry.
+
+Every scannable code — asset barcode, serial barcode, retired serial
+barcode (kept after disposal clears the live barcode) and active NFC
+tag UID — is recorded in ``AssetIdentifier`` under a normalised key,
+so a scan resolves with one indexed lookup instead of walking each
+source table in turn.
+
+The ``sync_*`` helpers are called from the source models' save paths
+and from services that change identifiers with ``queryset.update()``.
+``rebuild_identifier_registry`` regenerates the whole table from the
+source tables (used by the ``rebuild_identifiers`` command).
+"""
+
+from django.db import transaction as db_transaction
+
+from assets.models import (
+    Asset,
+    AssetIdentifier,
+    AssetSerial,
+    NFCTag,
+    Transaction,
+)
+
+BARCODE = "barcode"
+SERIAL = "serial"
+RETIRED_SERIAL = "retired_serial"
+NFC = "nfc"
+
+ALL_KINDS = (BARCODE, SERIAL, RETIRED_SERIAL, NFC)
+
+
+def normalise_identifier(code) -> str:
+    """Return the registry key for a scanned code."""
+    return (code or "").strip().upper()
+
+
+def _identifier(kind, value, asset_id, **extra) -> AssetIdentifier:
+    return AssetIdentifier(
+        key=normalise_identifier(value),
+        value=value,
+        kind=kind,
+        priority=AssetIdentifier.KIND_PRIORITY[kind],
+        asset_id=asset_id,
+        **extra,
+    )
+
+
+def sync_asset_barcode(asset) -> None:
+    """Register the asset's current barcode, dropping stale entries."""
+    stale = AssetIdentifier.objects.filter(asset=asset, kind=BARCODE)
+    if asset.barcode:
+        stale = stale.exclude(value=asset.barcode)
+    stale.delete()
+    if asset.barcode and not (
+        AssetIdentifier.objects.filter(
+            asset=asset, kind=BARCODE, value=asset.barcode
+        ).exists()
+    ):
+        _identifier(BARCODE, asset.barcode, asset.pk).save()
+
+
+def sync_serial_identifiers(serial, retired_barcode=None) -> None:
+    """Register a serial's live barcode and any retired barcode.
+
+    ``retired_barcode`` is the barcode captured before disposal
+    cleared it. Retired entries only resolve while the serial is
+    disposed, matching the transaction-history lookup they replace.
+    """
+    is_disposed = serial.status == "disposed"
+    live_barcode = None if retired_barcode else serial.barcode
+    with db_transaction.atomic():
+        AssetIdentifier.objects.filter(serial=serial, kind=SERIAL).delete()
+        if live_barcode:
+            _identifier(
+                SERIAL,
+                live_barcode,
+                serial.asset_id,
+                serial=serial,
+                is_disposed=is_disposed,
+            ).save()
+
+        retired = AssetIdentifier.objects.filter(
+            serial=serial, kind=RETIRED_SERIAL
+        )
+        if not is_disposed:
+            retired.delete()
+            return
+        retired.exclude(asset_id=serial.asset_id).update(
+            asset_id=serial.asset_id
+        )
+        if (
+            retired_barcode
+            and not retired.filter(value=retired_barcode).exists()
+        ):
+            _identifier(
+                RETIRED_SERIAL,
+                retired_barcode,
+                serial.asset_id,
+                serial=serial,
+                is_disposed=True,
+            ).save()
+
+
+def sync_nfc_tag(tag) -> None:
+    """Register an NFC tag while active; drop it once removed."""
+    AssetIdentifier.objects.filter(nfc_tag=tag).delete()
+    if tag.removed_at is None and tag.tag_id:
+        _identifier(
+            NFC,
+            tag.tag_id,
+            tag.asset_id,
+            nfc_tag=tag,
+            serial_id=tag.serial_id,
+        ).save()
+
+
+def _build_identifiers(assets, serials, retired, tags):
+    rows = [_identifier(BARCODE, a.barcode, a.pk) for a in assets]
+    rows += [
+        _identifier(
+            SERIAL,
+            s.barcode,
+            s.asset_id,
+            serial_id=s.pk,
+            is_disposed=s.status == "disposed",
+        )
+        for s in serials
+    ]
+    rows += [
+        _identifier(
+            RETIRED_SERIAL,
+            barcode,
+            asset_id,
+            serial_id=serial_id,
+            is_disposed=True,
+        )
+        for serial_id, asset_id, barcode in retired
+    ]
+    rows += [
+        _identifier(
+            NFC,
+            t.tag_id,
+            t.asset_id,
+            nfc_tag_id=t.pk,
+            serial_id=t.serial_id,
+        )
+        for t in tags
+    ]
+    return rows
+
+
+def _source_rows(asset_ids=None):
+    """Return the source querysets the registry is derived from."""
+    assets = Asset.objects.exclude(barcode="").only("pk", "barcode")
+    serials = (
+        AssetSerial.objects.filter(barcode__isnull=False)
+        .exclude(barcode="")
+        .only("pk", "asset_id", "barcode", "status")
+    )
+    retired = (
+        Transaction.objects.filter(
+            serial__status="disposed",
+            serial_barcode__isnull=False,
+        )
+        .exclude(serial_barcode="")
+        .values_list("serial_id", "serial__asset_id", "serial_barcode")
+        .order_by()
+        .distinct()
+    )
+    tags = NFCTag.objects.filter(removed_at__isnull=True).only(
+        "pk", "asset_id", "serial_id", "tag_id"
+    )
+    if asset_ids is not None:
+        assets = assets.filter(pk__in=asset_ids)
+        serials = serials.filter(asset_id__in=asset_ids)
+        retired = retired.filter(serial__asset_id__in=asset_ids)
+        tags = tags.filter(asset_id__in=asset_ids)
+    return assets, serials, retired, tags
+
+
+def sync_asset_identifiers(asset_ids) -> None:
+    """Rebuild every registry entry owned by the given assets.
+
+    Used after bulk ``queryset.update()`` paths (merge, barcode
+    clearing) that bypass the per-model save hooks.
+    """
+    asset_ids = [asset_ids] if isinstance(asset_ids, int) else asset_ids
+    asset_ids = list(asset_ids)
+    with db_transaction.atomic():
+        AssetIdentifier.objects.filter(asset_id__in=asset_ids).delete()
+        AssetIdentifier.objects.filter(
+            nfc_tag__asset_id__in=asset_ids
+        ).delete()
+        AssetIdentifier.objects.filter(serial__asset_id__in=asset_ids).delete()
+        AssetIdentifier.objects.bulk_create(
+            _build_identifiers(*_source_rows(asset_ids))
+        )
+
+
+def rebuild_identifier_registry(batch_size=1000) -> int:
+    """Regenerate the whole registry from source tables.
+
+    Returns the number of identifiers registered.
+    """
+    rows = _build_identifiers(*_source_rows())
+    with db_transaction.atomic():
+        AssetIdentifier.objects.all().delete()
+        AssetIdentifier.objects.bulk_create(rows, batch_size=batch_size)
+    return len(rows)
+
+
+def _match_rank(identifier, code):
+    asset = identifier.asset
+    return (
+        identifier.priority,
+        identifier.value != code,
+        asset.status != "active",
+        -identifier.pk,
+    )
+
+
+def _registry_matches(keys, kinds):
+    return (
+        AssetIdentifier.objects.filter(key__in=keys, kind__in=kinds)
+        .select_related(
+            "asset",
+            "asset__current_location",
+            "serial",
+            "serial__current_location",
+        )
+        .order_by("priority", "-pk")
+    )
+
+
+def lookup_identifier(code, kinds=ALL_KINDS):
+    """Resolve a scanned code to its registry entry, or None.
+
+    Matching is case-insensitive. When several entries share the
+    key, the highest-priority kind wins, then an exact-case match,
+    then an active asset.
+    """
+    key = normalise_identifier(code)
+    if not key:
+        return None
+    matches = list(_registry_matches([key], kinds))
+    if not matches:
+        return None
+    return min(matches, key=lambda i: _match_rank(i, code.strip()))
+
+
+def lookup_identifiers(codes, kinds=ALL_KINDS) -> dict:
+    """Resolve many scanned codes with a single registry query.
+
+    Returns a dict mapping each distinct stripped code to its
+    registry entry (or None), using the same tie-breaks as
+    ``lookup_identifier``.
+    """
+    codes = {(c or "").strip() for c in codes}
+    codes.discard("")
+    by_key = {}
+    for identifier in _registry_matches(
+        {normalise_identifier(c) for c in codes}, kinds
+    ):
+        by_key.setdefault(identifier.key, []).append(identifier)
+    results = {}
+    for code in codes:
+        matches = by_key.get(normalise_identifier(code))
+        results[code] = (
+            min(matches, key=lambda i: _match_rank(i, code))
+            if matches
+            else None
+        )
+    return results
@@ -0,0 +1,291 @@
+"""Asset image rendition pipeline.
+
+Uploads are stored as received; ``process_asset_image`` (run by the
+``process_asset_image`` Celery task queued from ``AssetImage.save``)
+then reads the file once, decodes it once and derives every rendition
+from that decode:
+
+- ``image``: the stored original as JPEG (§S2.2.5-05a), capped at
+  ``ORIGINAL_MAX_DIMENSION``. A JPEG that needs no rotation, cap or
+  conversion is kept byte for byte.
+- ``detail_thumbnail``: ``DETAIL_MAX_DIMENSION`` for the lightbox,
+  only for originals larger than that.
+- ``thumbnail``: ``GRID_THUMBNAIL_SIZE`` for grids and lists.
+- ``ai_rendition``: the JPEG sent to AI analysis (see
+  ``ai.encode_image_for_ai``).
+- ``AssetImageRendition`` rows: WebP (and, with
+  ``IMAGE_AVIF_RENDITIONS``, AVIF) variants at ``GRID_WIDTHS`` and
+  ``DETAIL_WIDTHS`` for ``srcset``, rendered by the ``asset_picture``
+  template tag.
+
+JPEG decodes use Pillow's ``draft()`` to let the decoder downscale by
+a power of two to the largest size any rendition needs, so large
+photos are never decoded at full resolution. Renditions are written to
+storage concurrently, and AI analysis is queued once they exist.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+logger = logging.getLogger(__name__)
+
+ORIGINAL_MAX_DIMENSION = 3264
+DETAIL_MAX_DIMENSION = 2000
+GRID_THUMBNAIL_SIZE = 300
+
+ORIGINAL_QUALITY = 85
+DETAIL_QUALITY = 85
+GRID_QUALITY = 80
+
+GRID_WIDTHS = (600, 300, 150)
+DETAIL_WIDTHS = (2000, 1200, 800)
+VARIANT_OPTIONS = {
+    "webp": {"format": "WEBP", "quality": 75, "method": 4},
+    "avif": {"format": "AVIF", "quality": 55, "speed": 6},
+}
+
+RENDITION_FIELDS = ("image", "detail_thumbnail", "thumbnail", "ai_rendition")
+
+
+def _fit(size, max_dimension):
+    """``size`` scaled so its longest edge is at most ``max_dimension``."""
+    longest = max(size)
+    if longest <= max_dimension:
+        return size
+    scale = max_dimension / longest
+    return (
+        max(1, round(size[0] * scale)),
+        max(1, round(size[1] * scale)),
+    )
+
+
+def _encode_jpeg(img, quality, **kwargs) -> bytes:
+    buf = BytesIO()
+    img.save(buf, format="JPEG", quality=quality, **kwargs)
+    return buf.getvalue()
+
+
+def _keeps_original(img) -> bool:
+    """Whether the upload can be stored unchanged."""
+    return (
+        img.format in ("JPEG", "MPO")
+        and max(img.size) <= ORIGINAL_MAX_DIMENSION
+        and img.getexif().get(0x0112, 1) == 1  # EXIF orientation
+        and img.mode == "RGB"
+    )
+
+
+def variant_formats() -> list:
+    """The variant formats to build, as ``AssetImageRendition`` formats."""
+    from PIL import features
+
+    formats = ["webp"]
+    if getattr(settings, "IMAGE_AVIF_RENDITIONS", False) and (
+        features.check("avif")
+    ):
+        formats.append("avif")
+    return formats
+
+
+def _variants(img, kind, widths, formats, out):
+    """Encode ``img`` at each width (largest first) into ``out``.
+
+    Each width is resized from the previous one. Widths the image
+    cannot fill collapse into one variant at its own size.
+
+    Returns:
+        The smallest resized image, to continue the chain from.
+    """
+    from PIL import Image
+
+    base_size = img.size
+    done = set()
+    for width in widths:
+        size = _fit(base_size, width)
+        if size in done:
+            continue
+        done.add(size)
+        if size != img.size:
+            img = img.resize(size, Image.LANCZOS)
+        for fmt in formats:
+            buf = BytesIO()
+            img.save(buf, **VARIANT_OPTIONS[fmt])
+            out.append((kind, fmt, size[0], size[1], buf.getvalue()))
+    return img
+
+
+def build_renditions(data: bytes, wanted, formats=()) -> tuple:
+    """Decode an upload once and encode the wanted renditions.
+
+    Args:
+        data: The uploaded file's bytes.
+        wanted: Names from ``RENDITION_FIELDS`` to produce.
+        formats: Variant formats (see ``variant_formats``) to produce.
+
+    Returns:
+        ``(fields, variants)``: a dict mapping each produced field name
+        to JPEG bytes, and a list of ``(kind, format, width, height,
+        bytes)`` variants. ``image`` is omitted when the upload can be
+        kept as is, and ``detail_thumbnail`` when the original is no
+        larger than ``DETAIL_MAX_DIMENSION``.
+    """
+    from pi_heif import register_heif_opener
+    from PIL import Image, ImageOps
+
+    from .ai import encode_image_for_ai
+
+    register_heif_opener()
+
+    img = Image.open(BytesIO(data))
+    original_size = img.size
+    if "image" in wanted and _keeps_original(img):
+        wanted = [name for name in wanted if name != "image"]
+
+    # Decode no larger than the biggest rendition still needed
+    if "image" in wanted:
+        largest = ORIGINAL_MAX_DIMENSION
+    elif "detail_thumbnail" in wanted or formats:
+        largest = DETAIL_MAX_DIMENSION
+    elif "ai_rendition" in wanted:
+        largest = getattr(settings, "AI_MAX_IMAGE_DIMENSION", 1568)
+    else:
+        largest = GRID_THUMBNAIL_SIZE
+    img.draft("RGB", _fit(original_size, largest))
+
+    img = ImageOps.exif_transpose(img)
+    exif_data = img.info.get("exif")
+    img = img.convert("RGB")
+
+    fields, variants = {}, []
+    if "image" in wanted:
+        img = img.resize(_fit(img.size, ORIGINAL_MAX_DIMENSION), Image.LANCZOS)
+        extra = {"exif": exif_data} if exif_data else {}
+        fields["image"] = _encode_jpeg(img, ORIGINAL_QUALITY, **extra)
+    img = img.resize(_fit(img.size, DETAIL_MAX_DIMENSION), Image.LANCZOS)
+    if (
+        "detail_thumbnail" in wanted
+        and max(original_size) > DETAIL_MAX_DIMENSION
+    ):
+        fields["detail_thumbnail"] = _encode_jpeg(img, DETAIL_QUALITY)
+    if "ai_rendition" in wanted:
+        fields["ai_rendition"] = encode_image_for_ai(img)
+    if "thumbnail" in wanted:
+        grid = img.copy()
+        grid.thumbnail(
+            (GRID_THUMBNAIL_SIZE, GRID_THUMBNAIL_SIZE), Image.LANCZOS
+        )
+        fields["thumbnail"] = _encode_jpeg(grid, GRID_QUALITY)
+    if formats:
+        img = _variants(img, "detail", DETAIL_WIDTHS, formats, variants)
+        _variants(img, "grid", GRID_WIDTHS, formats, variants)
+    return fields, variants
+
+
+def _rendition_name(field_name, base_name) -> str:
+    prefix = {
+        "image": "",
+        "detail_thumbnail": "detail_",
+        "thumbnail": "thumb_",
+        "ai_rendition": "ai_",
+    }[field_name]
+    return f"{prefix}{base_name}.jpg"
+
+
+def _write_renditions(asset_image, wanted, formats) -> dict:
+    """Build and store renditions; returns the field names saved."""
+    from ..models import AssetImage, AssetImageRendition
+
+    try:
+        with asset_image.image.open("rb") as f:
+            data = f.read()
+        fields, variants = build_renditions(data, wanted, formats)
+    except Exception:
+        logger.exception("Could not process image %s", asset_image.pk)
+        return {}
+
+    original_name = asset_image.image.name
+    base_name = original_name.split("/")[-1].rsplit(".", 1)[0]
+    rows = [
+        AssetImageRendition(
+            image=asset_image,
+            kind=kind,
+            format=fmt,
+            width=width,
+            height=height,
+        )
+        for kind, fmt, width, height, _ in variants
+    ]
+
+    def write_field(item):
+        field_name, content = item
+        field = getattr(asset_image, field_name)
+        name = field.field.generate_filename(
+            asset_image, _rendition_name(field_name, base_name)
+        )
+        return field_name, field.storage.save(name, ContentFile(content))
+
+    def write_variant(item):
+        row, (_, _, _, _, content) = item
+        name = f"{base_name}_{row.kind}_{row.width}.{row.format}"
+        row.file.save(name, ContentFile(content), save=False)
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(8, len(fields) + len(variants)))
+    ) as pool:
+        variant_writes = [
+            pool.submit(write_variant, item) for item in zip(rows, variants)
+        ]
+        saved = dict(pool.map(write_field, fields.items()))
+        for write in variant_writes:
+            write.result()
+    AssetImageRendition.objects.bulk_create(rows, ignore_conflicts=True)
+    if saved:
+        AssetImage.objects.filter(pk=asset_image.pk).update(**saved)
+    for field_name, name in saved.items():
+        setattr(asset_image, field_name, name)
+    if "image" in saved:
+        asset_image.image.storage.delete(original_name)
+    return saved
+
+
+def process_asset_image(image_id: int) -> list:
+    """Produce an uploaded image's missing renditions.
+
+    Renditions whose field is already set, and variant formats that
+    already have rows, are skipped, so a retried or repeated run (or
+    ``build_image_renditions`` after enabling AVIF) only fills gaps.
+    AI analysis is queued afterwards when the image is ``pending``.
+
+    Returns:
+        The names of the fields written.
+    """
+    from ..models import AssetImage
+
+    try:
+        asset_image = AssetImage.objects.get(pk=image_id)
+    except AssetImage.DoesNotExist:
+        return []
+    if not asset_image.image:
+        return []
+
+    saved = {}
+    wanted = [
+        name
+        for name in RENDITION_FIELDS
+        if name == "image" or not getattr(asset_image, name)
+    ]
+    built = set(asset_image.renditions.values_list("format", flat=True))
+    formats = [fmt for fmt in variant_formats() if fmt not in built]
+    # The original is only reworked alongside its first renditions
+    if wanted != ["image"] or formats:
+        saved = _write_renditions(asset_image, wanted, formats)
+
+    if asset_image.ai_processing_status == "pending":
+        from assets.tasks import analyse_image
+
+        analyse_image.delay(asset_image.pk)
+    return list(saved)
@@ -0,0 +1,196 @@
+"""Location hierarchy helpers."""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+
+from ..models import Asset, Category, Location
+from .catalogue import get_catalogue_version, get_ledger_version
+
+LOCATION_PATHS_CACHE_TTL = 300  # seconds
+LOCATION_TREE_CACHE_TTL = 300  # seconds
+
+# Guards the recursive walk against a parent cycle in bad data
+_MAX_TREE_DEPTH = 16
+
+
+def location_paths() -> dict[int, str]:
+    """Map every location pk to its ``full_path`` string.
+
+    Read from the maintained ``full_path`` column in one query and
+    cached against the catalogue version so renames and moves are
+    picked up.
+    """
+    key = f"location_paths:{get_catalogue_version()}"
+    paths = cache.get(key)
+    if paths is None:
+        paths = dict(Location.objects.values_list("pk", "full_path"))
+        cache.set(key, paths, LOCATION_PATHS_CACHE_TTL)
+    return paths
+
+
+@dataclass
+class LocationNode:
+    """A location in the cached tree, with counts over its subtree."""
+
+    pk: int
+    name: str
+    address: str
+    description: str
+    is_active: bool
+    created_at: datetime
+    asset_count_total: int = 0
+    asset_count_active: int = 0
+    asset_count_checked_out: int = 0
+    asset_count_draft: int = 0
+    estimated_value: Decimal = Decimal("0")
+    children: list["LocationNode"] = field(default_factory=list)
+
+    def matches(self, q: str) -> bool:
+        """Case-insensitive match on name, address or description."""
+        q = q.lower()
+        return any(
+            q in text.lower()
+            for text in (self.name, self.address, self.description)
+        )
+
+
+_ROLLUP_KEYS = (
+    "asset_count_total",
+    "asset_count_active",
+    "asset_count_checked_out",
+    "asset_count_draft",
+    "estimated_value",
+)
+
+
+def subtree_rollups(department_id: int | None = None) -> dict[int, dict]:
+    """Asset counts for every location over its whole subtree.
+
+    One recursive CTE pairs each location with itself and all of its
+    descendants, then groups the assets at those locations by the
+    subtree root.
+
+    Args:
+        department_id: Only count assets in this department.
+
+    Returns:
+        Dict mapping location pk to ``asset_count_total``,
+        ``asset_count_active``, ``asset_count_checked_out``,
+        ``asset_count_draft`` and ``estimated_value`` (sum over active
+        assets). Locations with no assets in their subtree are absent.
+    """
+    location_table = Location._meta.db_table
+    asset_table = Asset._meta.db_table
+    params = [_MAX_TREE_DEPTH, "active", "draft", "active"]
+    department_join = ""
+    if department_id is not None:
+        department_join = (
+            f"JOIN {Category._meta.db_table} category "
+            "ON category.id = asset.category_id "
+            "AND category.department_id = %s"
+        )
+        params.append(department_id)
+    sql = f"""
+        WITH RECURSIVE subtree (root_id, location_id, depth) AS (
+            SELECT id, id, 0 FROM {location_table}
+            UNION ALL
+            SELECT subtree.root_id, child.id, subtree.depth + 1
+            FROM subtree
+            JOIN {location_table} child
+                ON child.parent_id = subtree.location_id
+            WHERE subtree.depth < %s
+        )
+        SELECT
+            subtree.root_id,
+            COUNT(asset.id),
+            SUM(CASE WHEN asset.status = %s THEN 1 ELSE 0 END),
+            SUM(
+                CASE WHEN asset.checked_out_to_id IS NOT NULL
+                THEN 1 ELSE 0 END
+            ),
+            SUM(CASE WHEN asset.status = %s THEN 1 ELSE 0 END),
+            SUM(
+                CASE WHEN asset.status = %s
+                THEN COALESCE(asset.estimated_value, 0) ELSE 0 END
+            )
+        FROM subtree
+        JOIN {asset_table} asset
+            ON asset.current_location_id = subtree.location_id
+        {department_join}
+        GROUP BY subtree.root_id
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    rollups = {}
+    for root_id, *counts in rows:
+        *counts, value = counts
+        rollups[root_id] = dict(
+            zip(
+                _ROLLUP_KEYS,
+                [*map(int, counts), Decimal(str(value or 0))],
+            )
+        )
+    return rollups
+
+
+def location_tree(
+    sort: str = "name", department_id: int | None = None
+) -> list[LocationNode]:
+    """Return the active location tree with subtree rollup counts.
+
+    Built from one query for the locations plus ``subtree_rollups``,
+    and cached against the ledger version, so location edits, asset
+    moves and checkouts (which record a transaction without bumping
+    the catalogue version) invalidate it.
+
+    Args:
+        sort: Location field to order siblings by (e.g. ``"-name"``).
+        department_id: Count only assets in this department and drop
+            top-level locations with none in their subtree.
+
+    Returns:
+        Top-level ``LocationNode`` objects with nested ``children``.
+    """
+    version = "-".join(map(str, get_ledger_version()))
+    key = f"location_tree:{version}:{sort}:{department_id or ''}"
+    roots = cache.get(key)
+    if roots is None:
+        roots = _build_location_tree(sort, department_id)
+        cache.set(key, roots, LOCATION_TREE_CACHE_TTL)
+    return roots
+
+
+def _build_location_tree(sort, department_id):
+    rollups = subtree_rollups(department_id)
+    rows = (
+        Location.objects.filter(is_active=True)
+        .order_by(sort, "pk")
+        .values_list(
+            "pk",
+            "parent_id",
+            "name",
+            "address",
+            "description",
+            "is_active",
+            "created_at",
+        )
+    )
+    nodes, parents = {}, {}
+    for pk, parent_id, *fields in rows:
+        nodes[pk] = LocationNode(pk, *fields, **rollups.get(pk, {}))
+        parents[pk] = parent_id
+    roots = []
+    for pk, node in nodes.items():
+        parent_id = parents[pk]
+        if parent_id is None:
+            roots.append(node)
+        elif parent_id in nodes:
+            nodes[parent_id].children.append(node)
+    if department_id is not None:
+        roots = [node for node in roots if node.asset_count_total]
+    return roots
@@ -3,6 +3,11 @@
 from django.db import transaction as db_transaction
 
 from ..models import Asset, AssetImage, AssetSerial, NFCTag, Transaction
+from .availability import (
+    rebuild_ledger_checkpoints,
+    refresh_availability_counters,
+)
+from .identifiers import sync_asset_identifiers
 from .permissions import get_user_role
 
 
@@ -223,4 +228,11 @@ def merge_assets(primary: Asset, duplicates: list[Asset], user) -> Asset:
                 )
 
         primary.save()
+        merged_ids = [primary.pk, *[d.pk for d in duplicates]]
+        # Barcodes, NFC tags and transactions above moved via
+        # queryset.update(), which bypasses the save hooks
+        sync_asset_identifiers(merged_ids)
+        rebuild_ledger_checkpoints(merged_ids)
+        refresh_availability_counters(merged_ids)
+        primary.refresh_from_db(fields=Asset.COUNTER_FIELDS)
     return primary
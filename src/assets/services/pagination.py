@@ -0,0 +1,300 @@
+"""List pagination helpers.
+
+Two modes are available to list views through ``paginate``:
+
+- Page-number (offset) pagination via Django's ``Paginator``. With
+  ``estimate=True`` the total comes from the PostgreSQL planner's row
+  estimate instead of ``COUNT(*)`` for large, unfiltered tables. With
+  ``pks`` (a cached result, see ``result_cache.py``) it pages over the
+  pk list and loads just the page's rows.
+- Keyset (cursor) pagination. Rows are fetched with a ``WHERE`` on the
+  sort key of the last row seen rather than ``OFFSET``, so deep pages
+  cost the same as the first. Cursors are opaque strings passed back
+  as ``?cursor=``; the ``keyset_more`` partial uses them for HTMX
+  infinite scroll.
+"""
+
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.db.models import F, Q
+from django.utils.functional import cached_property
+
+# Below this many rows an exact COUNT(*) is cheap and always correct
+ESTIMATE_THRESHOLD = 10000
+
+
+def estimated_count(queryset) -> int:
+    """Return the row count of an unfiltered queryset's table.
+
+    Uses ``pg_class.reltuples`` on PostgreSQL when the table is large
+    enough for COUNT(*) to matter; otherwise (small tables, never
+    analysed tables, other backends) returns the exact count.
+    """
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class "
+                "WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if row and row[0] >= ESTIMATE_THRESHOLD:
+            return int(row[0])
+    return queryset.count()
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator whose total comes from ``estimated_count``.
+
+    Only use for unfiltered querysets: the estimate is for the whole
+    table.
+    """
+
+    @cached_property
+    def count(self):
+        return estimated_count(self.object_list)
+
+
+class PkListPaginator(Paginator):
+    """Paginator over an ordered list of pks (e.g. a cached result).
+
+    Counting and slicing happen on the list; only the current page's
+    rows are loaded from ``queryset``, in list order. Rows deleted
+    since the list was built are skipped.
+    """
+
+    def __init__(self, pks, per_page, queryset):
+        super().__init__(pks, per_page)
+        self.queryset = queryset
+
+    def _get_page(self, object_list, number, paginator):
+        rows = self.queryset.in_bulk(object_list)
+        object_list = [rows[pk] for pk in object_list if pk in rows]
+        return super()._get_page(object_list, number, paginator)
+
+
+class _CursorEncoder(DjangoJSONEncoder):
+    """JSON encoder keeping full microsecond precision for datetimes.
+
+    ``DjangoJSONEncoder`` truncates to milliseconds, which would make
+    cursor comparisons skip or repeat rows sharing a millisecond.
+    """
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def _resolve(obj, field):
+    """Follow a ``related__field`` path on a model instance."""
+    for part in field.split("__"):
+        if obj is None:
+            return None
+        obj = getattr(obj, part)
+    return obj
+
+
+def _after_q(keys, values):
+    """Build the filter selecting rows that sort after ``values``.
+
+    ``keys`` is a list of ``(field, descending)`` pairs. NULLs sort
+    last in both directions (see ``KeysetPaginator.ordering``).
+    """
+    (field, descending), value = keys[0], values[0]
+    rest = _after_q(keys[1:], values[1:]) if len(keys) > 1 else None
+    is_null = Q(**{f"{field}__isnull": True})
+    if value is None:
+        if rest is None:
+            return Q(pk__in=[])
+        return is_null & rest
+    lookup = "lt" if descending else "gt"
+    beyond = Q(**{f"{field}__{lookup}": value}) | is_null
+    if rest is None:
+        return beyond
+    return beyond | (Q(**{field: value}) & rest)
+
+
+class KeysetPage:
+    """One page of keyset-paginated results.
+
+    Mirrors the parts of Django's ``Page`` that templates use;
+    ``is_keyset`` lets templates switch to the infinite-scroll footer.
+    Page numbers do not exist in this mode, so ``has_other_pages`` is
+    False and numbered navigation is not rendered.
+    """
+
+    is_keyset = True
+    has_other_pages = False
+
+    def __init__(self, object_list, paginator, cursor, next_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.cursor = cursor
+        self.next_cursor = next_cursor
+        self.next_query = ""
+
+    def __repr__(self):
+        return f"<KeysetPage cursor={self.cursor!r}>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return bool(self.cursor)
+
+
+class KeysetPaginator:
+    """Cursor paginator ordered by ``ordering`` with a pk tie-break.
+
+    Args:
+        queryset: Queryset to paginate.
+        per_page: Rows per page.
+        ordering: Sort fields (``"-timestamp"``, ``"category__name"``).
+            Defaults to the queryset's own ordering.
+        estimate: Report ``count`` from the planner estimate
+            (unfiltered querysets only).
+    """
+
+    def __init__(self, queryset, per_page, ordering=None, estimate=False):
+        ordering = list(
+            ordering
+            or queryset.query.order_by
+            or queryset.model._meta.ordering
+        )
+        self.keys = [(f.lstrip("-"), f.startswith("-")) for f in ordering]
+        if not any(field in ("pk", "id") for field, _ in self.keys):
+            descending = self.keys[0][1] if self.keys else False
+            self.keys.append(("pk", descending))
+        self.queryset = queryset
+        self.per_page = per_page
+        self.estimate = estimate
+
+    @property
+    def ordering(self):
+        """Order expressions with NULLs last in both directions."""
+        return [
+            (
+                F(field).desc(nulls_last=True)
+                if descending
+                else F(field).asc(nulls_last=True)
+            )
+            for field, descending in self.keys
+        ]
+
+    @cached_property
+    def count(self):
+        if self.estimate:
+            return estimated_count(self.queryset)
+        return self.queryset.count()
+
+    @property
+    def _signature(self):
+        return [("-" if d else "") + f for f, d in self.keys]
+
+    def encode_cursor(self, obj) -> str:
+        values = [_resolve(obj, field) for field, _ in self.keys]
+        payload = json.dumps(
+            {"o": self._signature, "v": values}, cls=_CursorEncoder
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        """Return the sort values in ``cursor``, or None if unusable.
+
+        Cursors from a different ordering (e.g. after the user changed
+        the sort) or that fail to decode restart from the first page.
+        """
+        if not cursor:
+            return None
+        try:
+            data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (binascii.Error, ValueError, UnicodeDecodeError):
+            return None
+        if not isinstance(data, dict) or data.get("o") != self._signature:
+            return None
+        values = data.get("v")
+        if not isinstance(values, list) or len(values) != len(self.keys):
+            return None
+        return values
+
+    def get_page(self, cursor=None) -> KeysetPage:
+        queryset = self.queryset.order_by(*self.ordering)
+        values = self.decode_cursor(cursor)
+        if values is not None:
+            try:
+                queryset = queryset.filter(_after_q(self.keys, values))
+            except (TypeError, ValueError, ValidationError):
+                # Tampered values the sort fields cannot hold
+                values = None
+        if values is None:
+            cursor = None
+        rows = list(queryset[: self.per_page + 1])
+        next_cursor = None
+        if len(rows) > self.per_page:
+            rows = rows[: self.per_page]
+            next_cursor = self.encode_cursor(rows[-1])
+        return KeysetPage(rows, self, cursor, next_cursor)
+
+
+def paginate(
+    request,
+    queryset,
+    per_page,
+    ordering=None,
+    estimate=False,
+    keyset=False,
+    pks=None,
+):
+    """Paginate a list view's queryset from the request's query string.
+
+    Keyset mode is used when ``?cursor=`` is present, or by default
+    when ``keyset`` is True and no ``?page=`` is given (so existing
+    page-number links keep working). Otherwise falls back to
+    page-number pagination.
+
+    When ``pks`` (the full, ordered result as a pk list) is given,
+    page-number pagination runs over the list and only the page's
+    rows are loaded from ``queryset``. Keyset pagination ignores
+    ``pks``, so ``queryset`` must then be the filtered result.
+
+    Returns a ``Page`` or ``KeysetPage``; the latter carries
+    ``next_query``, the current query string with the next cursor.
+    """
+    use_keyset = "cursor" in request.GET or (
+        keyset and "page" not in request.GET
+    )
+    if pks is not None and "cursor" not in request.GET:
+        paginator = PkListPaginator(pks, per_page, queryset)
+        return paginator.get_page(request.GET.get("page", 1))
+    if not use_keyset:
+        paginator_class = EstimatedCountPaginator if estimate else Paginator
+        paginator = paginator_class(queryset, per_page)
+        return paginator.get_page(request.GET.get("page", 1))
+
+    paginator = KeysetPaginator(queryset, per_page, ordering, estimate)
+    page = paginator.get_page(request.GET.get("cursor"))
+    if page.has_next:
+        params = request.GET.copy()
+        params.pop("page", None)
+        params["cursor"] = page.next_cursor
+        page.next_query = params.urlencode()
+    return page
@@ -5,7 +5,8 @@ Used by hold list add-item and potentially other views that accept
 flexible asset identifiers.
 """
 
-from assets.models import Asset, AssetSerial, NFCTag
+from assets.models import Asset
+from assets.services.identifiers import lookup_identifier
 from assets.services.search import build_asset_search
 
 
@@ -33,42 +34,19 @@ def resolve_asset_from_input(asset_id=None, search=None, barcode=None):
                 f"No asset found with ID '{_truncate(asset_id)}'.",
             )
 
-    # 2. Barcode field
+    # 2. Barcode field — asset barcode, then serial barcode
+    # (case-insensitive for scanner variance)
     if barcode:
         barcode = barcode.strip()
         if not barcode:
             return None, "Please enter a barcode."
-        try:
-            return Asset.objects.get(barcode__iexact=barcode), None
-        except Asset.DoesNotExist:
-            pass
-        except Asset.MultipleObjectsReturned:
-            # Prefer active asset when case-variant barcodes exist
-            hit = (
-                Asset.objects.filter(
-                    barcode__iexact=barcode, status="active"
-                ).first()
-                or Asset.objects.filter(barcode__iexact=barcode).first()
-            )
-            return hit, None
-        # Try serial barcode
-        try:
-            serial = AssetSerial.objects.select_related("asset").get(
-                barcode__iexact=barcode
-            )
-            return serial.asset, None
-        except AssetSerial.DoesNotExist:
-            return (
-                None,
-                f"No asset found with barcode " f"'{_truncate(barcode)}'.",
-            )
-        except AssetSerial.MultipleObjectsReturned:
-            serial = (
-                AssetSerial.objects.select_related("asset")
-                .filter(barcode__iexact=barcode)
-                .first()
-            )
-            return serial.asset, None
+        match = lookup_identifier(barcode, kinds=("barcode", "serial"))
+        if match:
+            return match.asset, None
+        return (
+            None,
+            f"No asset found with barcode " f"'{_truncate(barcode)}'.",
+        )
 
     # 3. Search field — try barcode, NFC, then name
     if search:
@@ -76,42 +54,10 @@ def resolve_asset_from_input(asset_id=None, search=None, barcode=None):
         if not search:
             return None, "Please enter a search term."
 
-        # 3a. Exact barcode match (case-insensitive for scanner
-        # variance)
-        try:
-            return Asset.objects.get(barcode__iexact=search), None
-        except Asset.DoesNotExist:
-            pass
-        except Asset.MultipleObjectsReturned:
-            # Prefer active asset when case-variant barcodes exist
-            hit = (
-                Asset.objects.filter(
-                    barcode__iexact=search, status="active"
-                ).first()
-                or Asset.objects.filter(barcode__iexact=search).first()
-            )
-            return hit, None
-
-        # 3b. Serial barcode match
-        try:
-            serial = AssetSerial.objects.select_related("asset").get(
-                barcode__iexact=search
-            )
-            return serial.asset, None
-        except AssetSerial.DoesNotExist:
-            pass
-        except AssetSerial.MultipleObjectsReturned:
-            serial = (
-                AssetSerial.objects.select_related("asset")
-                .filter(barcode__iexact=search)
-                .first()
-            )
-            return serial.asset, None
-
-        # 3c. NFC tag match
-        nfc_asset = NFCTag.get_asset_by_tag(search)
-        if nfc_asset:
-            return nfc_asset, None
+        # 3a-c. Asset barcode, serial barcode or active NFC tag
+        match = lookup_identifier(search, kinds=("barcode", "serial", "nfc"))
+        if match:
+            return match.asset, None
 
         # 3d. Exact name match (active assets only)
         name_hits = list(
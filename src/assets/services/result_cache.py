@@ -0,0 +1,72 @@
+"""Cached asset result sets.
+
+Stores the ordered list of asset pks matching a filter signature (the
+dict from ``validate_filter_params`` plus an ordering), so repeated
+list, export and select-all requests skip the full-text search and
+DISTINCT work and load only the rows they need by pk.
+
+Entries are keyed on the catalogue version (see ``catalogue.py``), so
+any catalogue write invalidates them; the ``checked_out`` location
+filter, which follows borrowers, keys on the ledger version instead.
+Orderings by timestamp can lag by up to ``RESULT_CACHE_TTL``, as
+checkouts touch ``updated_at`` without bumping the version.
+"""
+
+import hashlib
+import json
+
+from django.core.cache import cache
+
+from .bulk import build_asset_filter_queryset
+from .catalogue import get_catalogue_version, get_ledger_version
+
+RESULT_CACHE_TTL = 300  # seconds
+
+# Larger results are not cached: the pk list outgrows a cache entry
+# and ``pk__in`` stops being cheaper than re-running the filters.
+MAX_CACHED_PKS = 20000
+
+# Stored for results over MAX_CACHED_PKS so they are not re-fetched
+_TOO_LARGE = "too-large"
+
+
+def result_cache_key(filters: dict, ordering: str | None = None) -> str:
+    """Return the cache key for a filter signature and ordering."""
+    signature = json.dumps(
+        {"filters": filters, "ordering": ordering}, sort_keys=True
+    )
+    digest = hashlib.md5(signature.encode()).hexdigest()
+    if filters.get("location") == "checked_out":
+        version = "-".join(map(str, get_ledger_version()))
+    else:
+        version = get_catalogue_version()
+    return f"asset_results:{version}:{digest}"
+
+
+def cached_asset_pks(
+    filters: dict, ordering: str | None = None
+) -> list[int] | None:
+    """Return the ordered pks of assets matching ``filters``.
+
+    Args:
+        filters: Filter parameters from ``validate_filter_params``.
+        ordering: Sort field (e.g. ``"-updated_at"``); pk breaks ties.
+            Defaults to the model's ordering.
+
+    Returns:
+        List of asset pks, or None when the result has more than
+        ``MAX_CACHED_PKS`` rows and the caller should query directly.
+    """
+    key = result_cache_key(filters, ordering)
+    pks = cache.get(key)
+    if pks is None:
+        queryset = build_asset_filter_queryset(filters)
+        if ordering:
+            queryset = queryset.order_by(ordering, "pk")
+        pks = list(queryset.values_list("pk", flat=True)[: MAX_CACHED_PKS + 1])
+        if len(pks) > MAX_CACHED_PKS:
+            pks = _TOO_LARGE
+        cache.set(key, pks, RESULT_CACHE_TTL)
+    if pks == _TOO_LARGE:
+        return None
+    return pks
@@ -1,19 +1,42 @@
 """Asset text search helpers.
 
-Provides PostgreSQL full-text search (FTS) for Asset querysets, with
+Provides PostgreSQL full-text search (FTS) for Asset querysets over the
+trigger-maintained ``search_vector`` (name, description, tags,
+category, department, location path and serial numbers), with
 icontains fallback for identifier fields (barcode, NFC tag IDs) that
 don't benefit from stemming/tokenisation.
 
 Falls back to icontains-only search on non-PostgreSQL backends (e.g.
 SQLite in tests).
+
+``build_asset_autocomplete`` is a lighter typeahead path that only
+touches name and barcode, both covered by pg_trgm GIN indexes
+(migration 0041), and ranks by trigram similarity.
 """
 
+import re
+
 from django.db import connection
-from django.db.models import Case, F, Q, Value, When
+from django.db.models import (
+    Case,
+    Exists,
+    F,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
 from django.db.models.fields import FloatField
 
+from assets.models import NFCTag
+
 MAX_SEARCH_WORDS = 20
 
+# Barcode-looking input (e.g. "PROP-", "PROP-00A1") takes the prefix path
+BARCODE_PREFIX_PATTERN = re.compile(r"^[A-Z]+-[A-Z0-9]*$", re.IGNORECASE)
+
 
 def _is_postgres():
     return connection.vendor == "postgresql"
@@ -22,8 +45,10 @@ def _is_postgres():
 def _build_fts_search(queryset, words, search_text, icontains_q):
     """FTS search path for PostgreSQL.
 
-    Uses the pre-computed search_vector field (updated by a DB trigger)
-    with a GIN index for fast full-text search.
+    Uses the pre-computed search_vector field (updated by DB triggers,
+    see migrations 0039 and 0042) with a GIN index. The vector already
+    holds tag names, category, department, location path and serial
+    numbers, so no joins or DISTINCT are needed.
     """
     from django.contrib.postgres.search import SearchQuery, SearchRank
 
@@ -32,13 +57,7 @@ def _build_fts_search(queryset, words, search_text, icontains_q):
     # Filter on the stored search_vector field (GIN-indexed)
     fts_filter = Q(search_vector=search_query)
 
-    # Tags via icontains (short strings, stemming adds little value;
-    # M2M joins in SearchVector cause row duplication issues)
-    tag_q = Q()
-    for word in words:
-        tag_q &= Q(tags__name__icontains=word)
-
-    combined_filter = fts_filter | tag_q | icontains_q
+    combined_filter = fts_filter | icontains_q
 
     barcode_exact = Case(
         When(barcode__iexact=search_text, then=Value(10.0)),
@@ -52,7 +71,6 @@ def _build_fts_search(queryset, words, search_text, icontains_q):
             barcode_boost=barcode_exact,
         )
         .filter(combined_filter)
-        .distinct()
         .order_by("-barcode_boost", "-fts_rank")
     )
 
@@ -96,6 +114,8 @@ def build_asset_search(
     backends.
 
     - FTS/icontains on: name, description, tag names
+    - FTS (PostgreSQL only): category, department, location path,
+      serial numbers
     - icontains on: barcode (identifier, not prose)
     - icontains on: NFC tag IDs (if include_nfc=True)
     - icontains on: category name (if include_category=True)
@@ -107,7 +127,8 @@ def build_asset_search(
         include_category: Include category name substring matching.
 
     Returns:
-        Filtered, distinct queryset ordered by relevance.
+        Filtered queryset ordered by relevance. Rows are unique: the
+        PostgreSQL path needs no joins and the fallback uses DISTINCT.
     """
     words = q.split()[:MAX_SEARCH_WORDS]
     if not words:
@@ -120,9 +141,15 @@ def build_asset_search(
     for word in words:
         word_q = Q(barcode__icontains=word)
         if include_nfc:
+            # EXISTS rather than a join, so rows are not multiplied
             word_q |= Q(
-                nfc_tags__tag_id__icontains=word,
-                nfc_tags__removed_at__isnull=True,
+                Exists(
+                    NFCTag.objects.filter(
+                        asset=OuterRef("pk"),
+                        tag_id__icontains=word,
+                        removed_at__isnull=True,
+                    )
+                )
             )
         if include_category:
             word_q |= Q(category__name__icontains=word)
@@ -134,3 +161,145 @@ def build_asset_search(
         return _build_icontains_search(
             queryset, words, search_text, icontains_q
         )
+
+
+def looks_like_barcode(q) -> bool:
+    """Return True if the input looks like a (partial) barcode."""
+    return bool(BARCODE_PREFIX_PATTERN.match(q.strip()))
+
+
+def build_asset_autocomplete(queryset, q):
+    """Apply typeahead search to an Asset queryset.
+
+    Unlike ``build_asset_search`` this avoids joins and DISTINCT so
+    every filter can be served from the pg_trgm GIN indexes on
+    ``UPPER(name)`` and ``UPPER(barcode)``:
+
+    - Barcode-looking input: barcode prefix match (plus name prefix,
+      so names like "X-Ray" still match), exact barcode first.
+    - Otherwise: every word must appear in the name or barcode.
+
+    On PostgreSQL results are ranked by trigram word similarity of
+    the name to the query; other backends rank name prefix matches
+    above substring matches.
+
+    Args:
+        queryset: Base Asset queryset to filter.
+        q: Search string (space-separated words, ANDed).
+
+    Returns:
+        Filtered queryset ordered by relevance, then name.
+    """
+    words = q.split()[:MAX_SEARCH_WORDS]
+    if not words:
+        return queryset.none()
+
+    search_text = " ".join(words)
+
+    if len(words) == 1 and looks_like_barcode(search_text):
+        match_q = Q(barcode__istartswith=search_text) | Q(
+            name__istartswith=search_text
+        )
+    else:
+        match_q = Q()
+        for word in words:
+            match_q &= Q(name__icontains=word) | Q(barcode__icontains=word)
+
+    barcode_exact = Case(
+        When(barcode__iexact=search_text, then=Value(10.0)),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+    queryset = queryset.filter(match_q).annotate(barcode_boost=barcode_exact)
+
+    if _is_postgres():
+        from django.contrib.postgres.search import TrigramWordSimilarity
+
+        return queryset.annotate(
+            similarity=TrigramWordSimilarity(search_text, "name"),
+        ).order_by("-barcode_boost", "-similarity", "name")
+
+    name_prefix = Case(
+        When(name__istartswith=search_text, then=Value(1)),
+        default=Value(2),
+        output_field=IntegerField(),
+    )
+    return queryset.annotate(name_prefix=name_prefix).order_by(
+        "-barcode_boost", "name_prefix", "name"
+    )
+
+
+# Fields the JSON search API can return (``?fields=``), each mapped to
+# the values() lookup it projects from
+SEARCH_API_FIELDS = {
+    "id": "pk",
+    "name": "name",
+    "barcode": "barcode",
+    "status": "status",
+    "condition": "condition",
+    "category": "category__name",
+    "department": "category__department__name",
+    "location_id": "current_location_id",
+    "location": "current_location_id",
+    "checked_out": "checked_out_to_id",
+    "thumbnail_url": None,
+}
+
+
+def _primary_image_field(field):
+    from assets.models import AssetImage
+
+    return Subquery(
+        AssetImage.objects.filter(asset=OuterRef("pk"), is_primary=True)
+        .order_by("pk")
+        .values(field)[:1]
+    )
+
+
+def project_asset_search(queryset, fields, limit):
+    """Return search results as plain dicts via ``values()``.
+
+    No model instances are built: related names come from joins,
+    location paths from the cached ``location_paths`` map and the
+    thumbnail from a primary-image subquery.
+
+    Args:
+        queryset: Ranked Asset queryset (e.g. from
+            ``build_asset_search``).
+        fields: Keys of ``SEARCH_API_FIELDS`` to return.
+        limit: Maximum number of rows.
+
+    Returns:
+        List of dicts with exactly ``fields`` as keys.
+    """
+    from assets.models import AssetImage
+
+    from .locations import location_paths
+
+    lookups = {SEARCH_API_FIELDS[f] for f in fields if SEARCH_API_FIELDS[f]}
+    annotations = {}
+    if "thumbnail_url" in fields:
+        annotations = {
+            "_thumbnail": _primary_image_field("thumbnail"),
+            "_image": _primary_image_field("image"),
+        }
+    rows = queryset.values(*lookups, **annotations)[:limit]
+
+    paths = location_paths() if "location" in fields else {}
+    storage = AssetImage._meta.get_field("image").storage
+    results = []
+    for row in rows:
+        item = {}
+        for field in fields:
+            if field == "location":
+                item[field] = paths.get(row["current_location_id"], "")
+            elif field == "checked_out":
+                item[field] = row["checked_out_to_id"] is not None
+            elif field == "thumbnail_url":
+                name = row["_thumbnail"] or row["_image"]
+                item[field] = storage.url(name) if name else ""
+            else:
+                value = row[SEARCH_API_FIELDS[field]]
+                item[field] = "" if value is None else value
+        results.append(item)
+    return results
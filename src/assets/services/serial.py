@@ -5,6 +5,7 @@ from django.db.models import Count, QuerySet
 
 from assets.models import AssetSerial
 
+from .availability import refresh_serial_counters
 from .barcode import (
     generate_code128_image,
     generate_serial_barcode_string,
@@ -280,6 +281,7 @@ def apply_convert_to_non_serialised(
         AssetKit.objects.filter(serial__in=serials).update(serial=None)
 
         serials.update(is_archived=True)
+        refresh_serial_counters([locked.pk])
 
         locked.is_serialised = False
         locked.quantity = max(quantity, 0)
@@ -0,0 +1,265 @@
+"""Maintained asset statistics for the dashboard.
+
+``AssetStatistic`` holds asset counts keyed by (dimension, key,
+department, status), so the dashboard's totals and top-N lists are
+read from a table that grows with the number of categories, locations
+and tags rather than with the number of assets:
+
+- ``category``: assets per category and status. Summing a
+  department's category rows gives its count, and summing all rows
+  gives the global totals. The ``checked_out`` pseudo-status counts
+  assets out on loan.
+- ``location``: assets per current location and status.
+- ``tag``: tagged assets per tag and status.
+
+Every row carries the asset's department (through its category), so a
+department manager's figures are sums over their departments only.
+
+``Asset.save``, asset deletion, tag changes and category department
+changes apply their deltas directly. Services that write assets with
+``queryset.update()``, ``bulk_update()`` or ``bulk_create()`` wrap the
+write in ``tracking_asset_statistics``. ``reconcile_asset_statistics``
+(run nightly, and by the ``reconcile_statistics`` command) corrects
+any drift, e.g. from assets moved by on_delete cascades.
+"""
+
+from collections import Counter
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models import Count, F, QuerySet
+
+from ..models import Asset, AssetStatistic, Category
+
+CHECKED_OUT = AssetStatistic.CHECKED_OUT
+DIMENSIONS = ("category", "location", "tag")
+
+_DEPT = "category__department_id"
+
+
+def count_asset_statistics(asset_ids=None, dimensions=DIMENSIONS) -> Counter:
+    """Count assets into their statistic rows from the source tables.
+
+    Args:
+        asset_ids: Restrict the count to these assets; None counts
+            the whole catalogue.
+        dimensions: The dimensions to count.
+
+    Returns:
+        Counter of ``(dimension, key, department_key, status)`` rows.
+    """
+    assets = Asset.objects.all()
+    tagged = Asset.tags.through.objects.all()
+    if asset_ids is not None:
+        assets = assets.filter(pk__in=asset_ids)
+        tagged = tagged.filter(asset_id__in=asset_ids)
+    counts = Counter()
+    if "category" in dimensions:
+        for row in (
+            assets.values("category_id", _DEPT, "status")
+            .annotate(n=Count("pk"))
+            .order_by()
+        ):
+            key = (row["category_id"] or 0, row[_DEPT] or 0, row["status"])
+            counts[("category", *key)] += row["n"]
+        for row in (
+            assets.filter(checked_out_to__isnull=False)
+            .values("category_id", _DEPT)
+            .annotate(n=Count("pk"))
+            .order_by()
+        ):
+            key = (row["category_id"] or 0, row[_DEPT] or 0, CHECKED_OUT)
+            counts[("category", *key)] += row["n"]
+    if "location" in dimensions:
+        for row in (
+            assets.values("current_location_id", _DEPT, "status")
+            .annotate(n=Count("pk"))
+            .order_by()
+        ):
+            key = (
+                row["current_location_id"] or 0,
+                row[_DEPT] or 0,
+                row["status"],
+            )
+            counts[("location", *key)] += row["n"]
+    if "tag" in dimensions:
+        for row in (
+            tagged.values(
+                "tag_id", "asset__category__department_id", "asset__status"
+            )
+            .annotate(n=Count("pk"))
+            .order_by()
+        ):
+            key = (
+                row["tag_id"],
+                row["asset__category__department_id"] or 0,
+                row["asset__status"],
+            )
+            counts[("tag", *key)] += row["n"]
+    return counts
+
+
+def asset_statistic_rows(state, department_id, tag_ids=()) -> Counter:
+    """The statistic rows of one asset, without querying.
+
+    Args:
+        state: ``Asset.statistic_state()`` of the asset.
+        department_id: The department of the state's category.
+        tag_ids: The asset's tag pks.
+    """
+    status, category_id, location_id, checked_out_to_id = state
+    dept = department_id or 0
+    rows = Counter(
+        {
+            ("category", category_id or 0, dept, status): 1,
+            ("location", location_id or 0, dept, status): 1,
+        }
+    )
+    if checked_out_to_id:
+        rows[("category", category_id or 0, dept, CHECKED_OUT)] += 1
+    for tag_id in tag_ids:
+        rows[("tag", tag_id, dept, status)] += 1
+    return rows
+
+
+def apply_statistics_delta(before: Counter, after: Counter) -> None:
+    """Move the stored counts from ``before`` to ``after``.
+
+    Missing rows are created empty in one query, then each changed row
+    gets one atomic ``F()`` update.
+    """
+    delta = Counter(after)
+    delta.subtract(before)
+    changed = {row: change for row, change in delta.items() if change}
+    if not changed:
+        return
+    AssetStatistic.objects.bulk_create(
+        [
+            AssetStatistic(
+                dimension=dimension,
+                key=key,
+                department_key=department_key,
+                status=status,
+            )
+            for dimension, key, department_key, status in changed
+        ],
+        ignore_conflicts=True,
+    )
+    for (dimension, key, department_key, status), change in changed.items():
+        AssetStatistic.objects.filter(
+            dimension=dimension,
+            key=key,
+            department_key=department_key,
+            status=status,
+        ).update(count=F("count") + change)
+
+
+def record_asset_change(asset, old_state, new_state) -> None:
+    """Apply the delta of one asset moving between statistic states.
+
+    ``old_state`` is None for a new asset. Queries only for what the
+    change needs: the categories' departments, and the asset's tags
+    when its tag rows move.
+    """
+    if old_state == new_state:
+        return
+    category_ids = {new_state[1]}
+    if old_state is not None:
+        category_ids.add(old_state[1])
+    category_ids.discard(None)
+    departments = {}
+    if category_ids == {asset.category_id} and Asset.category.is_cached(asset):
+        departments[asset.category_id] = asset.category.department_id
+    elif category_ids:
+        departments = dict(
+            Category.objects.filter(pk__in=category_ids).values_list(
+                "pk", "department_id"
+            )
+        )
+    new_dept = departments.get(new_state[1])
+    if old_state is None:
+        apply_statistics_delta(
+            Counter(), asset_statistic_rows(new_state, new_dept)
+        )
+        return
+    old_dept = departments.get(old_state[1])
+    tag_ids = ()
+    if (old_state[0], old_dept) != (new_state[0], new_dept):
+        tag_ids = list(asset.tags.values_list("pk", flat=True))
+    apply_statistics_delta(
+        asset_statistic_rows(old_state, old_dept, tag_ids),
+        asset_statistic_rows(new_state, new_dept, tag_ids),
+    )
+
+
+@contextmanager
+def tracking_asset_statistics(assets, dimensions=DIMENSIONS):
+    """Apply the statistics delta of asset writes made in the block.
+
+    Args:
+        assets: Asset pks, or an Asset queryset. A queryset is
+            evaluated on entry, so assets the write moves out of its
+            filter are still counted afterwards.
+        dimensions: The dimensions the write can affect.
+    """
+    if isinstance(assets, QuerySet):
+        asset_ids = list(assets.values_list("pk", flat=True))
+    else:
+        asset_ids = list(assets)
+    if not asset_ids:
+        yield
+        return
+    # Joins the caller's transaction rather than adding a savepoint
+    with transaction.atomic(savepoint=False):
+        before = count_asset_statistics(asset_ids, dimensions)
+        yield
+        apply_statistics_delta(
+            before, count_asset_statistics(asset_ids, dimensions)
+        )
+
+
+def record_new_assets(asset_ids) -> None:
+    """Count assets created with ``bulk_create()``."""
+    apply_statistics_delta(Counter(), count_asset_statistics(asset_ids))
+
+
+def record_removed_assets(asset_ids) -> None:
+    """Uncount assets about to be deleted."""
+    apply_statistics_delta(count_asset_statistics(asset_ids), Counter())
+
+
+def reconcile_asset_statistics(fix=False):
+    """Compare stored statistics with counts from the source tables.
+
+    Args:
+        fix: Correct rows that disagree and drop empty ones.
+
+    Returns:
+        List of ``(row, stored, expected)`` tuples, one per mismatched
+        row, where ``row`` is ``(dimension, key, department_key,
+        status)``.
+    """
+    with transaction.atomic():
+        expected = count_asset_statistics()
+        stored = Counter(
+            {
+                (dimension, key, department_key, status): count
+                for dimension, key, department_key, status, count in (
+                    AssetStatistic.objects.values_list(
+                        "dimension", "key", "department_key", "status", "count"
+                    )
+                )
+            }
+        )
+        mismatches = [
+            (row, stored[row], expected[row])
+            for row in sorted(set(stored) | set(expected))
+            if stored[row] != expected[row]
+        ]
+        if fix and mismatches:
+            apply_statistics_delta(
+                Counter({row: stored[row] for row, _, _ in mismatches}),
+                Counter({row: expected[row] for row, _, _ in mismatches}),
+            )
+            AssetStatistic.objects.filter(count=0).delete()
+    return mismatches
@@ -0,0 +1,259 @@
+"""Flat CSV, NDJSON and Parquet exports built from ``values()``.
+
+Each dataset is a fixed projection of column lookups evaluated in the
+database (tag names are aggregated in SQL), streamed in batches of
+BATCH_SIZE rows without instantiating models. Every dataset takes the
+same asset selection as the XLSX export (``export_params``); serial,
+transaction and hold list rows are restricted to the selected assets.
+"""
+
+import csv
+import io
+import json
+from itertools import islice
+from tempfile import SpooledTemporaryFile
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models import OuterRef, Subquery
+
+from ..models import Asset, AssetSerial, HoldListItem, Transaction
+from .export import SPOOL_MAX_SIZE
+from .export_jobs import export_queryset
+
+BATCH_SIZE = 2000
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class _JoinedNames(models.Aggregate):
+    """Comma-separated, name-ordered string aggregate.
+
+    ``STRING_AGG`` on PostgreSQL, ``GROUP_CONCAT`` on SQLite (where
+    the order is unspecified; used by the test settings only).
+    """
+
+    function = "STRING_AGG"
+    template = "%(function)s(%(expressions)s, ', ' ORDER BY %(expressions)s)"
+    output_field = models.TextField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler,
+            connection,
+            function="GROUP_CONCAT",
+            template="%(function)s(%(expressions)s, ', ')",
+            **extra_context,
+        )
+
+
+def _tag_names(asset_ref: str):
+    """Subquery of an asset's tag names, joined in SQL."""
+    return Subquery(
+        Asset.tags.through.objects.filter(asset_id=OuterRef(asset_ref))
+        .values("asset_id")
+        .annotate(names=_JoinedNames("tag__name"))
+        .values("names")[:1],
+        output_field=models.TextField(),
+    )
+
+
+# Dataset -> (model, {column: lookup}); lookups starting with "_" are
+# annotations supplied by the dataset's queryset builder.
+DATASETS = {
+    "assets": (
+        Asset,
+        {
+            "id": "id",
+            "name": "name",
+            "barcode": "barcode",
+            "status": "status",
+            "condition": "condition",
+            "category": "category__name",
+            "department": "category__department__name",
+            "location": "current_location__full_path",
+            "checked_out_to": "checked_out_to__username",
+            "quantity": "quantity",
+            "purchase_price": "purchase_price",
+            "estimated_value": "estimated_value",
+            "tags": "_tags",
+            "created_at": "created_at",
+            "updated_at": "updated_at",
+        },
+    ),
+    "serials": (
+        AssetSerial,
+        {
+            "id": "id",
+            "asset_id": "asset_id",
+            "asset": "asset__name",
+            "asset_barcode": "asset__barcode",
+            "serial_number": "serial_number",
+            "barcode": "barcode",
+            "status": "status",
+            "condition": "condition",
+            "location": "current_location__full_path",
+            "checked_out_to": "checked_out_to__username",
+            "is_archived": "is_archived",
+        },
+    ),
+    "transactions": (
+        Transaction,
+        {
+            "id": "id",
+            "asset_id": "asset_id",
+            "asset": "asset__name",
+            "asset_barcode": "asset__barcode",
+            "action": "action",
+            "quantity": "quantity",
+            "serial_barcode": "serial_barcode",
+            "user": "user__username",
+            "borrower": "borrower__username",
+            "from_location": "from_location__full_path",
+            "to_location": "to_location__full_path",
+            "timestamp": "timestamp",
+            "due_date": "due_date",
+            "notes": "notes",
+        },
+    ),
+    "hold_lists": (
+        HoldListItem,
+        {
+            "hold_list_id": "hold_list_id",
+            "hold_list": "hold_list__name",
+            "project": "hold_list__project__name",
+            "department": "hold_list__department__name",
+            "hold_list_status": "hold_list__status__name",
+            "start_date": "hold_list__start_date",
+            "end_date": "hold_list__end_date",
+            "asset_id": "asset_id",
+            "asset": "asset__name",
+            "asset_barcode": "asset__barcode",
+            "serial_barcode": "serial__barcode",
+            "quantity": "quantity",
+            "pull_status": "pull_status",
+            "pulled_at": "pulled_at",
+        },
+    ),
+}
+
+
+def _base_queryset(dataset: str):
+    if dataset == "assets":
+        return Asset.objects.annotate(_tags=_tag_names("pk"))
+    if dataset == "serials":
+        return AssetSerial.objects.all()
+    if dataset == "transactions":
+        return Transaction.objects.all()
+    return HoldListItem.objects.all()
+
+
+def export_rows_queryset(dataset: str, params: dict):
+    """Return the row queryset for a dataset and export parameters.
+
+    Args:
+        dataset: One of ``DATASETS``.
+        params: Asset selection from ``export_params``; non-asset
+            datasets are restricted to rows of the selected assets.
+
+    Raises:
+        KeyError: Unknown dataset.
+    """
+    columns = DATASETS[dataset][1]
+    assets = export_queryset(params).values("pk")
+    queryset = _base_queryset(dataset)
+    if dataset == "assets":
+        queryset = queryset.filter(pk__in=assets)
+    else:
+        queryset = queryset.filter(asset_id__in=assets)
+    return queryset.order_by("pk").values_list(*columns.values())
+
+
+def _batches(queryset):
+    rows = queryset.iterator(chunk_size=BATCH_SIZE)
+    while batch := list(islice(rows, BATCH_SIZE)):
+        yield batch
+
+
+def stream_csv(dataset: str, queryset):
+    """Yield CSV-encoded chunks, one per batch, header first."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(DATASETS[dataset][1])
+    for batch in _batches(queryset):
+        writer.writerows(batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def stream_ndjson(dataset: str, queryset):
+    """Yield newline-delimited JSON chunks, one per batch."""
+    columns = list(DATASETS[dataset][1])
+    for batch in _batches(queryset):
+        yield "".join(
+            json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder) + "\n"
+            for row in batch
+        ).encode()
+
+
+def _arrow_type(pa, model, lookup):
+    """Arrow type for a values() lookup, from the model field it reads."""
+    if lookup == "_tags":
+        return pa.string()
+    field = None
+    for part in lookup.split("__"):
+        field = model._meta.get_field(part)
+        if field.is_relation and field.related_model is not None:
+            model = field.related_model
+    if field.is_relation:
+        field = field.target_field
+    internal = field.get_internal_type()
+    if internal.endswith(("AutoField", "IntegerField")):
+        return pa.int64()
+    if internal == "DecimalField":
+        return pa.decimal128(field.max_digits, field.decimal_places)
+    if internal == "DateTimeField":
+        return pa.timestamp("us", tz="UTC")
+    if internal == "DateField":
+        return pa.date32()
+    if internal == "BooleanField":
+        return pa.bool_()
+    return pa.string()
+
+
+def write_parquet(dataset: str, queryset) -> SpooledTemporaryFile:
+    """Write the rows to a Parquet file, one row group per batch.
+
+    Returns a spooled temporary file rewound for reading.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    model, columns = DATASETS[dataset]
+    schema = pa.schema(
+        [
+            (name, _arrow_type(pa, model, lookup))
+            for name, lookup in columns.items()
+        ]
+    )
+    spool = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    with pq.ParquetWriter(spool, schema) as writer:
+        for batch in _batches(queryset):
+            writer.write_table(
+                pa.Table.from_arrays(
+                    [
+                        pa.array(values, type=field.type)
+                        for values, field in zip(zip(*batch), schema)
+                    ],
+                    schema=schema,
+                )
+            )
+    spool.seek(0)
+    return spool
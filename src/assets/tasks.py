@@ -52,50 +52,56 @@ def analyse_image(self, image_id: int):
     image.save(update_fields=["ai_processing_status"])
 
     try:
-        image_file = image.image
-        image_bytes = image_file.read()
-
-        # Check image dimensions for memory safety (S7.11.8)
-        try:
-            from io import BytesIO
-
-            from PIL import Image as PILImage
-
-            pil_img = PILImage.open(BytesIO(image_bytes))
-            width, height = pil_img.size
-            pixel_count = width * height
-            # 48 megapixels is the safety limit
-            max_pixels = getattr(settings, "AI_MAX_PIXELS", 48_000_000)
-            if pixel_count > max_pixels:
-                image.ai_processing_status = "failed"
-                image.ai_error_message = (
-                    f"Image too large for AI analysis "
-                    f"({width}x{height} = {pixel_count:,} pixels). "
-                    f"Maximum is {max_pixels:,} pixels."
-                )
-                image.save(
-                    update_fields=[
-                        "ai_processing_status",
-                        "ai_error_message",
-                    ]
-                )
-                return
-        except Exception:
-            pass  # If we can't check dimensions, proceed anyway
-
-        # Determine media type
-        name = image_file.name.lower()
-        if name.endswith(".png"):
-            media_type = "image/png"
-        elif name.endswith(".webp"):
-            media_type = "image/webp"
-        else:
+        if image.ai_rendition:
+            # Already decoded, bounded and encoded by the upload pipeline
+            with image.ai_rendition.open("rb") as f:
+                image_bytes = f.read()
             media_type = "image/jpeg"
+        else:
+            image_file = image.image
+            image_bytes = image_file.read()
+
+            # Check image dimensions for memory safety (S7.11.8)
+            try:
+                from io import BytesIO
+
+                from PIL import Image as PILImage
+
+                pil_img = PILImage.open(BytesIO(image_bytes))
+                width, height = pil_img.size
+                pixel_count = width * height
+                # 48 megapixels is the safety limit
+                max_pixels = getattr(settings, "AI_MAX_PIXELS", 48_000_000)
+                if pixel_count > max_pixels:
+                    image.ai_processing_status = "failed"
+                    image.ai_error_message = (
+                        f"Image too large for AI analysis "
+                        f"({width}x{height} = {pixel_count:,} pixels). "
+                        f"Maximum is {max_pixels:,} pixels."
+                    )
+                    image.save(
+                        update_fields=[
+                            "ai_processing_status",
+                            "ai_error_message",
+                        ]
+                    )
+                    return
+            except Exception:
+                pass  # If we can't check dimensions, proceed anyway
+
+            # Determine media type
+            name = image_file.name.lower()
+            if name.endswith(".png"):
+                media_type = "image/png"
+            elif name.endswith(".webp"):
+                media_type = "image/webp"
+            else:
+                media_type = "image/jpeg"
 
-        # Resize for AI analysis
-        from .services.ai import resize_image_for_ai
+            # Resize for AI analysis
+            from .services.ai import resize_image_for_ai
 
-        image_bytes, media_type = resize_image_for_ai(image_bytes)
+            image_bytes, media_type = resize_image_for_ai(image_bytes)
 
         result = analyse_image_data(image_bytes, media_type)
 
@@ -198,49 +204,11 @@ def reanalyse_image(self, image_id: int):
 
 
 @shared_task
-def generate_detail_thumbnail(image_id: int):
-    """Generate 2000px detail thumbnail for an AssetImage."""
-    from io import BytesIO
-
-    from PIL import Image
+def process_asset_image(image_id: int):
+    """Build an uploaded image's renditions, then queue AI analysis."""
+    from .services.images import process_asset_image
 
-    from django.core.files.base import ContentFile
-
-    from .models import AssetImage
-
-    try:
-        asset_image = AssetImage.objects.get(pk=image_id)
-    except AssetImage.DoesNotExist:
-        return
-
-    if asset_image.detail_thumbnail:
-        return  # Already exists
-
-    try:
-        img = Image.open(asset_image.image)
-        longest = max(img.size)
-        if longest <= 2000:
-            # Image is small enough, no detail thumbnail needed
-            return
-
-        scale = 2000 / longest
-        new_size = (int(img.size[0] * scale), int(img.size[1] * scale))
-        img = img.resize(new_size, Image.LANCZOS)
-
-        if img.mode in ("RGBA", "P"):
-            img = img.convert("RGB")
-
-        buf = BytesIO()
-        img.save(buf, format="JPEG", quality=85)
-        buf.seek(0)
-
-        base_name = asset_image.image.name.split("/")[-1].rsplit(".", 1)[0]
-        name = f"detail_{base_name}.jpg"
-        asset_image.detail_thumbnail.save(
-            name, ContentFile(buf.getvalue()), save=True
-        )
-    except Exception:
-        pass
+    return process_asset_image(image_id)
 
 
 @shared_task
@@ -258,3 +226,83 @@ def cleanup_stale_jobs():
         logger = logging.getLogger(__name__)
         logger.info("Cleaned up %d stale print jobs", count)
     return count
+
+
+@shared_task
+def checkpoint_transaction_ledger():
+    """Periodic task to fold settled transactions into ledger checkpoints."""
+    from assets.services.availability import advance_ledger_checkpoints
+
+    return advance_ledger_checkpoints()
+
+
+@shared_task
+def run_export_job(job_id: int):
+    """Build the file for a background asset export job."""
+    from assets.services.export_jobs import build_export_job
+
+    build_export_job(job_id)
+
+
+@shared_task
+def validate_asset_import(job_id: int):
+    """Dry-run validation of an uploaded asset import."""
+    from assets.services.asset_import import validate_import_job
+
+    validate_import_job(job_id)
+
+
+@shared_task
+def run_asset_import(job_id: int):
+    """Create the assets of a confirmed asset import."""
+    from assets.services.asset_import import run_import_job
+
+    run_import_job(job_id)
+
+
+@shared_task
+def render_barcode_images(asset_ids: list[int]):
+    """Render Code128 images for assets and serials created without one."""
+    from assets.services.asset_import import render_missing_barcode_images
+
+    return render_missing_barcode_images(asset_ids)
+
+
+@shared_task
+def run_bulk_job(job_id: int):
+    """Run or resume a chunked bulk asset operation."""
+    from assets.services.bulk_jobs import execute_bulk_job
+
+    execute_bulk_job(job_id)
+
+
+@shared_task
+def resume_stale_bulk_jobs():
+    """Periodic task to re-queue bulk jobs whose worker stopped."""
+    from assets.services.bulk_jobs import resume_stale_bulk_jobs
+
+    return resume_stale_bulk_jobs()
+
+
+@shared_task
+def refresh_dashboard_aggregates(dept_ids=None):
+    """Recompute the cached dashboard aggregates of one scope."""
+    from assets.services.dashboard import refresh_dashboard_aggregates
+
+    refresh_dashboard_aggregates(dept_ids)
+
+
+@shared_task
+def reconcile_asset_statistics():
+    """Nightly task to correct drift in the dashboard statistics."""
+    from assets.services.statistics import reconcile_asset_statistics
+
+    return len(reconcile_asset_statistics(fix=True))
+
+
+@shared_task
+def advance_movement_rollups():
+    """Periodic task to fold new transactions into the daily rollups."""
+    from assets.services.movement_rollups import advance_movement_rollups
+
+    return advance_movement_rollups()
@@ -28,3 +28,47 @@ def department_exists(name):
 def is_placeholder_name(name):
     """Check if an asset name is an auto-generated placeholder."""
     return bool(_QUICK_CAPTURE_RE.match(name))
+
+
+# Variant formats in order of preference; the browser takes the first
+# <source> it supports.
+_PICTURE_FORMATS = (("avif", "image/avif"), ("webp", "image/webp"))
+
+
+@register.inclusion_tag("assets/partials/picture.html")
+def asset_picture(image, kind="grid", sizes="100vw", **attrs):
+    """Render an asset image as ``<picture>`` with WebP/AVIF srcsets.
+
+    ``kind`` is ``"grid"`` (thumbnail-sized) or ``"detail"``. The JPEG
+    thumbnail, detail thumbnail or original is the ``<img>`` fallback,
+    so images without renditions render as before. Extra keyword
+    arguments (``class``, ``alt``, ``loading``...) go on the ``<img>``.
+    """
+    if kind == "grid":
+        src = image.thumbnail_url
+    elif image.detail_thumbnail:
+        src = image.detail_thumbnail.url
+    else:
+        src = image.image.url if image.image else ""
+    sources = []
+    for fmt, mime in _PICTURE_FORMATS:
+        srcset = image.srcset(kind, fmt)
+        if srcset:
+            sources.append({"type": mime, "srcset": srcset})
+    return {
+        "src": src,
+        "sources": sources,
+        "sizes": sizes,
+        "attrs": attrs,
+    }
+
+
+@register.filter
+def rendition_srcset(image, spec):
+    """``srcset`` of an image's renditions, for script-driven markup.
+
+    ``spec`` is ``"<kind> <format>"``, e.g. ``{{ img|rendition_srcset:
+    "detail webp" }}``.
+    """
+    kind, fmt = spec.split()
+    return image.srcset(kind, fmt)
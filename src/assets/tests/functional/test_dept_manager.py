@@ -2598,7 +2598,7 @@ class TestUS_DM_025_ExportAssets_Columns:
             resp.get("Content-Disposition", "")
         )
 
-        wb = openpyxl.load_workbook(io.BytesIO(resp.content))
+        wb = openpyxl.load_workbook(io.BytesIO(resp.getvalue()))
         # Pick the first (or Assets) sheet
         sheet = wb.active
         if "Assets" in wb.sheetnames:
@@ -2929,7 +2929,7 @@ class TestUS_DM_025_ExportAssets_PurchasePrice:
         resp = dept_manager_client.get(reverse("assets:export_assets"))
         assert resp.status_code == 200, f"Export returned {resp.status_code}"
 
-        wb = openpyxl.load_workbook(BytesIO(resp.content))
+        wb = openpyxl.load_workbook(BytesIO(resp.getvalue()))
         sheet = wb.active
         if "Assets" in wb.sheetnames:
             sheet = wb["Assets"]
@@ -2964,7 +2964,7 @@ class TestUS_DM_025_ExportAssets_EstimatedValue:
         resp = dept_manager_client.get(reverse("assets:export_assets"))
         assert resp.status_code == 200, f"Export returned {resp.status_code}"
 
-        wb = openpyxl.load_workbook(BytesIO(resp.content))
+        wb = openpyxl.load_workbook(BytesIO(resp.getvalue()))
         sheet = wb.active
         if "Assets" in wb.sheetnames:
             sheet = wb["Assets"]
@@ -1939,7 +1939,7 @@ class TestScenario_11_12_InsuranceExportAndReporting:
         url = reverse("assets:export_assets")
         resp = admin_client.get(url)
         assert resp.status_code == 200
-        wb = openpyxl.load_workbook(io.BytesIO(resp.content))
+        wb = openpyxl.load_workbook(io.BytesIO(resp.getvalue()))
         ws = wb.active
         all_values = {
             str(cell.value or "") for row in ws.iter_rows() for cell in row
@@ -1965,7 +1965,7 @@ class TestScenario_11_12_InsuranceExportAndReporting:
         url = reverse("assets:export_assets")
         resp = admin_client.get(url)
         assert resp.status_code == 200
-        wb = openpyxl.load_workbook(io.BytesIO(resp.content))
+        wb = openpyxl.load_workbook(io.BytesIO(resp.getvalue()))
         all_values = set()
         for sheet in wb.worksheets:
             for row in sheet.iter_rows():
@@ -1997,7 +1997,7 @@ class TestScenario_11_12_InsuranceExportAndReporting:
         url = reverse("assets:export_assets")
         resp = admin_client.get(url, {"department": department.pk})
         assert resp.status_code == 200
-        wb = openpyxl.load_workbook(io.BytesIO(resp.content))
+        wb = openpyxl.load_workbook(io.BytesIO(resp.getvalue()))
         ws = wb.active
         all_values = {
             str(cell.value or "") for row in ws.iter_rows() for cell in row
@@ -2023,7 +2023,7 @@ class TestScenario_11_12_InsuranceExportAndReporting:
 
         resp = admin_client.get(reverse("assets:export_assets"))
         assert resp.status_code == 200
-        wb = openpyxl.load_workbook(BytesIO(resp.content))
+        wb = openpyxl.load_workbook(BytesIO(resp.getvalue()))
         assert "Summary" in wb.sheetnames, "No 'Summary' sheet in workbook"
         summary = wb["Summary"]
         col_a_values = [
@@ -2055,7 +2055,7 @@ class TestScenario_11_12_InsuranceExportAndReporting:
 
         resp = admin_client.get(reverse("assets:export_assets"))
         assert resp.status_code == 200
-        wb = openpyxl.load_workbook(BytesIO(resp.content))
+        wb = openpyxl.load_workbook(BytesIO(resp.getvalue()))
         assert "Summary" in wb.sheetnames, "No 'Summary' sheet in workbook"
         summary = wb["Summary"]
         col_a_values = [
@@ -2093,7 +2093,7 @@ class TestScenario_11_12_InsuranceExportAndReporting:
 
         resp = admin_client.get(reverse("assets:export_assets"))
         assert resp.status_code == 200
-        wb = openpyxl.load_workbook(BytesIO(resp.content))
+        wb = openpyxl.load_workbook(BytesIO(resp.getvalue()))
         assert (
             "Summary" in wb.sheetnames
         ), "No 'Summary' sheet found in export workbook"
@@ -2153,7 +2153,7 @@ class TestScenario_11_12_InsuranceExportAndReporting:
         url = reverse("assets:export_assets")
         resp = admin_client.get(url)
         assert resp.status_code == 200
-        wb = openpyxl.load_workbook(io.BytesIO(resp.content))
+        wb = openpyxl.load_workbook(io.BytesIO(resp.getvalue()))
         all_values = set()
         for sheet in wb.worksheets:
             for row in sheet.iter_rows():
@@ -1,6 +1,7 @@
 """Tests for AI analysis and image processing."""
 
 import json
+from io import StringIO
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -48,7 +49,13 @@ class TestAIAutoTrigger:
     )
     @patch("assets.tasks.analyse_image.delay")
     def test_image_upload_triggers_ai(
-        self, mock_delay, mock_enabled, admin_client, asset, admin_user
+        self,
+        mock_delay,
+        mock_enabled,
+        admin_client,
+        asset,
+        admin_user,
+        django_capture_on_commit_callbacks,
     ):
         from io import BytesIO
 
@@ -63,10 +70,11 @@ class TestAIAutoTrigger:
             "test.jpg", buf.getvalue(), content_type="image/jpeg"
         )
 
-        admin_client.post(
-            reverse("assets:image_upload", args=[asset.pk]),
-            {"image": img, "caption": "test"},
-        )
+        with django_capture_on_commit_callbacks(execute=True):
+            admin_client.post(
+                reverse("assets:image_upload", args=[asset.pk]),
+                {"image": img, "caption": "test"},
+            )
         assert mock_delay.called
 
     @patch(
@@ -74,7 +82,11 @@ class TestAIAutoTrigger:
     )
     @patch("assets.tasks.analyse_image.delay")
     def test_quick_capture_triggers_ai(
-        self, mock_delay, mock_enabled, admin_client
+        self,
+        mock_delay,
+        mock_enabled,
+        admin_client,
+        django_capture_on_commit_callbacks,
     ):
         from io import BytesIO
 
@@ -89,10 +101,11 @@ class TestAIAutoTrigger:
             "cap.jpg", buf.getvalue(), content_type="image/jpeg"
         )
 
-        admin_client.post(
-            reverse("assets:quick_capture"),
-            {"name": "AI Capture Test", "image": img},
-        )
+        with django_capture_on_commit_callbacks(execute=True):
+            admin_client.post(
+                reverse("assets:quick_capture"),
+                {"name": "AI Capture Test", "image": img},
+            )
         assert mock_delay.called
 
 
@@ -286,7 +299,9 @@ class TestAIRetryView:
 class TestThumbnailGeneration:
     """Test thumbnail creation on AssetImage save (Batch F)."""
 
-    def test_thumbnail_created_on_save(self, asset, user):
+    def test_thumbnail_created_on_save(
+        self, asset, user, django_capture_on_commit_callbacks
+    ):
         from io import BytesIO
 
         from PIL import Image as PILImage
@@ -302,11 +317,12 @@ class TestThumbnailGeneration:
             content_type="image/jpeg",
         )
 
-        image = AssetImage.objects.create(
-            asset=asset,
-            image=img_file,
-            uploaded_by=user,
-        )
+        with django_capture_on_commit_callbacks(execute=True):
+            image = AssetImage.objects.create(
+                asset=asset,
+                image=img_file,
+                uploaded_by=user,
+            )
         image.refresh_from_db()
         assert image.thumbnail
         assert image.thumbnail.name
@@ -496,30 +512,38 @@ class TestAISuggestionsPanel:
 
 
 class TestThreeTierThumbnails:
-    """V19: Three-tier thumbnail system."""
+    """V19: Three-tier thumbnail system, built by the image pipeline."""
 
-    def test_original_capped_at_3264_on_upload(self, asset, user):
-        """When uploading an image larger than 3264px, it should be capped."""
+    @pytest.fixture(autouse=True)
+    def _on_commit(self, django_capture_on_commit_callbacks):
+        self.on_commit = django_capture_on_commit_callbacks
+
+    def _upload(self, asset, user, size, name="test.jpg", fmt="JPEG", **kw):
         from io import BytesIO
 
         from PIL import Image
 
         from django.core.files.base import ContentFile
 
-        # Create a 4000x3000 image
-        img = Image.new("RGB", (4000, 3000), color="red")
+        img = Image.new(kw.pop("mode", "RGB"), size, color="red")
         buf = BytesIO()
-        img.save(buf, format="JPEG")
-        buf.seek(0)
-
+        img.save(buf, format=fmt, **kw)
         asset_image = AssetImage(
             asset=asset,
-            image=ContentFile(buf.getvalue(), name="large.jpg"),
+            image=ContentFile(buf.getvalue(), name=name),
             uploaded_by=user,
         )
-        asset_image.save()
+        with self.on_commit(execute=True):
+            asset_image.save()
+        asset_image.refresh_from_db()
+        return asset_image, buf.getvalue()
+
+    def test_original_capped_at_3264_on_upload(self, asset, user):
+        """When uploading an image larger than 3264px, it should be capped."""
+        from PIL import Image
+
+        asset_image, _ = self._upload(asset, user, (4000, 3000), "large.jpg")
 
-        # Reload the image and check dimensions
         saved_img = Image.open(asset_image.image)
         longest = max(saved_img.size)
         assert longest <= 3264, f"Expected longest edge <= 3264, got {longest}"
@@ -527,49 +551,43 @@ class TestThreeTierThumbnails:
         assert saved_img.size == (3264, 2448)
 
     def test_original_not_resized_if_already_small(self, asset, user):
-        """Images smaller than 3264px should not be resized."""
-        from io import BytesIO
+        """JPEGs within 3264px are kept byte for byte."""
+        asset_image, data = self._upload(
+            asset, user, (2000, 1500), "small.jpg"
+        )
+        with asset_image.image.open("rb") as f:
+            assert f.read() == data
 
+    def test_non_jpeg_converted_to_jpeg(self, asset, user):
+        """PNG uploads are stored as RGB JPEG (§S2.2.5-05a)."""
         from PIL import Image
 
-        from django.core.files.base import ContentFile
+        asset_image, _ = self._upload(
+            asset, user, (400, 300), "logo.png", fmt="PNG", mode="RGBA"
+        )
+        assert asset_image.image.name.endswith(".jpg")
+        saved_img = Image.open(asset_image.image)
+        assert saved_img.format == "JPEG"
+        assert saved_img.mode == "RGB"
 
-        # Create a 2000x1500 image
-        img = Image.new("RGB", (2000, 1500), color="blue")
-        buf = BytesIO()
-        img.save(buf, format="JPEG")
-        buf.seek(0)
+    def test_exif_orientation_applied(self, asset, user):
+        """Rotated phone photos are stored upright."""
+        from PIL import Image
 
-        asset_image = AssetImage(
-            asset=asset,
-            image=ContentFile(buf.getvalue(), name="small.jpg"),
-            uploaded_by=user,
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Rotate 90 CW
+        asset_image, _ = self._upload(
+            asset, user, (400, 300), "phone.jpg", exif=exif
         )
-        asset_image.save()
-
-        # Reload and check dimensions unchanged
         saved_img = Image.open(asset_image.image)
-        assert saved_img.size == (2000, 1500)
+        assert saved_img.size == (300, 400)
+        assert saved_img.getexif().get(0x0112, 1) == 1
 
     def test_grid_thumbnail_generated_at_300px(self, asset, user):
-        """The 300px grid thumbnail should be generated synchronously."""
-        from io import BytesIO
-
+        """The 300px grid thumbnail comes from the pipeline."""
         from PIL import Image
 
-        from django.core.files.base import ContentFile
-
-        img = Image.new("RGB", (1000, 800), color="green")
-        buf = BytesIO()
-        img.save(buf, format="JPEG")
-        buf.seek(0)
-
-        asset_image = AssetImage(
-            asset=asset,
-            image=ContentFile(buf.getvalue(), name="test.jpg"),
-            uploaded_by=user,
-        )
-        asset_image.save()
+        asset_image, _ = self._upload(asset, user, (1000, 800))
 
         assert asset_image.thumbnail
         thumb_img = Image.open(asset_image.thumbnail)
@@ -577,136 +595,250 @@ class TestThreeTierThumbnails:
         # and fits within 300x300
         assert max(thumb_img.size) <= 300
 
-    @patch("assets.tasks.generate_detail_thumbnail.delay")
-    def test_detail_thumbnail_task_queued_on_upload(
-        self, mock_delay, asset, user
+    @patch("assets.tasks.process_asset_image.delay")
+    def test_pipeline_queued_on_upload(self, mock_delay, asset, user):
+        """Saving a new image only queues the pipeline."""
+        asset_image, _ = self._upload(asset, user, (3000, 2000))
+
+        mock_delay.assert_called_once_with(asset_image.pk)
+        assert not asset_image.thumbnail
+        assert not asset_image.detail_thumbnail
+
+    def test_detail_thumbnail_generated(self, asset, user):
+        """The pipeline creates a 2000px detail thumbnail."""
+        from PIL import Image
+
+        asset_image, _ = self._upload(asset, user, (3000, 2000))
+
+        assert asset_image.detail_thumbnail
+        detail_img = Image.open(asset_image.detail_thumbnail)
+        # Should maintain aspect ratio (3:2)
+        assert detail_img.size in ((2000, 1333), (2000, 1334))
+
+    def test_detail_thumbnail_not_generated_for_small_images(
+        self, asset, user
     ):
-        """The Celery task for detail thumbnail should be queued."""
+        """Images <= 2000px should not get a detail thumbnail."""
+        asset_image, _ = self._upload(asset, user, (1500, 1000), "small.jpg")
+        assert asset_image.thumbnail
+        assert not asset_image.detail_thumbnail
+
+    def test_renditions_not_regenerated_if_exist(self, asset, user):
+        """A repeated pipeline run leaves existing renditions alone."""
+        from assets.services.images import process_asset_image
+
+        asset_image, _ = self._upload(asset, user, (3000, 2000))
+        names = [
+            asset_image.image.name,
+            asset_image.thumbnail.name,
+            asset_image.detail_thumbnail.name,
+            asset_image.ai_rendition.name,
+        ]
+
+        assert process_asset_image(asset_image.pk) == []
+        asset_image.refresh_from_db()
+        assert [
+            asset_image.image.name,
+            asset_image.thumbnail.name,
+            asset_image.detail_thumbnail.name,
+            asset_image.ai_rendition.name,
+        ] == names
+
+    def test_large_jpeg_decoded_in_draft_mode(self, asset, user):
+        """JPEGs are downscaled by the decoder, not at full size."""
         from io import BytesIO
 
         from PIL import Image
+        from PIL.JpegImagePlugin import JpegImageFile
 
-        from django.core.files.base import ContentFile
+        from assets.services.images import build_renditions
 
-        img = Image.new("RGB", (3000, 2000), color="yellow")
         buf = BytesIO()
-        img.save(buf, format="JPEG")
-        buf.seek(0)
+        Image.new("RGB", (8000, 6000), "red").save(buf, format="JPEG")
+        drafts = []
+        original_draft = JpegImageFile.draft
+
+        def tracking_draft(self, mode, size):
+            result = original_draft(self, mode, size)
+            drafts.append(self.size)
+            return result
+
+        with patch.object(JpegImageFile, "draft", tracking_draft):
+            fields, _ = build_renditions(
+                buf.getvalue(), ["image", "thumbnail"]
+            )
+        # 1/2 scale is the smallest decode that still covers 3264px
+        assert drafts == [(4000, 3000)]
+        assert Image.open(BytesIO(fields["image"])).size == (3264, 2448)
 
-        asset_image = AssetImage(
-            asset=asset,
-            image=ContentFile(buf.getvalue(), name="test.jpg"),
-            uploaded_by=user,
-        )
-        asset_image.save()
+    @override_settings(ANTHROPIC_API_KEY="test-key")
+    @patch("assets.services.ai.analyse_image_data")
+    @patch("assets.services.ai.resize_image_for_ai")
+    def test_ai_uses_pipeline_rendition(
+        self, mock_resize, mock_api, asset, user
+    ):
+        """AI analysis sends the stored rendition without decoding."""
+        from assets.tasks import analyse_image
 
-        # Celery task should have been queued with the image ID
-        mock_delay.assert_called_once_with(asset_image.pk)
+        mock_api.return_value = {"description": "A red square"}
+        asset_image, _ = self._upload(asset, user, (3000, 2000))
+        assert asset_image.ai_rendition
+
+        analyse_image(asset_image.pk)
+
+        mock_resize.assert_not_called()
+        with asset_image.ai_rendition.open("rb") as f:
+            assert mock_api.call_args.args == (f.read(), "image/jpeg")
 
-    def test_detail_thumbnail_generation_task(self, asset, user):
-        """The generate_detail_thumbnail task creates a 2000px image."""
+
+@pytest.mark.django_db
+class TestResponsiveRenditions:
+    """WebP/AVIF srcset renditions built by the image pipeline."""
+
+    @pytest.fixture(autouse=True)
+    def _on_commit(self, django_capture_on_commit_callbacks):
+        self.on_commit = django_capture_on_commit_callbacks
+
+    def _upload(self, asset, user, size):
         from io import BytesIO
 
         from PIL import Image
 
         from django.core.files.base import ContentFile
 
-        from assets.tasks import generate_detail_thumbnail
-
-        # Create a 3000x2000 image
-        img = Image.new("RGB", (3000, 2000), color="purple")
         buf = BytesIO()
-        img.save(buf, format="JPEG")
-        buf.seek(0)
-
+        Image.new("RGB", size, color="teal").save(buf, format="JPEG")
         asset_image = AssetImage(
             asset=asset,
-            image=ContentFile(buf.getvalue(), name="test.jpg"),
+            image=ContentFile(buf.getvalue(), name="photo.jpg"),
             uploaded_by=user,
         )
-        asset_image.save()
+        with self.on_commit(execute=True):
+            asset_image.save()
+        return asset_image
+
+    def _widths(self, asset_image, kind, fmt="webp"):
+        return list(
+            asset_image.renditions.filter(kind=kind, format=fmt).values_list(
+                "width", flat=True
+            )
+        )
 
-        # Manually call the task (not .delay)
-        generate_detail_thumbnail(asset_image.pk)
+    def test_webp_variants_built_at_each_width(self, asset, user):
+        from PIL import Image
 
-        # Reload and check detail_thumbnail
-        asset_image.refresh_from_db()
-        assert asset_image.detail_thumbnail
-        detail_img = Image.open(asset_image.detail_thumbnail)
-        longest = max(detail_img.size)
-        assert longest <= 2000
-        # Should maintain aspect ratio (3:2)
-        assert detail_img.size == (2000, 1333) or detail_img.size == (
-            2000,
-            1334,
-        )
+        asset_image = self._upload(asset, user, (3000, 2000))
 
-    def test_detail_thumbnail_not_generated_for_small_images(
-        self, asset, user
-    ):
-        """Images <= 2000px should not get a detail thumbnail."""
-        from io import BytesIO
+        assert self._widths(asset_image, "detail") == [800, 1200, 2000]
+        assert self._widths(asset_image, "grid") == [150, 300, 600]
+        assert not asset_image.renditions.filter(format="avif").exists()
+        rendition = asset_image.renditions.get(kind="grid", width=300)
+        assert rendition.height == 200
+        assert Image.open(rendition.file).format == "WEBP"
 
+    def test_grid_thumbnail_stays_300px_with_variants(self, asset, user):
+        """The JPEG thumbnail is not cut from the smallest variant."""
         from PIL import Image
 
-        from django.core.files.base import ContentFile
+        asset_image = self._upload(asset, user, (4000, 3000))
+        asset_image.refresh_from_db()
 
-        from assets.tasks import generate_detail_thumbnail
+        assert asset_image.renditions.filter(format="webp").exists()
+        assert Image.open(asset_image.thumbnail).size == (300, 225)
 
-        # Create a 1500x1000 image
-        img = Image.new("RGB", (1500, 1000), color="orange")
-        buf = BytesIO()
-        img.save(buf, format="JPEG")
-        buf.seek(0)
+    def test_small_image_not_upscaled(self, asset, user):
+        asset_image = self._upload(asset, user, (120, 90))
 
-        asset_image = AssetImage(
-            asset=asset,
-            image=ContentFile(buf.getvalue(), name="small.jpg"),
-            uploaded_by=user,
-        )
-        asset_image.save()
+        assert self._widths(asset_image, "detail") == [120]
+        assert self._widths(asset_image, "grid") == [120]
 
-        # Call the task
-        generate_detail_thumbnail(asset_image.pk)
+    @override_settings(IMAGE_AVIF_RENDITIONS=True)
+    def test_avif_variants_when_enabled(self, asset, user):
+        from PIL import features
 
-        # Reload and check detail_thumbnail is still empty
-        asset_image.refresh_from_db()
-        assert not asset_image.detail_thumbnail
+        if not features.check("avif"):
+            pytest.skip("Pillow built without AVIF support")
+        asset_image = self._upload(asset, user, (800, 600))
 
-    def test_detail_thumbnail_not_regenerated_if_exists(self, asset, user):
-        """If detail_thumbnail already exists, task should skip."""
-        from io import BytesIO
+        assert self._widths(asset_image, "grid", "avif") == [150, 300, 600]
 
-        from PIL import Image
+    def test_command_backfills_missing_formats(self, asset, user):
+        from django.core.management import call_command
 
-        from django.core.files.base import ContentFile
+        asset_image = self._upload(asset, user, (800, 600))
+        asset_image.renditions.all().delete()
 
-        from assets.tasks import generate_detail_thumbnail
+        call_command("build_image_renditions", "--now", stdout=StringIO())
 
-        # Create a large image
-        img = Image.new("RGB", (3000, 2000), color="cyan")
-        buf = BytesIO()
-        img.save(buf, format="JPEG")
-        buf.seek(0)
+        assert self._widths(asset_image, "grid") == [150, 300, 600]
 
-        asset_image = AssetImage(
-            asset=asset,
-            image=ContentFile(buf.getvalue(), name="test.jpg"),
-            uploaded_by=user,
+    @patch("assets.tasks.analyse_image.delay")
+    def test_broker_outage_leaves_image_for_command(
+        self, mock_analyse, asset, user, caplog
+    ):
+        from django.core.management import call_command
+
+        with (
+            patch(
+                "assets.tasks.process_asset_image.delay",
+                side_effect=ConnectionError("broker down"),
+            ),
+            self.on_commit(execute=True),
+        ):
+            asset_image = AssetImageFactory(
+                asset=asset,
+                image__width=800,
+                image__height=600,
+                ai_processing_status="pending",
+            )
+
+        assert "Could not queue the image pipeline" in caplog.text
+        assert not asset_image.renditions.exists()
+
+        call_command("build_image_renditions", "--now", stdout=StringIO())
+
+        assert self._widths(asset_image, "grid") == [150, 300, 600]
+        mock_analyse.assert_called_once_with(asset_image.pk)
+
+    def test_picture_tag_emits_sources(self, asset, user):
+        from django.template import Context, Template
+
+        asset_image = self._upload(asset, user, (800, 600))
+        asset_image = AssetImage.objects.prefetch_related("renditions").get(
+            pk=asset_image.pk
         )
-        asset_image.save()
+        html = Template(
+            "{% load assets_tags %}"
+            '{% asset_picture image "grid" sizes="50vw" class="x" %}'
+        ).render(Context({"image": asset_image}))
 
-        # Generate detail thumbnail
-        generate_detail_thumbnail(asset_image.pk)
-        asset_image.refresh_from_db()
-        original_detail_path = asset_image.detail_thumbnail.name
+        assert '<source type="image/webp"' in html
+        assert "image/avif" not in html
+        assert " 600w" in html
+        assert 'sizes="50vw"' in html
+        assert f'<img src="{asset_image.thumbnail.url}" class="x">' in html
 
-        # Call task again
-        generate_detail_thumbnail(asset_image.pk)
-        asset_image.refresh_from_db()
+    def test_picture_tag_falls_back_without_renditions(self, asset, user):
+        from django.template import Context, Template
+
+        asset_image = self._upload(asset, user, (800, 600))
+        asset_image.renditions.all().delete()
+        html = Template(
+            '{% load assets_tags %}{% asset_picture image "detail" %}'
+        ).render(Context({"image": asset_image}))
+
+        assert "<source" not in html
+        assert asset_image.image.url in html
+
+    def test_detail_page_serves_srcset(self, admin_client, asset, user):
+        self._upload(asset, user, (3000, 2000))
 
-        # Should be unchanged
-        assert asset_image.detail_thumbnail.name == original_detail_path
+        response = admin_client.get(
+            reverse("assets:asset_detail", args=[asset.pk])
+        )
+        content = response.content.decode()
+        assert '<source type="image/webp"' in content
+        assert "_detail_2000.webp 2000w" in content
 
 
 # ============================================================
@@ -1091,6 +1223,8 @@ class TestAIEdgeCases:
             is_primary=True,
             ai_processing_status="pending",
         )
+        # The guard covers images without a pipeline AI rendition
+        AssetImage.objects.filter(pk=img.pk).update(ai_rendition="")
 
         from assets.services.ai import analyse_image
 
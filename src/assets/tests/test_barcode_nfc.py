@@ -2162,3 +2162,164 @@ class TestLocationPrintLabel:
         url = reverse("assets:location_print_label", args=[location.pk])
         response = client_logged_in.get(url)
         assert response.status_code == 405
+
+
+@pytest.mark.django_db
+class TestIdentifierRegistry:
+    """Scan identifiers resolve through the AssetIdentifier registry."""
+
+    def test_asset_barcode_registered(self, asset):
+        from assets.models import AssetIdentifier
+
+        entry = AssetIdentifier.objects.get(asset=asset, kind="barcode")
+        assert entry.key == asset.barcode.upper()
+
+    def test_barcode_change_replaces_entry(self, asset):
+        from assets.models import AssetIdentifier
+
+        asset.barcode = "RENAMED-0001"
+        asset.save()
+        keys = list(
+            AssetIdentifier.objects.filter(
+                asset=asset, kind="barcode"
+            ).values_list("key", flat=True)
+        )
+        assert keys == ["RENAMED-0001"]
+
+    def test_nfc_removal_drops_entry(self, asset, user):
+        from assets.services.identifiers import lookup_identifier
+
+        tag = NFCTag.objects.create(
+            tag_id="nfc-reg-001", asset=asset, assigned_by=user
+        )
+        assert lookup_identifier("NFC-REG-001").asset == asset
+        tag.removed_at = timezone.now()
+        tag.save()
+        assert lookup_identifier("NFC-REG-001") is None
+
+    def test_disposed_serial_resolves_by_retired_barcode(
+        self, client_logged_in, serialised_asset, asset_serial
+    ):
+        barcode = asset_serial.barcode
+        asset_serial.status = "disposed"
+        asset_serial.save()
+        asset_serial.refresh_from_db()
+        assert asset_serial.barcode is None
+
+        response = client_logged_in.get(
+            reverse("assets:scan_lookup"), {"code": barcode}
+        )
+        data = response.json()
+        assert data["found"] is True
+        assert data["serial_id"] == asset_serial.pk
+        assert data["status"] == "disposed"
+
+    def test_scan_lookup_uses_single_registry_query(
+        self, client_logged_in, asset
+    ):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        url = reverse("assets:scan_lookup")
+        with CaptureQueriesContext(connection) as ctx:
+            client_logged_in.get(url, {"code": "UNKNOWN-CODE-XYZ"})
+        lookups = [
+            q for q in ctx if "assets_assetidentifier" in q["sql"].lower()
+        ]
+        assert len(lookups) == 1
+        assert not any(
+            "assets_nfctag" in q["sql"] or "assets_transaction" in q["sql"]
+            for q in ctx
+        )
+
+    def test_clear_barcode_unregisters(self, admin_client, asset):
+        from assets.services.identifiers import lookup_identifier
+
+        barcode = asset.barcode
+        admin_client.post(reverse("assets:clear_barcode", args=[asset.pk]))
+        assert lookup_identifier(barcode) is None
+
+    def test_rebuild_command_repairs_drift(self, asset):
+        from django.core.management import call_command
+
+        from assets.models import AssetIdentifier
+        from assets.services.identifiers import lookup_identifier
+
+        AssetIdentifier.objects.all().delete()
+        assert lookup_identifier(asset.barcode) is None
+        call_command("rebuild_identifiers", stdout=MagicMock())
+        assert lookup_identifier(asset.barcode).asset == asset
+
+
+@pytest.mark.django_db
+class TestScanLookupBatch:
+    """POST scan/lookup/batch/ resolves many codes in one request."""
+
+    def _post(self, client, payload):
+        return client.post(
+            reverse("assets:scan_lookup_batch"),
+            data=json.dumps(payload),
+            content_type="application/json",
+        )
+
+    def test_resolves_mixed_codes(
+        self, client_logged_in, asset, serialised_asset, asset_serial, user
+    ):
+        NFCTag.objects.create(
+            tag_id="NFC-BATCH-01", asset=asset, assigned_by=user
+        )
+        codes = [
+            asset.barcode,
+            asset_serial.barcode.lower(),
+            "nfc-batch-01",
+            "NOPE-0000",
+        ]
+        response = self._post(client_logged_in, {"codes": codes})
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert results[asset.barcode]["asset_id"] == asset.pk
+        serial_result = results[asset_serial.barcode.lower()]
+        assert serial_result["serial_id"] == asset_serial.pk
+        assert results["nfc-batch-01"]["asset_id"] == asset.pk
+        assert results["NOPE-0000"]["found"] is False
+        assert "quick_capture_url" in results["NOPE-0000"]
+
+    def test_matches_single_lookup_shape(self, client_logged_in, asset):
+        single = client_logged_in.get(
+            reverse("assets:scan_lookup"), {"code": asset.barcode}
+        ).json()
+        batch = self._post(client_logged_in, {"codes": [asset.barcode]})
+        assert batch.json()["results"][asset.barcode] == single
+
+    def test_single_registry_query(self, client_logged_in, asset):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        codes = [asset.barcode] + [f"MISS-{i:04d}" for i in range(100)]
+        with CaptureQueriesContext(connection) as ctx:
+            self._post(client_logged_in, {"codes": codes})
+        lookups = [
+            q for q in ctx if "assets_assetidentifier" in q["sql"].lower()
+        ]
+        assert len(lookups) == 1
+
+    def test_rejects_bad_payload(self, client_logged_in):
+        assert self._post(client_logged_in, {"codes": "X"}).status_code == 400
+        response = client_logged_in.post(
+            reverse("assets:scan_lookup_batch"),
+            data="not json",
+            content_type="application/json",
+        )
+        assert response.status_code == 400
+
+    def test_rejects_oversized_batch(self, client_logged_in):
+        from assets.views import MAX_BATCH_SCAN_CODES
+
+        codes = [f"C-{i}" for i in range(MAX_BATCH_SCAN_CODES + 1)]
+        assert (
+            self._post(client_logged_in, {"codes": codes}).status_code == 400
+        )
+
+    def test_get_not_allowed(self, client_logged_in):
+        response = client_logged_in.get(reverse("assets:scan_lookup_batch"))
+        assert response.status_code == 405
@@ -152,6 +152,48 @@ class TestLocation:
         url = location.get_absolute_url()
         assert f"/locations/{location.pk}/" in url
 
+    def test_tree_path_maintained(self, location, child_location):
+        assert location.tree_path == f"{location.pk}/"
+        assert child_location.tree_path == (
+            f"{location.pk}/{child_location.pk}/"
+        )
+        assert child_location.ancestor_ids == [location.pk]
+
+    def test_rename_and_move_rewrite_descendants(
+        self, location, child_location
+    ):
+        grandchild = Location.objects.create(
+            name="Box 1", parent=child_location
+        )
+        location.name = "Warehouse"
+        location.save()
+        grandchild.refresh_from_db()
+        assert grandchild.full_path == "Warehouse > Shelf A > Box 1"
+
+        other = Location.objects.create(name="Annex")
+        child_location.parent = other
+        child_location.save()
+        grandchild.refresh_from_db()
+        assert grandchild.full_path == "Annex > Shelf A > Box 1"
+        assert grandchild.tree_path == (
+            f"{other.pk}/{child_location.pk}/{grandchild.pk}/"
+        )
+        assert location.get_descendants() == []
+
+    def test_hierarchy_lookups_are_single_queries(
+        self, location, child_location, django_assert_num_queries
+    ):
+        grandchild = Location.objects.create(
+            name="Box 1", parent=child_location
+        )
+        with django_assert_num_queries(1):
+            assert grandchild.get_ancestors() == [location, child_location]
+        with django_assert_num_queries(1):
+            assert set(Location.objects.subtree(child_location)) == {
+                child_location,
+                grandchild,
+            }
+
 
 class TestAsset:
     def test_str(self, asset):
@@ -1545,3 +1587,304 @@ class TestV557DatabaseIndexes:
         assert (
             has_field_index or has_meta_index
         ), "Transaction.borrower should be indexed"
+
+
+class TestAvailabilityCounters:
+    """Maintained checkout/serial counters on Asset."""
+
+    def test_transactions_update_checked_out_quantity(self, asset, user):
+        asset.quantity = 5
+        asset.save()
+        Transaction.objects.create(
+            asset=asset, user=user, action="checkout", quantity=3
+        )
+        Transaction.objects.create(
+            asset=asset, user=user, action="checkin", quantity=1
+        )
+        asset.refresh_from_db()
+        assert asset.checked_out_quantity == 2
+        assert asset.available_count == 3
+        assert asset.is_checked_out
+
+    def test_full_save_does_not_clobber_counter(self, asset, user):
+        stale = Asset.objects.get(pk=asset.pk)
+        Transaction.objects.create(asset=asset, user=user, action="checkout")
+        stale.name = "Renamed"
+        stale.save()
+        asset.refresh_from_db()
+        assert asset.checked_out_quantity == 1
+
+    def test_serial_writes_update_counts(
+        self, serialised_asset, location, second_user
+    ):
+        serial = AssetSerialFactory(
+            asset=serialised_asset, current_location=location
+        )
+        serialised_asset.refresh_from_db()
+        assert serialised_asset.available_serial_count == 1
+        assert serialised_asset.checked_out_serial_count == 0
+
+        serial.checked_out_to = second_user
+        serial.save(update_fields=["checked_out_to"])
+        serialised_asset.refresh_from_db()
+        assert serialised_asset.available_serial_count == 0
+        assert serialised_asset.checked_out_serial_count == 1
+
+        serial.delete()
+        serialised_asset.refresh_from_db()
+        assert serialised_asset.checked_out_serial_count == 0
+
+    def test_reconcile_reports_and_fixes(self, asset, user):
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        from assets.services.availability import (
+            reconcile_availability_counters,
+        )
+
+        Transaction.objects.create(asset=asset, user=user, action="checkout")
+        Asset.objects.filter(pk=asset.pk).update(checked_out_quantity=7)
+
+        assert reconcile_availability_counters() == [
+            (asset.pk, "checked_out_quantity", 7, 1)
+        ]
+        call_command("reconcile_availability", "--fix", stdout=StringIO())
+        assert reconcile_availability_counters() == []
+
+
+@pytest.mark.django_db
+class TestAssetStatistics:
+    """Maintained dashboard statistics stay in step with assets."""
+
+    def _assert_in_sync(self):
+        from assets.services.statistics import reconcile_asset_statistics
+
+        assert reconcile_asset_statistics() == []
+
+    def test_single_asset_writes(self, user, second_user, location, tag):
+        other_dept_category = CategoryFactory(
+            department=DepartmentFactory(name="Sound")
+        )
+        asset = AssetFactory(current_location=location)
+        self._assert_in_sync()
+
+        asset.tags.add(tag)
+        asset.status = "missing"
+        asset.save()
+        self._assert_in_sync()
+
+        asset.checked_out_to = second_user
+        asset.save(update_fields=["checked_out_to"])
+        self._assert_in_sync()
+
+        # Unsaved in-memory changes outside update_fields stay uncounted
+        asset.status = "retired"
+        asset.current_location = LocationFactory()
+        asset.save(update_fields=["current_location"])
+        self._assert_in_sync()
+
+        asset.category = other_dept_category
+        asset.save()
+        self._assert_in_sync()
+
+        # Without the state loaded, the save counts before and after
+        partial = Asset.objects.only("pk", "name").get(pk=asset.pk)
+        partial.status = "active"
+        partial.save()
+        self._assert_in_sync()
+
+        tag.assets.remove(asset)
+        self._assert_in_sync()
+        tag.assets.add(asset, AssetFactory())
+        self._assert_in_sync()
+        tag.assets.clear()
+        self._assert_in_sync()
+
+        asset.tags.add(tag)
+        other_dept_category.department = DepartmentFactory(name="Lighting")
+        other_dept_category.save()
+        self._assert_in_sync()
+
+        asset.delete()
+        self._assert_in_sync()
+
+    def test_bulk_services(self, user, second_user, location, category):
+        from assets.services.bulk import (
+            bulk_checkin,
+            bulk_checkout,
+            bulk_edit,
+            bulk_status_change,
+            bulk_transfer,
+        )
+
+        assets = AssetFactory.create_batch(
+            4, category=category, current_location=location
+        )
+        ids = [a.pk for a in assets]
+        elsewhere = LocationFactory()
+
+        bulk_transfer(ids, elsewhere.pk, user)
+        self._assert_in_sync()
+        bulk_checkout(ids[:2], second_user.pk, user)
+        self._assert_in_sync()
+        bulk_checkin(ids[:2], location.pk, user)
+        self._assert_in_sync()
+        bulk_status_change(ids, "retired", user)
+        self._assert_in_sync()
+        bulk_edit(ids, location_id=elsewhere.pk)
+        self._assert_in_sync()
+
+    def test_reconcile_reports_and_fixes(self, asset):
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        from assets.models import AssetStatistic
+        from assets.services.statistics import reconcile_asset_statistics
+
+        row = (
+            "category",
+            asset.category_id,
+            asset.category.department_id,
+            "active",
+        )
+        AssetStatistic.objects.filter(
+            dimension="category", key=asset.category_id, status="active"
+        ).update(count=7)
+
+        assert reconcile_asset_statistics() == [(row, 7, 1)]
+        call_command("reconcile_statistics", "--fix", stdout=StringIO())
+        self._assert_in_sync()
+
+    def test_dashboard_reads_statistics(self, asset, department):
+        from assets.models import AssetStatistic
+        from assets.services.dashboard import compute_dashboard_aggregates
+
+        aggregates = compute_dashboard_aggregates()
+        assert aggregates["total_active"] == 1
+        scoped = compute_dashboard_aggregates([department.pk])
+        assert scoped["total_active"] == 1
+        assert scoped["cat_counts"][0]["asset_count"] == 1
+        assert compute_dashboard_aggregates([])["total_active"] == 0
+
+        # Counts come from the table, not from the asset rows
+        AssetStatistic.objects.filter(
+            dimension="category", key=asset.category_id, status="active"
+        ).update(count=40)
+        aggregates = compute_dashboard_aggregates()
+        assert aggregates["total_active"] == 40
+        assert aggregates["dept_counts"][0] == {
+            "name": department.name,
+            "asset_count": 40,
+        }
+
+
+@pytest.mark.django_db
+class TestTransactionCheckpoints:
+    """Ledger checkpoints folding settled checkout/checkin history."""
+
+    def _advance(self):
+        from datetime import timedelta
+
+        from assets.services.availability import advance_ledger_checkpoints
+
+        return advance_ledger_checkpoints(lag=timedelta(0))
+
+    def test_advance_folds_transactions(self, asset, user):
+        from assets.models import TransactionCheckpoint
+
+        asset.quantity = 5
+        asset.save()
+        Transaction.objects.create(
+            asset=asset, user=user, action="checkout", quantity=3
+        )
+        last = Transaction.objects.create(
+            asset=asset, user=user, action="checkin", quantity=1
+        )
+        assert self._advance() == last.pk
+
+        checkpoint = TransactionCheckpoint.objects.get(asset=asset)
+        assert checkpoint.serial_id is None
+        assert checkpoint.outstanding_quantity == 2
+        assert checkpoint.as_of_transaction_id == last.pk
+
+        # Second run only adds the newer transaction
+        newest = Transaction.objects.create(
+            asset=asset, user=user, action="checkout", quantity=1
+        )
+        assert self._advance() == newest.pk
+        checkpoint.refresh_from_db()
+        assert checkpoint.outstanding_quantity == 3
+
+    def test_advance_skips_recent_transactions(self, asset, user):
+        from assets.models import TransactionCheckpoint
+        from assets.services.availability import advance_ledger_checkpoints
+
+        Transaction.objects.create(asset=asset, user=user, action="checkout")
+        assert advance_ledger_checkpoints() == 0
+        assert not TransactionCheckpoint.objects.exists()
+
+    def test_watermark_advances_without_checkpoints(self, asset, user):
+        from assets.models import RollupWatermark, TransactionCheckpoint
+        from assets.services.availability import WATERMARK_NAME
+
+        audit = Transaction.objects.create(
+            asset=asset, user=user, action="audit"
+        )
+        assert self._advance() == audit.pk
+        assert not TransactionCheckpoint.objects.exists()
+        watermark = RollupWatermark.objects.get(name=WATERMARK_NAME)
+        assert watermark.as_of_transaction_id == audit.pk
+        # The next run starts after the watermark, not from scratch
+        assert self._advance() == audit.pk
+
+    def test_recompute_uses_checkpoint_plus_newer(self, asset, user):
+        from assets.models import TransactionCheckpoint
+        from assets.services.availability import (
+            reconcile_availability_counters,
+            refresh_availability_counters,
+        )
+
+        Transaction.objects.create(
+            asset=asset, user=user, action="checkout", quantity=2
+        )
+        self._advance()
+        Transaction.objects.create(asset=asset, user=user, action="checkin")
+        assert reconcile_availability_counters() == []
+
+        # Folded history is read from the checkpoint, not re-summed
+        TransactionCheckpoint.objects.filter(asset=asset).update(
+            outstanding_quantity=5
+        )
+        refresh_availability_counters([asset.pk])
+        asset.refresh_from_db()
+        assert asset.checked_out_quantity == 4
+
+    def test_merge_rebuilds_checkpoints(self, asset, user, category):
+        from assets.models import TransactionCheckpoint
+        from assets.services.availability import (
+            reconcile_availability_counters,
+        )
+        from assets.services.merge import merge_assets
+
+        duplicate = AssetFactory(
+            name="Duplicate", category=category, created_by=user
+        )
+        Transaction.objects.create(
+            asset=duplicate, user=user, action="checkout", quantity=2
+        )
+        self._advance()
+        # Returned after the watermark, so only the checkin is unfolded
+        Transaction.objects.create(
+            asset=duplicate, user=user, action="checkin", quantity=2
+        )
+
+        merge_assets(asset, [duplicate], user)
+
+        assert list(
+            TransactionCheckpoint.objects.values_list(
+                "asset_id", "outstanding_quantity"
+            )
+        ) == [(asset.pk, 2)]
+        assert reconcile_availability_counters() == []
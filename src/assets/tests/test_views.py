@@ -133,6 +133,87 @@ class TestAssetListView:
         )
         assert response.status_code == 200
 
+    def test_bulk_lists_not_rendered_into_page(
+        self, client_logged_in, asset, location
+    ):
+        response = client_logged_in.get(reverse("assets:asset_list"))
+        for key in ("categories", "locations", "active_users"):
+            assert key not in response.context
+        assert (
+            reverse("assets:asset_bulk_options", args=["borrowers"]).encode()
+            in response.content
+        )
+
+    def test_bulk_options(
+        self, client_logged_in, category, location, child_location, user
+    ):
+        def options(kind):
+            response = client_logged_in.get(
+                reverse("assets:asset_bulk_options", args=[kind])
+            )
+            assert response.status_code == 200
+            return response.content.decode()
+
+        locations = options("locations")
+        assert f'value="{child_location.pk}"' in locations
+        assert child_location.name in locations
+        assert f'value="{category.pk}"' in options("categories")
+        assert user.get_display_name() in options("borrowers")
+
+    def test_bulk_options_unknown_kind(self, client_logged_in):
+        response = client_logged_in.get(
+            reverse("assets:asset_bulk_options", args=["secrets"])
+        )
+        assert response.status_code == 404
+
+    def test_filter_dropdowns_show_facet_counts(self, client_logged_in, asset):
+        response = client_logged_in.get(reverse("assets:asset_list"))
+        category_facets = response.context["facets"]["category"]
+        assert category_facets == [
+            {
+                "value": str(asset.category.pk),
+                "label": asset.category.name,
+                "count": 1,
+            }
+        ]
+        assert f"{asset.category.name} (1)" in response.content.decode()
+
+    def test_repeat_search_served_from_result_cache(
+        self, client_logged_in, asset
+    ):
+        from assets.services.bulk import validate_filter_params
+        from assets.services.result_cache import result_cache_key
+
+        url = reverse("assets:asset_list") + "?q=" + asset.name
+        client_logged_in.get(url)
+        filters = validate_filter_params({"status": "active", "q": asset.name})
+        assert cache.get(result_cache_key(filters, "-updated_at")) == [
+            asset.pk
+        ]
+        response = client_logged_in.get(url)
+        assert list(response.context["page_obj"]) == [asset]
+
+    def test_cursor_applies_filters_on_cached_result(
+        self, client_logged_in, asset
+    ):
+        AssetFactory(
+            name="Other",
+            category=asset.category,
+            current_location=asset.current_location,
+        )
+        url = reverse("assets:asset_list") + "?q=" + asset.name
+        client_logged_in.get(url)
+        response = client_logged_in.get(url + "&cursor=")
+        page = response.context["page_obj"]
+        assert page.is_keyset
+        assert list(page) == [asset]
+
+    def test_htmx_skips_facets(self, client_logged_in, asset):
+        response = client_logged_in.get(
+            reverse("assets:asset_list"), HTTP_HX_REQUEST="true"
+        )
+        assert response.context["facets"] is None
+
 
 class TestAssetDetailView:
     def test_renders(self, client_logged_in, asset):
@@ -427,6 +508,47 @@ class TestTransactionListView:
         )
         assert response.status_code == 200
 
+    def test_defaults_to_keyset_pagination(self, client_logged_in, asset):
+        """Without ?page= the log is cursor-paginated."""
+        for _ in range(55):
+            Transaction.objects.create(
+                asset=asset, user=asset.created_by, action="audit"
+            )
+        url = reverse("assets:transaction_list")
+        response = client_logged_in.get(url)
+        page = response.context["page_obj"]
+        assert page.is_keyset
+        assert len(page) == 50
+        assert page.has_next
+        assert "cursor=" in response.content.decode()
+
+    def test_htmx_cursor_request_renders_rows(self, client_logged_in, asset):
+        """Infinite-scroll requests return only the next rows."""
+        for _ in range(55):
+            Transaction.objects.create(
+                asset=asset, user=asset.created_by, action="audit"
+            )
+        url = reverse("assets:transaction_list")
+        first = client_logged_in.get(url).context["page_obj"]
+        response = client_logged_in.get(
+            url, {"cursor": first.next_cursor}, HTTP_HX_REQUEST="true"
+        )
+        page = response.context["page_obj"]
+        assert len(page) == 5
+        assert not page.has_next
+        assert {t.pk for t in page}.isdisjoint({t.pk for t in first})
+        assert "<table" not in response.content.decode()
+
+    def test_page_number_still_supported(self, client_logged_in, asset):
+        """Existing ?page= links keep using offset pagination."""
+        Transaction.objects.create(
+            asset=asset, user=asset.created_by, action="audit"
+        )
+        response = client_logged_in.get(
+            reverse("assets:transaction_list"), {"page": 1}
+        )
+        assert response.context["page_obj"].number == 1
+
 
 class TestCRUDViews:
     """Test CRUD views for categories, locations, and tags."""
@@ -776,7 +898,7 @@ class TestDashboardBreakdowns:
     ):
         from django.core.cache import cache
 
-        cache.delete(f"dashboard_aggregates_{user.pk}")
+        cache.delete("dashboard_aggregates:global")
         asset.status = "active"
         asset.save()
         response = client_logged_in.get(reverse("assets:dashboard"))
@@ -789,7 +911,7 @@ class TestDashboardBreakdowns:
     ):
         from django.core.cache import cache
 
-        cache.delete(f"dashboard_aggregates_{user.pk}")
+        cache.delete("dashboard_aggregates:global")
         asset.status = "active"
         asset.save()
         response = client_logged_in.get(reverse("assets:dashboard"))
@@ -1537,7 +1659,7 @@ class TestExcludeDisposedFromExport:
         response = admin_client.get(reverse("assets:export_assets"))
         assert response.status_code == 200
         # The disposed asset should not appear in the exported data
-        assert b"Disposed Thing" not in response.content
+        assert b"Disposed Thing" not in response.getvalue()
 
     def test_export_with_include_disposed(
         self, admin_client, asset, category, location, user
@@ -5624,6 +5746,45 @@ class TestAssetSearchAutocomplete:
         assert desc_hit.pk in ids
         assert ids.index(cat_hit.pk) < ids.index(desc_hit.pk)
 
+    def test_autocomplete_mode_barcode_prefix(
+        self, client_logged_in, category, location, user
+    ):
+        """mode=autocomplete matches barcode-looking input by prefix."""
+        target = AssetFactory(
+            name="Stage Light Fresnel",
+            barcode="FRES-00017",
+            category=category,
+            current_location=location,
+            created_by=user,
+        )
+        url = reverse("assets:asset_search")
+        resp = client_logged_in.get(
+            url, {"q": "fres-000", "mode": "autocomplete"}
+        )
+        data = resp.json()
+        assert [r["id"] for r in data] == [target.pk]
+        assert data[0]["barcode"] == "FRES-00017"
+        assert "thumbnail_url" in data[0]
+
+    def test_autocomplete_mode_skips_category_match(
+        self, client_logged_in, location, user, department
+    ):
+        """mode=autocomplete searches name and barcode only."""
+        from assets.models import Category
+
+        cat = Category.objects.create(name="Furniture", department=department)
+        AssetFactory(
+            name="Oak Table",
+            category=cat,
+            current_location=location,
+            created_by=user,
+        )
+        url = reverse("assets:asset_search")
+        resp = client_logged_in.get(
+            url, {"q": "furniture", "mode": "autocomplete"}
+        )
+        assert resp.json() == []
+
 
 # ============================================================
 # Word-based search: multi-word queries match individual words
@@ -7489,6 +7650,81 @@ class TestAssetSearchBarcodeRelevance:
         assert ids.index(barcode_hit.pk) < ids.index(name_hit.pk)
 
 
+class TestApiAssetSearch:
+    """Projection-only JSON search API (v1)."""
+
+    def test_returns_all_fields_by_default(
+        self, client_logged_in, asset, location
+    ):
+        child = LocationFactory(name="Shelf A", parent=location)
+        asset.current_location = child
+        asset.save()
+        resp = client_logged_in.get(
+            reverse("assets:api_asset_search"), {"q": asset.name}
+        )
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["version"] == 1
+        row = data["results"][0]
+        assert row["id"] == asset.pk
+        assert row["location"] == child.full_path
+        assert row["category"] == asset.category.name
+        assert row["checked_out"] is False
+        assert row["thumbnail_url"] == ""
+
+    def test_field_selection(self, client_logged_in, asset):
+        resp = client_logged_in.get(
+            reverse("assets:api_asset_search"),
+            {"q": asset.name, "fields": "id,barcode"},
+        )
+        assert resp.json()["results"] == [
+            {"id": asset.pk, "barcode": asset.barcode}
+        ]
+
+    def test_unknown_field_rejected(self, client_logged_in, asset):
+        resp = client_logged_in.get(
+            reverse("assets:api_asset_search"),
+            {"q": asset.name, "fields": "id,password"},
+        )
+        assert resp.status_code == 400
+
+    def test_negative_limit_clamped(self, client_logged_in, asset):
+        resp = client_logged_in.get(
+            reverse("assets:api_asset_search"),
+            {"q": asset.name, "fields": "id", "limit": "-1"},
+        )
+        assert resp.status_code == 200
+        assert resp.json()["results"] == [{"id": asset.pk}]
+
+    def test_non_integer_limit_rejected(self, client_logged_in, asset):
+        resp = client_logged_in.get(
+            reverse("assets:api_asset_search"),
+            {"q": asset.name, "limit": "abc"},
+        )
+        assert resp.status_code == 400
+
+    def test_primary_image_thumbnail(self, client_logged_in, asset, user):
+        from assets.models import AssetImage
+
+        image = AssetImage.objects.create(
+            asset=asset,
+            image="assets/photo.jpg",
+            is_primary=True,
+            uploaded_by=user,
+        )
+        image.refresh_from_db()
+        resp = client_logged_in.get(
+            reverse("assets:api_asset_search"),
+            {"q": asset.name, "fields": "thumbnail_url"},
+        )
+        url = resp.json()["results"][0]["thumbnail_url"]
+        assert url == image.thumbnail_url
+
+    def test_requires_login(self, client, db):
+        resp = client.get(reverse("assets:api_asset_search"), {"q": "x"})
+        assert resp.status_code == 302
+
+
 # ============================================================
 # resolve_asset_from_input unit tests (issue #33)
 # ============================================================
@@ -7737,7 +7973,7 @@ class TestExportWithWordSearch:
 
         import openpyxl
 
-        wb = openpyxl.load_workbook(BytesIO(resp.content))
+        wb = openpyxl.load_workbook(BytesIO(resp.getvalue()))
         ws = wb["Assets"]
         # Collect asset names from the first data column (skip header)
         names = [
@@ -7764,7 +8000,7 @@ class TestExportWithWordSearch:
 
         import openpyxl
 
-        wb = openpyxl.load_workbook(BytesIO(resp.content))
+        wb = openpyxl.load_workbook(BytesIO(resp.getvalue()))
         ws = wb["Assets"]
         names = [
             row[0].value for row in ws.iter_rows(min_row=2) if row[0].value
@@ -7792,7 +8028,7 @@ class TestExportWithWordSearch:
 
         import openpyxl
 
-        wb = openpyxl.load_workbook(BytesIO(resp.content))
+        wb = openpyxl.load_workbook(BytesIO(resp.getvalue()))
         ws = wb["Assets"]
         names = [
             row[0].value for row in ws.iter_rows(min_row=2) if row[0].value
@@ -12,14 +12,50 @@ urlpatterns = [
     path("my-items/", views.my_borrowed_items, name="my_borrowed_items"),
     # Assets
     path("assets/", views.asset_list, name="asset_list"),
+    path(
+        "assets/bulk-options/<str:kind>/",
+        views.asset_bulk_options,
+        name="asset_bulk_options",
+    ),
     path("assets/create/", views.asset_create, name="asset_create"),
     path("assets/export/", views.export_assets, name="export_assets"),
+    path("assets/import/", views.asset_import, name="asset_import"),
+    path(
+        "imports/<uuid:job_id>/",
+        views.import_job_status,
+        name="import_job_status",
+    ),
+    path(
+        "imports/<uuid:job_id>/commit/",
+        views.import_job_commit,
+        name="import_job_commit",
+    ),
+    path(
+        "exports/data/<str:dataset>/",
+        views.export_data,
+        name="export_data",
+    ),
+    path(
+        "exports/<uuid:job_id>/",
+        views.export_job_status,
+        name="export_job_status",
+    ),
+    path(
+        "exports/<uuid:job_id>/download/",
+        views.export_job_download,
+        name="export_job_download",
+    ),
     path(
         "assets/lost-stolen/",
         views.lost_stolen_report,
         name="lost_stolen_report",
     ),
     path("assets/bulk/", views.bulk_actions, name="bulk_actions"),
+    path(
+        "assets/bulk/<uuid:job_id>/",
+        views.bulk_job_status,
+        name="bulk_job_status",
+    ),
     path(
         "assets/labels/all-filtered/",
         views.print_all_filtered_labels,
@@ -44,6 +80,11 @@ urlpatterns = [
     # Scanning
     path("scan/", views.scan_view, name="scan"),
     path("scan/lookup/", views.scan_lookup, name="scan_lookup"),
+    path(
+        "scan/lookup/batch/",
+        views.scan_lookup_batch,
+        name="scan_lookup_batch",
+    ),
     # Unified lookup
     path(
         "a/<str:identifier>/",
@@ -151,6 +192,11 @@ urlpatterns = [
     ),
     # Transactions
     path("transactions/", views.transaction_list, name="transaction_list"),
+    path(
+        "transactions/export/",
+        views.transaction_export,
+        name="transaction_export",
+    ),
     # Categories
     path("categories/", views.category_list, name="category_list"),
     path(
@@ -219,6 +265,21 @@ urlpatterns = [
         views.asset_search,
         name="asset_search",
     ),
+    path(
+        "api/v1/assets/search/",
+        views.api_asset_search,
+        name="api_asset_search",
+    ),
+    path(
+        "api/v1/reports/movements/",
+        views.api_movement_series,
+        name="api_movement_series",
+    ),
+    path(
+        "dashboard/movements/",
+        views.dashboard_movement_chart,
+        name="dashboard_movement_chart",
+    ),
     path(
         "tags/create-inline/",
         views.tag_create_inline,
@@ -1,5 +1,6 @@
 """Views for the assets app."""
 
+import datetime
 import json
 import logging
 import re
@@ -11,7 +12,6 @@ from django_ratelimit.decorators import ratelimit
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.core.cache import cache
 from django.core.exceptions import PermissionDenied, ValidationError
 from django.core.paginator import Paginator
 from django.db import transaction
@@ -27,12 +27,14 @@ from django.db.models import (
     Value,
     When,
 )
-from django.db.models.functions import Coalesce
 from django.http import (
+    FileResponse,
+    Http404,
     HttpResponse,
     HttpResponseForbidden,
     HttpResponseNotAllowed,
     JsonResponse,
+    StreamingHttpResponse,
 )
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
@@ -50,8 +52,11 @@ from .models import (
     AssetImage,
     AssetKit,
     AssetSerial,
+    BulkJob,
     Category,
     Department,
+    ExportJob,
+    ImportJob,
     Location,
     NFCTag,
     PrintClient,
@@ -62,6 +67,18 @@ from .models import (
     Transaction,
     VirtualBarcode,
 )
+from .services.bulk_jobs import start_bulk_job
+from .services.catalogue import bump_catalogue_version
+from .services.dashboard import get_dashboard_aggregates
+from .services.facets import FACET_DIMENSIONS, compute_asset_facets
+from .services.identifiers import (
+    lookup_identifier,
+    lookup_identifiers,
+    sync_asset_barcode,
+)
+from .services.locations import location_tree
+from .services.movement_rollups import GROUP_BY_CHOICES, movement_series
+from .services.pagination import paginate
 from .services.permissions import (
     can_checkout_asset,
     can_delete_asset,
@@ -69,7 +86,14 @@ from .services.permissions import (
     can_handover_asset,
     get_user_role,
 )
-from .services.search import build_asset_search
+from .services.result_cache import cached_asset_pks
+from .services.search import (
+    SEARCH_API_FIELDS,
+    build_asset_autocomplete,
+    build_asset_search,
+    project_asset_search,
+)
+from .services.statistics import tracking_asset_statistics
 
 BARCODE_PATTERN = re.compile(r"^[A-Z]+-[A-Z0-9]+$", re.IGNORECASE)
 
@@ -79,104 +103,6 @@ logger = logging.getLogger(__name__)
 # --- Dashboard ---
 
 
-DASHBOARD_CACHE_TTL = 60  # seconds
-
-
-def _compute_dashboard_aggregates(role, user_depts, dept_filter):
-    """Compute expensive aggregate counts for the dashboard."""
-    # Single query for all status counts (replaces 4 separate COUNTs)
-    status_counts = Asset.objects.filter(dept_filter).aggregate(
-        total_active=Coalesce(Count("pk", filter=Q(status="active")), 0),
-        total_draft=Coalesce(Count("pk", filter=Q(status="draft")), 0),
-        total_checked_out=Coalesce(
-            Count("pk", filter=Q(checked_out_to__isnull=False)), 0
-        ),
-        total_missing=Coalesce(Count("pk", filter=Q(status="missing")), 0),
-    )
-    total_active = status_counts["total_active"]
-    total_draft = status_counts["total_draft"]
-    total_checked_out = status_counts["total_checked_out"]
-    total_missing = status_counts["total_missing"]
-
-    # Per-department counts
-    dept_qs = Department.objects.filter(is_active=True)
-    if role == "department_manager":
-        dept_qs = dept_qs.filter(pk__in=user_depts)
-    dept_counts = list(
-        dept_qs.annotate(
-            asset_count=Count(
-                "categories__assets",
-                filter=Q(categories__assets__status="active"),
-            )
-        )
-        .order_by("-asset_count")
-        .values("name", "asset_count")[:10]
-    )
-
-    # Per-category counts
-    cat_qs = Category.objects.all()
-    if role == "department_manager":
-        cat_qs = cat_qs.filter(department__in=user_depts)
-    cat_counts = list(
-        cat_qs.annotate(
-            asset_count=Count("assets", filter=Q(assets__status="active"))
-        )
-        .order_by("-asset_count")
-        .values("name", "asset_count")[:10]
-    )
-
-    # Per-location counts
-    loc_qs = Location.objects.filter(is_active=True)
-    if role == "department_manager":
-        loc_qs = loc_qs.annotate(
-            asset_count=Count(
-                "assets",
-                filter=Q(assets__status="active")
-                & Q(assets__category__department__in=user_depts),
-            )
-        )
-    else:
-        loc_qs = loc_qs.annotate(
-            asset_count=Count(
-                "assets",
-                filter=Q(assets__status="active"),
-            )
-        )
-    loc_counts = list(
-        loc_qs.order_by("-asset_count").values("pk", "name", "asset_count")[
-            :10
-        ]
-    )
-    total_locations = Location.objects.filter(is_active=True).count()
-
-    # Top 10 tags
-    if role == "department_manager":
-        top_tags = list(
-            Tag.objects.filter(assets__category__department__in=user_depts)
-            .annotate(asset_count=Count("assets"))
-            .order_by("-asset_count")
-            .values("name", "asset_count")[:10]
-        )
-    else:
-        top_tags = list(
-            Tag.objects.annotate(asset_count=Count("assets"))
-            .order_by("-asset_count")
-            .values("name", "asset_count")[:10]
-        )
-
-    return {
-        "total_active": total_active,
-        "total_draft": total_draft,
-        "total_checked_out": total_checked_out,
-        "total_missing": total_missing,
-        "dept_counts": dept_counts,
-        "cat_counts": cat_counts,
-        "loc_counts": loc_counts,
-        "total_locations": total_locations,
-        "top_tags": top_tags,
-    }
-
-
 @login_required
 def dashboard(request):
     """Display the dashboard with summary metrics."""
@@ -187,18 +113,14 @@ def dashboard(request):
     if role == "department_manager":
         user_depts = Department.objects.filter(managers=request.user)
         dept_filter = Q(category__department__in=user_depts)
+        dept_ids = list(user_depts.values_list("pk", flat=True))
     else:
         user_depts = None
         dept_filter = Q()  # No filter for admin/member/viewer
+        dept_ids = None
 
-    # Cached aggregate counts (60-second TTL)
-    cache_key = f"dashboard_aggregates_{request.user.pk}"
-    aggregates = cache.get(cache_key)
-    if aggregates is None:
-        aggregates = _compute_dashboard_aggregates(
-            role, user_depts, dept_filter
-        )
-        cache.set(cache_key, aggregates, DASHBOARD_CACHE_TTL)
+    # Aggregate counts, shared by every user with the same scope
+    aggregates = get_dashboard_aggregates(dept_ids)
 
     # Real-time data: recent transactions, drafts, checked-out
     recent_transactions = Transaction.objects.select_related(
@@ -216,7 +138,9 @@ def dashboard(request):
         .prefetch_related(
             Prefetch(
                 "images",
-                queryset=AssetImage.objects.filter(is_primary=True),
+                queryset=AssetImage.objects.filter(
+                    is_primary=True
+                ).prefetch_related("renditions"),
                 to_attr="primary_images",
             )
         )
@@ -308,50 +232,23 @@ def my_borrowed_items(request):
 @login_required
 def asset_list(request):
     """List assets with filtering and search."""
-    queryset = Asset.objects.with_related()
+    from .services.bulk import (
+        build_asset_filter_queryset,
+        validate_filter_params,
+    )
 
     # Default to active assets only
     status = request.GET.get("status", "active")
-    if status:
-        queryset = queryset.filter(status=status)
-
-    # Text search
     q = request.GET.get("q", "").strip()[:200]
-    if q:
-
-        queryset = build_asset_search(
-            queryset, q, include_nfc=True, include_category=True
-        )
-
-    # Filters
-    department = request.GET.get("department")
-    if department:
-        queryset = queryset.filter(category__department_id=department)
-
-    category = request.GET.get("category")
-    if category:
-        queryset = queryset.filter(category_id=category)
-
-    location = request.GET.get("location")
-    if location:
-        if location == "checked_out":
-            queryset = queryset.filter(checked_out_to__isnull=False)
-        else:
-            queryset = queryset.filter(current_location_id=location)
-
-    tag = request.GET.get("tag")
-    if tag:
-        queryset = queryset.filter(tags__id=tag)
-
-    condition = request.GET.get("condition")
-    if condition:
-        queryset = queryset.filter(condition=condition)
-
     is_kit_filter = request.GET.get("is_kit", "")
-    if is_kit_filter == "1":
-        queryset = queryset.filter(is_kit=True)
-    elif is_kit_filter == "0":
-        queryset = queryset.filter(is_kit=False)
+    filters = validate_filter_params(
+        {
+            **{k: request.GET.get(k, "") for k in FACET_DIMENSIONS},
+            "status": status,
+            "q": q,
+            "is_kit": is_kit_filter,
+        }
+    )
 
     # Sorting
     SORT_FIELDS = {
@@ -372,7 +269,13 @@ def asset_list(request):
     }
     sort = request.GET.get("sort", "-updated")
     order_by = SORT_FIELDS.get(sort, "-updated_at")
-    queryset = queryset.order_by(order_by)
+    queryset = Asset.objects.with_related()
+    pks = cached_asset_pks(filters, order_by)
+    # Cursors page over the queryset itself, not the pk list
+    if pks is None or "cursor" in request.GET:
+        queryset = build_asset_filter_queryset(filters, queryset).order_by(
+            order_by
+        )
 
     # Pagination
     try:
@@ -381,22 +284,15 @@ def asset_list(request):
         page_size = 25
     if page_size not in (25, 50, 100):
         page_size = 25
-    paginator = Paginator(queryset, page_size)
-    page_number = request.GET.get("page", 1)
-    page_obj = paginator.get_page(page_number)
+    page_obj = paginate(
+        request, queryset, page_size, ordering=[order_by], pks=pks
+    )
 
     # View mode (list/grid)
     view_mode = request.GET.get(
         "view", request.COOKIES.get("view_mode", "list")
     )
 
-    from django.contrib.auth import get_user_model
-
-    UserModel = get_user_model()
-    active_users = UserModel.objects.filter(is_active=True).order_by(
-        "username"
-    )
-
     # Connected remote printers for bulk remote print
     connected_clients = PrintClient.objects.filter(
         status="approved",
@@ -428,20 +324,19 @@ def asset_list(request):
     if default_printer is None and connected_printers:
         default_printer = connected_printers[0]
 
+    # Filter dropdown counts; the HTMX results partial doesn't show them
+    facets = None
+    if not request.htmx:
+        facets = compute_asset_facets(filters)
+
     context = {
         "page_obj": page_obj,
         "q": q,
         "current_status": status,
         "view_mode": view_mode,
-        "departments": Department.objects.filter(is_active=True),
-        "categories": Category.objects.all(),
-        "locations": Location.objects.filter(is_active=True),
-        "tags": Tag.objects.all(),
-        "conditions": Asset.CONDITION_CHOICES,
-        "statuses": Asset.STATUS_CHOICES,
+        "facets": facets,
         "page_size": page_size,
         "current_sort": sort,
-        "active_users": active_users,
         "remote_print_available": remote_print_available,
         "connected_printers": connected_printers,
         "default_printer": default_printer,
@@ -458,6 +353,44 @@ def asset_list(request):
     return response
 
 
+@login_required
+def asset_bulk_options(request, kind):
+    """Return ``<option>`` elements for one of the bulk action selects.
+
+    The asset list loads these the first time the matching action is
+    chosen, rather than rendering every category, location and user
+    into each page.
+    """
+    from django.contrib.auth import get_user_model
+
+    if kind == "locations":
+        options = [
+            (loc.pk, str(loc))
+            for loc in Location.objects.filter(is_active=True)
+        ]
+    elif kind == "categories":
+        options = Category.objects.values_list("pk", "name")
+    elif kind == "borrowers":
+        options = [
+            (
+                u.pk,
+                (
+                    f"{u.get_display_name()} ({u.organisation})"
+                    if u.organisation
+                    else u.get_display_name()
+                ),
+            )
+            for u in get_user_model()
+            .objects.filter(is_active=True)
+            .order_by("username")
+        ]
+    else:
+        raise Http404("Unknown option list")
+    return render(
+        request, "assets/partials/bulk_options.html", {"options": options}
+    )
+
+
 # --- Asset Detail ---
 
 
@@ -474,7 +407,7 @@ def asset_detail(request, pk):
         "created_by",
     ).prefetch_related(
         "tags",
-        "images",
+        "images__renditions",
         "nfc_tags",
         Prefetch(
             "transactions",
@@ -683,8 +616,6 @@ def asset_edit(request, pk):
             images = request.FILES.getlist("images")
             captions = request.POST.getlist("image_captions")
             for i, img_file in enumerate(images):
-                # Convert all images to JPEG for storage (§S2.2.5-05a)
-                img_file = _convert_to_jpeg(img_file)
                 caption = captions[i] if i < len(captions) else ""
                 is_primary = not asset.images.exists() and i == 0
                 AssetImage.objects.create(
@@ -851,20 +782,17 @@ def quick_capture(request):
 
                 ai_enabled = is_ai_analysis_enabled()
                 for idx, img_file in enumerate(images):
-                    # Convert all images to JPEG for storage (§S2.2.5-05a)
-                    img_file = _convert_to_jpeg(img_file)
-                    img_obj = AssetImage.objects.create(
+                    # Stored as uploaded; the image pipeline converts it
+                    # and queues AI analysis for pending images
+                    AssetImage.objects.create(
                         asset=asset,
                         image=img_file,
                         is_primary=(idx == 0),
                         uploaded_by=request.user,
+                        ai_processing_status=(
+                            "pending" if ai_enabled else "skipped"
+                        ),
                     )
-                    if ai_enabled:
-                        img_obj.ai_processing_status = "pending"
-                        img_obj.save(update_fields=["ai_processing_status"])
-                        from .tasks import analyse_image
-
-                        analyse_image.delay(img_obj.pk)
 
             # Return success with capture-another option
             success_context = {
@@ -923,13 +851,20 @@ def drafts_queue(request):
     queryset = (
         Asset.objects.filter(status="draft")
         .select_related("category", "created_by")
-        .prefetch_related("images")
+        .prefetch_related(
+            "images",
+            Prefetch(
+                "images",
+                queryset=AssetImage.objects.filter(
+                    is_primary=True
+                ).prefetch_related("renditions"),
+                to_attr="primary_images",
+            ),
+        )
         .order_by("-created_at")
     )
 
-    paginator = Paginator(queryset, 25)
-    page_number = request.GET.get("page", 1)
-    page_obj = paginator.get_page(page_number)
+    page_obj = paginate(request, queryset, 25, ordering=["-created_at"])
 
     # Connected remote printers for bulk remote print
     connected_clients = PrintClient.objects.filter(
@@ -993,11 +928,13 @@ def drafts_bulk_action(request):
             location_id = request.POST.get("location")
             if category_id and location_id:
                 count = drafts.count()
-                drafts.update(
-                    status="active",
-                    category_id=category_id,
-                    current_location_id=location_id,
-                )
+                with tracking_asset_statistics(drafts):
+                    drafts.update(
+                        status="active",
+                        category_id=category_id,
+                        current_location_id=location_id,
+                    )
+                bump_catalogue_version()
                 messages.success(
                     request,
                     f"{count} draft(s) activated.",
@@ -1013,7 +950,9 @@ def drafts_bulk_action(request):
                 messages.success(request, f"{activated} draft(s) activated.")
         elif action == "delete":
             count = drafts.count()
-            drafts.update(status="disposed")
+            with tracking_asset_statistics(drafts):
+                drafts.update(status="disposed")
+            bump_catalogue_version()
             messages.success(request, f"{count} draft(s) disposed.")
         elif action == "remote_print":
             remote_printer = request.POST.get("remote_printer", "")
@@ -1122,248 +1061,170 @@ def scan_view(request):
     return render(request, "assets/scan.html")
 
 
-@login_required
-@ratelimit(key="user", rate="60/m", method="GET", block=True)
-def scan_lookup(request):
-    """Look up an asset by scanned code. Returns JSON."""
-    code = request.GET.get("code", "").strip()
-    if not code:
-        return JsonResponse({"found": False, "code": "", "error": "No code"})
-
-    # 1. Check barcode
-    try:
-        asset = Asset.objects.get(barcode=code)
-        return JsonResponse(
-            {
-                "found": True,
-                "asset_id": asset.pk,
-                "asset_name": asset.name,
-                "barcode": asset.barcode,
-                "location": (
-                    str(asset.current_location)
-                    if asset.current_location
-                    else None
-                ),
-                "url": asset.get_absolute_url(),
-                "is_draft": asset.status == "draft",
-            }
-        )
-    except Asset.DoesNotExist:
-        pass
-
-    # 2. Check serial barcode
-    try:
-        serial = AssetSerial.objects.select_related("asset").get(
-            barcode__iexact=code
-        )
-        parent = serial.asset
-        url = f"{parent.get_absolute_url()}?serial={serial.pk}"
-        # S7.19.3: Show disposed message for disposed serials
-        response_data = {
+def _scan_result(identifier):
+    """Build the scan_lookup JSON payload for a registry match."""
+    parent = identifier.asset
+    if identifier.kind in ("barcode", "nfc"):
+        return {
             "found": True,
             "asset_id": parent.pk,
             "asset_name": parent.name,
             "barcode": parent.barcode,
-            "serial_id": serial.pk,
-            "serial_number": serial.serial_number,
             "location": (
-                str(serial.current_location or parent.current_location)
-                if (serial.current_location or parent.current_location)
+                str(parent.current_location)
+                if parent.current_location
                 else None
             ),
-            "url": url,
+            "url": parent.get_absolute_url(),
             "is_draft": parent.status == "draft",
         }
-        if serial.status == "disposed":
-            response_data["status"] = "disposed"
-            response_data["message"] = (
-                f"This serial ({serial.serial_number}) of "
-                f"{parent.name} has been disposed."
-            )
-        return JsonResponse(response_data)
-    except AssetSerial.DoesNotExist:
-        pass
 
-    # 2b. S7.19.3: Check disposed serial via transaction history
-    # (barcode is cleared on disposal but stored in transactions)
-    disposed_txn = (
-        Transaction.objects.filter(
-            serial_barcode__iexact=code,
-            serial__status="disposed",
-        )
-        .select_related("asset", "serial")
-        .first()
+    serial = identifier.serial
+    url = f"{parent.get_absolute_url()}?serial={serial.pk}"
+    disposed_message = (
+        f"This serial ({serial.serial_number}) of "
+        f"{parent.name} has been disposed."
     )
-    if disposed_txn and disposed_txn.serial:
-        serial = disposed_txn.serial
-        parent = disposed_txn.asset
-        url = f"{parent.get_absolute_url()}?serial={serial.pk}"
-        return JsonResponse(
-            {
-                "found": True,
-                "asset_id": parent.pk,
-                "asset_name": parent.name,
-                "barcode": parent.barcode,
-                "serial_id": serial.pk,
-                "serial_number": serial.serial_number,
-                "status": "disposed",
-                "message": (
-                    f"This serial ({serial.serial_number}) of "
-                    f"{parent.name} has been disposed."
-                ),
-                "url": url,
-            }
-        )
+    # S7.19.3: Disposed serial found via its retired barcode
+    if identifier.kind == "retired_serial":
+        return {
+            "found": True,
+            "asset_id": parent.pk,
+            "asset_name": parent.name,
+            "barcode": parent.barcode,
+            "serial_id": serial.pk,
+            "serial_number": serial.serial_number,
+            "status": "disposed",
+            "message": disposed_message,
+            "url": url,
+        }
 
-    # 3. Check active NFC tag
-    nfc_asset = NFCTag.get_asset_by_tag(code)
-    if nfc_asset:
-        return JsonResponse(
-            {
-                "found": True,
-                "asset_id": nfc_asset.pk,
-                "asset_name": nfc_asset.name,
-                "barcode": nfc_asset.barcode,
-                "location": (
-                    str(nfc_asset.current_location)
-                    if nfc_asset.current_location
-                    else None
-                ),
-                "url": nfc_asset.get_absolute_url(),
-                "is_draft": nfc_asset.status == "draft",
-            }
-        )
+    location = serial.current_location or parent.current_location
+    data = {
+        "found": True,
+        "asset_id": parent.pk,
+        "asset_name": parent.name,
+        "barcode": parent.barcode,
+        "serial_id": serial.pk,
+        "serial_number": serial.serial_number,
+        "location": str(location) if location else None,
+        "url": url,
+        "is_draft": parent.status == "draft",
+    }
+    # S7.19.3: Show disposed message for disposed serials
+    if serial.status == "disposed":
+        data["status"] = "disposed"
+        data["message"] = disposed_message
+    return data
 
-    # 4. Not found - redirect to quick capture
+
+def _scan_not_found(code):
+    """Build the scan_lookup JSON payload for an unknown code."""
     from django.urls import reverse
 
-    return JsonResponse(
-        {
-            "found": False,
-            "code": code,
-            "quick_capture_url": (
-                f"{reverse('assets:quick_capture')}?code={code}"
-            ),
-        }
-    )
+    return {
+        "found": False,
+        "code": code,
+        "quick_capture_url": (
+            f"{reverse('assets:quick_capture')}?code={code}"
+        ),
+    }
 
 
 @login_required
 @ratelimit(key="user", rate="60/m", method="GET", block=True)
-def asset_by_identifier(request, identifier):
-    """Unified lookup endpoint: /a/{identifier}/."""
-    # 1. Barcode match
-    try:
-        asset = Asset.objects.get(barcode=identifier)
-        return redirect("assets:asset_detail", pk=asset.pk)
-    except Asset.DoesNotExist:
-        pass
-
-    # 2. Serial barcode match
-    try:
-        serial = AssetSerial.objects.select_related("asset").get(
-            barcode__iexact=identifier
-        )
-        parent = serial.asset
-        # S7.19.3: Show disposed message for disposed serials
-        if serial.status == "disposed":
-            messages.warning(
-                request,
-                f"This serial ({serial.serial_number}) of "
-                f"{parent.name} has been disposed.",
-            )
-        return redirect(f"{parent.get_absolute_url()}?serial={serial.pk}")
-    except AssetSerial.DoesNotExist:
-        pass
-
-    # 2b. S7.19.3: Check disposed serial via transaction history
-    disposed_txn = (
-        Transaction.objects.filter(
-            serial_barcode__iexact=identifier,
-            serial__status="disposed",
-        )
-        .select_related("asset", "serial")
-        .first()
-    )
-    if disposed_txn and disposed_txn.serial:
-        serial = disposed_txn.serial
-        parent = disposed_txn.asset
-        messages.warning(
-            request,
-            f"This serial ({serial.serial_number}) of "
-            f"{parent.name} has been disposed.",
-        )
-        return redirect(f"{parent.get_absolute_url()}?serial={serial.pk}")
-
-    # 3. Active NFC tag match
-    nfc_asset = NFCTag.get_asset_by_tag(identifier)
-    if nfc_asset:
-        return redirect("assets:asset_detail", pk=nfc_asset.pk)
-
-    # 4. Not found - redirect to Quick Capture
-    from django.urls import reverse
+def scan_lookup(request):
+    """Look up an asset by scanned code. Returns JSON.
 
-    return redirect(f"{reverse('assets:quick_capture')}?code={identifier}")
+    Resolves asset barcodes, serial barcodes, disposed serials'
+    retired barcodes and active NFC tags with a single registry
+    lookup; unknown codes link to Quick Capture.
+    """
+    code = request.GET.get("code", "").strip()
+    if not code:
+        return JsonResponse({"found": False, "code": "", "error": "No code"})
 
+    identifier = lookup_identifier(code)
+    if identifier is None:
+        return JsonResponse(_scan_not_found(code))
+    return JsonResponse(_scan_result(identifier))
 
-# --- Image Management ---
 
+MAX_BATCH_SCAN_CODES = 500
 
-def _convert_to_jpeg(uploaded_file):
-    """Convert any supported image to JPEG (§S2.2.5-05a).
 
-    Handles JPEG, PNG, WebP, HEIC/HEIF, and MPO inputs.
-    Preserves EXIF orientation data, converts to RGB, and saves
-    at quality 85. Returns an InMemoryUploadedFile with .jpg
-    extension and image/jpeg content type.
+@login_required
+@ratelimit(key="user", rate="60/m", method="POST", block=True)
+def scan_lookup_batch(request):
+    """Resolve a batch of scanned codes in one request. Returns JSON.
+
+    Expects a JSON body ``{"codes": [...]}`` of up to
+    ``MAX_BATCH_SCAN_CODES`` codes and returns ``{"results": {code:
+    result}}`` where each result has the same shape as
+    ``scan_lookup``. All codes are resolved with one registry query.
     """
-    from io import BytesIO
+    if request.method != "POST":
+        return JsonResponse({"error": "POST required"}, status=405)
+    try:
+        data = json.loads(request.body)
+    except (json.JSONDecodeError, ValueError):
+        return JsonResponse({"error": "Invalid JSON"}, status=400)
+    codes = data.get("codes") if isinstance(data, dict) else None
+    if not isinstance(codes, list) or not all(
+        isinstance(c, str) for c in codes
+    ):
+        return JsonResponse(
+            {"error": "codes must be a list of strings"}, status=400
+        )
+    if len(codes) > MAX_BATCH_SCAN_CODES:
+        return JsonResponse(
+            {"error": f"At most {MAX_BATCH_SCAN_CODES} codes per request"},
+            status=400,
+        )
 
-    from pi_heif import register_heif_opener
-    from PIL import Image as PILImage
-    from PIL import ImageOps
+    matches = lookup_identifiers(codes)
+    results = {}
+    for code in codes:
+        code = code.strip()
+        if not code or code in results:
+            continue
+        identifier = matches[code]
+        results[code] = (
+            _scan_result(identifier)
+            if identifier is not None
+            else _scan_not_found(code)
+        )
+    return JsonResponse({"results": results})
 
-    from django.core.files.uploadedfile import InMemoryUploadedFile
 
-    register_heif_opener()
+@login_required
+@ratelimit(key="user", rate="60/m", method="GET", block=True)
+def asset_by_identifier(request, identifier):
+    """Unified lookup endpoint: /a/{identifier}/."""
+    match = lookup_identifier(identifier)
 
-    img = PILImage.open(uploaded_file)
+    # Not found - redirect to Quick Capture
+    if match is None:
+        from django.urls import reverse
 
-    # Apply EXIF orientation before any conversion
-    img = ImageOps.exif_transpose(img)
+        return redirect(f"{reverse('assets:quick_capture')}?code={identifier}")
 
-    # Preserve EXIF data if available
-    exif_data = img.info.get("exif")
+    parent = match.asset
+    if match.kind in ("barcode", "nfc"):
+        return redirect("assets:asset_detail", pk=parent.pk)
 
-    # Convert to RGB (drops alpha channel from PNG/WebP)
-    img = img.convert("RGB")
+    serial = match.serial
+    # S7.19.3: Show disposed message for disposed serials
+    if match.is_disposed or serial.status == "disposed":
+        messages.warning(
+            request,
+            f"This serial ({serial.serial_number}) of "
+            f"{parent.name} has been disposed.",
+        )
+    return redirect(f"{parent.get_absolute_url()}?serial={serial.pk}")
 
-    buf = BytesIO()
-    save_kwargs = {"format": "JPEG", "quality": 85}
-    if exif_data:
-        save_kwargs["exif"] = exif_data
-    img.save(buf, **save_kwargs)
-    buf.seek(0)
 
-    # Always use .jpg extension
-    name = uploaded_file.name
-    if "." in name:
-        name = name.rsplit(".", 1)[0] + ".jpg"
-    else:
-        name = name + ".jpg"
-
-    return InMemoryUploadedFile(
-        file=buf,
-        field_name=(
-            uploaded_file.field_name
-            if hasattr(uploaded_file, "field_name")
-            else "image"
-        ),
-        name=name,
-        content_type="image/jpeg",
-        size=buf.getbuffer().nbytes,
-        charset=None,
-    )
+# --- Image Management ---
 
 
 @login_required
@@ -1407,23 +1268,17 @@ def image_upload(request, pk):
                     ),
                 )
                 return redirect("assets:asset_detail", pk=pk)
-            # Convert all images to JPEG for storage (§S2.2.5-05a)
-            uploaded_file = _convert_to_jpeg(uploaded_file)
-            form.files["image"] = uploaded_file
             try:
                 image = form.save(commit=False)
                 image.asset = asset
                 image.uploaded_by = request.user
-                image.save()
-                # Trigger AI analysis if enabled
+                # AI analysis is queued by the image pipeline once the
+                # renditions exist (services/images.py)
                 from props.context_processors import is_ai_analysis_enabled
 
                 if is_ai_analysis_enabled():
                     image.ai_processing_status = "pending"
-                    image.save(update_fields=["ai_processing_status"])
-                    from .tasks import analyse_image
-
-                    analyse_image.delay(image.pk)
+                image.save()
                 messages.success(request, "Image uploaded.")
             except OSError:
                 messages.error(
@@ -2159,6 +2014,8 @@ def asset_relocate(request, pk):
 @login_required
 def transaction_list(request):
     """Global transaction list."""
+    from urllib.parse import urlencode
+
     from django.contrib.auth import get_user_model
 
     User = get_user_model()
@@ -2192,13 +2049,24 @@ def transaction_list(request):
         pk__in=transaction_user_ids
     ).order_by("username")
 
-    paginator = Paginator(queryset, 50)
-    page_number = request.GET.get("page", 1)
-    page_obj = paginator.get_page(page_number)
+    # Keyset (infinite scroll) by default: the table grows without
+    # bound and OFFSET makes deep pages progressively slower
+    page_obj = paginate(
+        request,
+        queryset,
+        50,
+        ordering=["-timestamp"],
+        estimate=not (action or user_id or date_from or date_to),
+        keyset=True,
+    )
+
+    template_name = "assets/transaction_list.html"
+    if getattr(request, "htmx", False) and "cursor" in request.GET:
+        template_name = "assets/partials/transaction_rows.html"
 
     return render(
         request,
-        "assets/transaction_list.html",
+        template_name,
         {
             "page_obj": page_obj,
             "actions": Transaction.ACTION_CHOICES,
@@ -2207,10 +2075,61 @@ def transaction_list(request):
             "current_user_id": user_id,
             "date_from": date_from or "",
             "date_to": date_to or "",
+            "can_export": _can_export(request.user),
+            "export_query": urlencode(
+                {
+                    k: v
+                    for k, v in (
+                        ("action", action),
+                        ("user", user_id),
+                        ("date_from", date_from),
+                        ("date_to", date_to),
+                    )
+                    if v
+                }
+            ),
         },
     )
 
 
+@login_required
+def transaction_export(request):
+    """Stream Transaction history as CSV or NDJSON for auditors.
+
+    Filters: ``date_from``/``date_to`` (inclusive), ``action``,
+    ``user``, ``department`` and ``location``. ``after`` resumes an
+    interrupted export after the given transaction id.
+    """
+    if not _can_export(request.user):
+        return HttpResponseForbidden("Permission denied")
+    from .services.audit_export import audit_queryset, validate_audit_params
+    from .services.tabular_export import (
+        EXPORT_FORMATS,
+        stream_csv,
+        stream_ndjson,
+    )
+
+    fmt = request.GET.get("format", "csv")
+    if fmt not in ("csv", "ndjson"):
+        return HttpResponse("Unsupported format", status=400)
+    try:
+        filters = validate_audit_params(request.GET.dict())
+        after = request.GET.get("after")
+        after = int(after) if after else None
+        rows = audit_queryset(filters, after=after)
+    except ValueError as exc:
+        return HttpResponse(str(exc), status=400)
+
+    stream = stream_csv if fmt == "csv" else stream_ndjson
+    response = StreamingHttpResponse(
+        stream("transactions", rows),
+        content_type=EXPORT_FORMATS[fmt],
+    )
+    filename = f"props-transactions-{timezone.localdate().isoformat()}.{fmt}"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
 # --- Categories, Locations, Tags CRUD ---
 
 
@@ -2288,24 +2207,13 @@ def location_list(request):
         ).distinct()
 
     if view_mode == "tree":
-        sorted_children = Location.objects.filter(is_active=True).order_by(
-            sort_field
-        )
-        locations = (
-            base_qs.filter(parent__isnull=True)
-            .order_by(sort_field)
-            .prefetch_related(
-                Prefetch(
-                    "children",
-                    queryset=sorted_children.prefetch_related(
-                        Prefetch(
-                            "children",
-                            queryset=sorted_children,
-                        )
-                    ),
-                )
-            )
+        # Cached tree; counts roll up each location's whole subtree
+        locations = location_tree(
+            sort_field,
+            int(department_filter) if department_filter.isdigit() else None,
         )
+        if q:
+            locations = [node for node in locations if node.matches(q)]
         context = {
             "locations": locations,
             "view_mode": view_mode,
@@ -2349,13 +2257,16 @@ def location_list(request):
 def location_detail(request, pk):
     """Display location detail with tabbed asset sections."""
     location = get_object_or_404(Location, pk=pk)
-    descendant_ids = [loc.pk for loc in location.get_descendants()]
-    all_location_ids = [location.pk] + descendant_ids
+    all_location_ids = list(
+        Location.objects.subtree(location).values_list("pk", flat=True)
+    )
 
     # Prefetch primary image to avoid N+1 queries
     primary_image_prefetch = Prefetch(
         "images",
-        queryset=AssetImage.objects.filter(is_primary=True),
+        queryset=AssetImage.objects.filter(is_primary=True).prefetch_related(
+            "renditions"
+        ),
         to_attr="primary_images",
     )
 
@@ -2445,9 +2356,7 @@ def location_detail(request, pk):
     active_qs = active_qs.order_by(order_by)
 
     # Pagination
-    paginator = Paginator(active_qs, 25)
-    page_number = request.GET.get("page", 1)
-    page_obj = paginator.get_page(page_number)
+    page_obj = paginate(request, active_qs, 25, ordering=[order_by])
 
     # Summary stats (across all active assets at this location)
     all_assets_qs = Asset.objects.filter(
@@ -2762,6 +2671,8 @@ def clear_barcode(request, pk):
         # Use queryset.update() to bypass save() override which
         # auto-regenerates blank barcodes
         Asset.objects.filter(pk=pk).update(barcode="", barcode_image="")
+        asset.barcode = ""
+        sync_asset_barcode(asset)
         Transaction.objects.create(
             asset=asset,
             user=request.user,
@@ -3100,10 +3011,9 @@ def location_deactivate(request, pk):
     location = get_object_or_404(Location, pk=pk)
     if request.method == "POST":
         # Check if any active assets at this location or its descendants
-        descendant_locations = location.get_descendants()
-        all_location_ids = [location.pk] + [
-            loc.pk for loc in descendant_locations
-        ]
+        all_location_ids = list(
+            Location.objects.subtree(location).values_list("pk", flat=True)
+        )
         asset_count = Asset.objects.filter(
             current_location_id__in=all_location_ids, status="active"
         ).count()
@@ -3158,8 +3068,9 @@ def location_checkout(request, pk):
         return redirect("assets:location_detail", pk=pk)
 
     # Gather assets at this location and descendants
-    descendant_ids = [loc.pk for loc in location.get_descendants()]
-    all_location_ids = [location.pk] + descendant_ids
+    all_location_ids = list(
+        Location.objects.subtree(location).values_list("pk", flat=True)
+    )
 
     # Fetch all assets once with annotations to avoid N+1 queries
     # on is_checked_out (serialised/non-serialised).
@@ -3296,8 +3207,9 @@ def location_checkin(request, pk):
     # Assets whose home_location is at this location tree and are
     # currently checked out — use with_related() annotations to
     # avoid N+1 on is_checked_out.
-    descendant_ids = [loc.pk for loc in location.get_descendants()]
-    all_location_ids = [location.pk] + descendant_ids
+    all_location_ids = list(
+        Location.objects.subtree(location).values_list("pk", flat=True)
+    )
 
     all_home_assets = list(
         Asset.objects.with_related()
@@ -3541,6 +3453,46 @@ def location_search(request):
     return JsonResponse(results, safe=False)
 
 
+def _search_limit(request, default=20, maximum=50):
+    """Parse ``limit`` from the query string, clamped to 1..maximum.
+
+    Raises:
+        ValueError: ``limit`` is not an integer.
+    """
+    try:
+        limit = int(request.GET.get("limit", default))
+    except ValueError:
+        raise ValueError("limit must be an integer") from None
+    return max(1, min(limit, maximum))
+
+
+def _ranked_asset_search(q, mode=None):
+    """Active assets matching ``q``, ordered as ``asset_search`` lists them."""
+    base_qs = Asset.objects.filter(status="active")
+    if mode == "autocomplete":
+        return build_asset_autocomplete(base_qs, q)
+    return (
+        build_asset_search(
+            base_qs, q, include_nfc=False, include_category=True
+        )
+        .annotate(
+            relevance=Case(
+                When(barcode__iexact=q, then=Value(1)),
+                When(barcode__icontains=q, then=Value(2)),
+                When(name__istartswith=q, then=Value(3)),
+                When(name__icontains=q, then=Value(4)),
+                When(
+                    category__name__icontains=q,
+                    then=Value(5),
+                ),
+                default=Value(6),
+                output_field=IntegerField(),
+            )
+        )
+        .order_by("relevance", "name")
+    )
+
+
 @login_required
 def asset_search(request):
     """Search assets by name, barcode, description, tag, or category.
@@ -3553,63 +3505,193 @@ def asset_search(request):
       5. Category name match
       6. Description / tag match
 
-    This will be replaced by a composite FTS index in future.
+    With ``mode=autocomplete`` only name and barcode are searched,
+    using the trigram-indexed typeahead path (barcode prefix match
+    for barcode-looking input, similarity ranking otherwise).
     """
     q = request.GET.get("q", "").strip()[:200]
     if len(q) < 1:
         return JsonResponse([], safe=False)
 
     try:
-        limit = min(int(request.GET.get("limit", 20)), 50)
-    except (ValueError, TypeError):
+        limit = _search_limit(request)
+    except ValueError:
         limit = 20
-
-    base_qs = Asset.objects.filter(status="active")
-    filtered_qs = build_asset_search(
-        base_qs, q, include_nfc=False, include_category=True
+    results = project_asset_search(
+        _ranked_asset_search(q, request.GET.get("mode")),
+        ("id", "name", "barcode", "category", "location", "thumbnail_url"),
+        limit,
     )
+    return JsonResponse(results, safe=False)
 
-    primary_image_prefetch = Prefetch(
-        "images",
-        queryset=AssetImage.objects.filter(is_primary=True),
-        to_attr="primary_images",
-    )
-    qs = (
-        filtered_qs.annotate(
-            relevance=Case(
-                When(barcode__iexact=q, then=Value(1)),
-                When(barcode__icontains=q, then=Value(2)),
-                When(name__istartswith=q, then=Value(3)),
-                When(name__icontains=q, then=Value(4)),
-                When(
-                    category__name__icontains=q,
-                    then=Value(5),
-                ),
-                default=Value(6),
-                output_field=IntegerField(),
-            )
+
+@login_required
+def api_asset_search(request):
+    """JSON asset search for scanner clients and tooling (API v1).
+
+    Same matching and ranking as ``asset_search`` (including
+    ``mode=autocomplete``), but rows are ``values()`` projections with
+    no per-row model work. ``fields`` selects a comma-separated subset
+    of ``SEARCH_API_FIELDS`` (default: all); ``limit`` caps the rows
+    at 200.
+
+    Returns ``{"version": 1, "results": [...]}``, or 400 for an
+    unknown field or a non-integer ``limit``.
+    """
+    fields = [
+        f.strip()
+        for f in request.GET.get("fields", "").split(",")
+        if f.strip()
+    ] or list(SEARCH_API_FIELDS)
+    unknown = [f for f in fields if f not in SEARCH_API_FIELDS]
+    if unknown:
+        return JsonResponse(
+            {"error": f"Unknown field(s): {', '.join(unknown)}"},
+            status=400,
         )
-        .select_related("category", "current_location")
-        .prefetch_related(primary_image_prefetch)
-        .order_by("relevance", "name")[:limit]
-    )
+    try:
+        limit = _search_limit(request, maximum=200)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
     results = []
-    for a in qs:
-        primary = a.primary_images[0] if a.primary_images else None
-        thumbnail_url = primary.thumbnail_url if primary else ""
-        results.append(
-            {
-                "id": a.id,
-                "name": a.name,
-                "barcode": a.barcode,
-                "category": a.category.name if a.category else "",
-                "location": (
-                    str(a.current_location) if a.current_location else ""
-                ),
-                "thumbnail_url": thumbnail_url,
-            }
+    q = request.GET.get("q", "").strip()[:200]
+    if q:
+        results = project_asset_search(
+            _ranked_asset_search(q, request.GET.get("mode")),
+            fields,
+            limit,
         )
-    return JsonResponse(results, safe=False)
+    return JsonResponse({"version": 1, "results": results})
+
+
+MOVEMENT_SERIES_DEFAULT_DAYS = 30
+MOVEMENT_SERIES_MAX_DAYS = 366
+
+
+def _movement_series_params(request) -> dict:
+    """Parse the movement series query string into ``movement_series``
+    arguments, scoping department managers to their departments.
+
+    Raises:
+        ValueError: A parameter is malformed or out of range.
+    """
+    today = timezone.localdate()
+    try:
+        end = datetime.date.fromisoformat(request.GET.get("end") or str(today))
+        start = datetime.date.fromisoformat(
+            request.GET.get("start")
+            or str(
+                end - datetime.timedelta(days=MOVEMENT_SERIES_DEFAULT_DAYS - 1)
+            )
+        )
+    except ValueError:
+        raise ValueError("Dates must be YYYY-MM-DD")
+    if start > end:
+        raise ValueError("start must not be after end")
+    if (end - start).days >= MOVEMENT_SERIES_MAX_DAYS:
+        raise ValueError(
+            f"Range must be at most {MOVEMENT_SERIES_MAX_DAYS} days"
+        )
+
+    group_by = request.GET.get("group_by") or "action"
+    if group_by not in GROUP_BY_CHOICES:
+        raise ValueError(
+            f"group_by must be one of: {', '.join(GROUP_BY_CHOICES)}"
+        )
+
+    ids = {}
+    for param in ("department", "category", "location"):
+        value = request.GET.get(param)
+        if value:
+            if not value.isdigit():
+                raise ValueError(f"{param} must be an id")
+            ids[param] = int(value)
+
+    department_ids = None
+    if get_user_role(request.user) == "department_manager":
+        department_ids = list(
+            Department.objects.filter(managers=request.user).values_list(
+                "pk", flat=True
+            )
+        )
+    if "department" in ids:
+        if department_ids is not None and (
+            ids["department"] not in department_ids
+        ):
+            department_ids = []
+        else:
+            department_ids = [ids["department"]]
+    return {
+        "start": start,
+        "end": end,
+        "group_by": group_by,
+        "department_ids": department_ids,
+        "category_id": ids.get("category"),
+        "location_id": ids.get("location"),
+    }
+
+
+@login_required
+def api_movement_series(request):
+    """JSON daily movement time series from the rollups (API v1).
+
+    Query parameters: ``start`` and ``end`` (ISO dates, default the
+    last 30 days, at most 366 days), ``department``, ``category`` and
+    ``location`` ids to filter by, and ``group_by`` (``action``,
+    ``department``, ``category`` or ``location``). Department managers
+    only see their departments' movements.
+
+    Returns ``{"version": 1, "days": [...], "series": [...]}``, or 400
+    for an invalid parameter.
+    """
+    try:
+        params = _movement_series_params(request)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    return JsonResponse({"version": 1, **movement_series(**params)})
+
+
+@login_required
+def dashboard_movement_chart(request):
+    """HTMX partial: stacked daily movement bars for the dashboard."""
+    try:
+        params = _movement_series_params(request)
+    except ValueError as e:
+        return HttpResponse(str(e), status=400)
+    params["group_by"] = "action"
+    data = movement_series(**params)
+    peak = max(
+        (sum(day) for day in zip(*(s["counts"] for s in data["series"]))),
+        default=0,
+    )
+    days = [
+        {
+            "date": day,
+            "total": sum(s["counts"][i] for s in data["series"]),
+            "segments": [
+                {
+                    "action": s["key"],
+                    "label": s["label"],
+                    "count": s["counts"][i],
+                    "percent": round(100 * s["counts"][i] / peak, 1),
+                }
+                for s in data["series"]
+                if s["counts"][i]
+            ],
+        }
+        for i, day in enumerate(data["days"])
+    ]
+    return render(
+        request,
+        "assets/partials/movement_chart.html",
+        {
+            "days": days,
+            "series": data["series"],
+            "start": params["start"],
+            "end": params["end"],
+        },
+    )
 
 
 @login_required
@@ -3914,11 +3996,8 @@ def stocktake_confirm(request, pk):
         # Handle scanned code
         code = request.POST.get("code", "").strip()
         if code:
-            found_asset = None
-            try:
-                found_asset = Asset.objects.get(barcode=code)
-            except Asset.DoesNotExist:
-                found_asset = NFCTag.get_asset_by_tag(code)
+            match = lookup_identifier(code, kinds=("barcode", "nfc"))
+            found_asset = match.asset if match else None
 
             if found_asset:
                 session.confirmed_assets.add(found_asset)
@@ -4031,7 +4110,9 @@ def stocktake_complete(request, pk):
                 missing = session.missing_assets.filter(
                     checked_out_to__isnull=True
                 )
-                missing_count = missing.update(status="missing")
+                with tracking_asset_statistics(missing):
+                    missing_count = missing.update(status="missing")
+                bump_catalogue_version()
                 # M7: Update StocktakeItems and create Transactions
                 missing_items = session.items.filter(status="expected")
                 for item in missing_items.select_related("asset"):
@@ -4143,74 +4224,305 @@ def lost_stolen_report(request):
 # --- Export ---
 
 
+def _can_export(user) -> bool:
+    if user.has_perm("assets.can_export_assets"):
+        return True
+    return get_user_role(user) in (
+        "system_admin",
+        "department_manager",
+        "member",
+    )
+
+
 @login_required
 def export_assets(request):
-    """Export assets to Excel."""
-    if not request.user.has_perm("assets.can_export_assets"):
-        role = get_user_role(request.user)
-        if role not in ("system_admin", "department_manager", "member"):
-            return HttpResponseForbidden("Permission denied")
-    from .services.export import export_assets_xlsx
-
-    queryset = Asset.objects.with_related().select_related("created_by")
+    """Export assets to Excel.
 
-    # Exclude disposed by default unless explicitly included
-    include_disposed = request.GET.get("include_disposed")
-    if not include_disposed:
-        queryset = queryset.exclude(status="disposed")
+    Small exports stream within the request. Larger ones (or
+    ``?background=1``) are handed to a background export job and the
+    user is sent to its progress page.
+    """
+    if not _can_export(request.user):
+        return HttpResponseForbidden("Permission denied")
+    from .services.bulk import validate_filter_params
+    from .services.export import XLSX_CONTENT_TYPE, export_assets_xlsx_file
+    from .services.export_jobs import (
+        SYNC_EXPORT_MAX_ASSETS,
+        export_params,
+        export_queryset,
+        request_export,
+    )
 
     # Apply same filters as asset_list
-    status = request.GET.get("status")
-    if status:
-        queryset = queryset.filter(status=status)
+    filters = validate_filter_params(
+        {
+            **{k: request.GET.get(k, "") for k in FACET_DIMENSIONS},
+            "q": request.GET.get("q", "").strip()[:200],
+        }
+    )
+    params = export_params(
+        filters, include_disposed=bool(request.GET.get("include_disposed"))
+    )
+    queryset = export_queryset(params)
 
-    department = request.GET.get("department")
-    if department:
-        queryset = queryset.filter(category__department_id=department)
+    if (
+        request.GET.get("background")
+        or queryset.count() > SYNC_EXPORT_MAX_ASSETS
+    ):
+        job = request_export(params, request.user)
+        return redirect("assets:export_job_status", job_id=job.job_id)
 
-    category = request.GET.get("category")
-    if category:
-        queryset = queryset.filter(category_id=category)
+    from datetime import date
 
-    location = request.GET.get("location")
-    if location:
-        if location == "checked_out":
-            queryset = queryset.filter(checked_out_to__isnull=False)
-        else:
-            queryset = queryset.filter(current_location_id=location)
+    filename = f"props-assets-export-{date.today().isoformat()}.xlsx"
+    # Streamed from a spooled file; FileResponse closes it when done
+    return FileResponse(
+        export_assets_xlsx_file(queryset),
+        as_attachment=True,
+        filename=filename,
+        content_type=XLSX_CONTENT_TYPE,
+    )
 
-    tag = request.GET.get("tag")
-    if tag:
-        queryset = queryset.filter(tags__id=tag)
 
-    condition = request.GET.get("condition")
-    if condition:
-        queryset = queryset.filter(condition=condition)
+@login_required
+def export_data(request, dataset):
+    """Export a flat dataset as CSV, NDJSON or Parquet.
 
-    q = request.GET.get("q", "").strip()[:200]
-    if q:
+    Takes the same asset filters as ``export_assets``. CSV and NDJSON
+    are streamed batch by batch; Parquet is written to a spooled file
+    first because its footer is only known once every row is written.
+    """
+    if not _can_export(request.user):
+        return HttpResponseForbidden("Permission denied")
+    from .services.bulk import validate_filter_params
+    from .services.export_jobs import export_params
+    from .services.tabular_export import (
+        DATASETS,
+        EXPORT_FORMATS,
+        export_rows_queryset,
+        stream_csv,
+        stream_ndjson,
+        write_parquet,
+    )
 
-        queryset = build_asset_search(
-            queryset, q, include_nfc=False, include_category=True
-        )
+    fmt = request.GET.get("format", "csv")
+    if dataset not in DATASETS or fmt not in EXPORT_FORMATS:
+        from django.http import Http404
 
-    buffer = export_assets_xlsx(queryset)
+        raise Http404("Unknown export.")
 
-    response = HttpResponse(
-        buffer.getvalue(),
-        content_type="application/vnd.openxmlformats-officedocument"
-        ".spreadsheetml.sheet",
+    filters = validate_filter_params(
+        {
+            **{k: request.GET.get(k, "") for k in FACET_DIMENSIONS},
+            "q": request.GET.get("q", "").strip()[:200],
+        }
+    )
+    params = export_params(
+        filters, include_disposed=bool(request.GET.get("include_disposed"))
+    )
+    queryset = export_rows_queryset(dataset, params)
+    filename = (
+        f"props-{dataset.replace('_', '-')}-"
+        f"{timezone.localdate().isoformat()}.{fmt}"
     )
-    from datetime import date
 
-    filename = f"props-assets-export-{date.today().isoformat()}.xlsx"
+    if fmt == "parquet":
+        return FileResponse(
+            write_parquet(dataset, queryset),
+            as_attachment=True,
+            filename=filename,
+            content_type=EXPORT_FORMATS[fmt],
+        )
+    stream = stream_csv if fmt == "csv" else stream_ndjson
+    response = StreamingHttpResponse(
+        stream(dataset, queryset), content_type=EXPORT_FORMATS[fmt]
+    )
     response["Content-Disposition"] = f'attachment; filename="{filename}"'
     return response
 
 
+@login_required
+def export_job_status(request, job_id):
+    """Show a background export's progress; polled over HTMX."""
+    if not _can_export(request.user):
+        return HttpResponseForbidden("Permission denied")
+    from .services.export_jobs import export_download_url
+
+    job = get_object_or_404(ExportJob, job_id=job_id)
+    context = {
+        "job": job,
+        "download_url": (
+            export_download_url(job) if job.status == "completed" else None
+        ),
+    }
+    template = "assets/export_job.html"
+    if getattr(request, "htmx", False):
+        template = "assets/partials/export_job_status.html"
+    return render(request, template, context)
+
+
+@login_required
+def export_job_download(request, job_id):
+    """Serve a completed export file for a valid signed link."""
+    if not _can_export(request.user):
+        return HttpResponseForbidden("Permission denied")
+    from .services.export import XLSX_CONTENT_TYPE
+    from .services.export_jobs import verify_download_token
+
+    job = get_object_or_404(ExportJob, job_id=job_id, status="completed")
+    if not verify_download_token(job, request.GET.get("token", "")):
+        return HttpResponseForbidden("Download link is invalid or expired")
+    return FileResponse(
+        job.file.open("rb"),
+        as_attachment=True,
+        filename=(
+            f"props-assets-export-{job.created_at.date().isoformat()}.xlsx"
+        ),
+        content_type=XLSX_CONTENT_TYPE,
+    )
+
+
+# --- Bulk Import ---
+
+
+def _can_import(user) -> bool:
+    return get_user_role(user) in (
+        "system_admin",
+        "department_manager",
+        "member",
+    )
+
+
+def _get_import_job(request, job_id) -> ImportJob:
+    """Return the job if the user started it (admins see every job)."""
+    job = get_object_or_404(ImportJob, job_id=job_id)
+    if job.requested_by_id != request.user.pk and (
+        get_user_role(request.user) != "system_admin"
+    ):
+        raise PermissionDenied
+    return job
+
+
+@login_required
+def asset_import(request):
+    """Upload a CSV/XLSX sheet of assets for validation and import."""
+    if not _can_import(request.user):
+        raise PermissionDenied
+    from .services.asset_import import (
+        IMPORT_COLUMNS,
+        IMPORT_FILE_TYPES,
+        MAX_IMPORT_ROWS,
+    )
+
+    error = None
+    if request.method == "POST":
+        upload = request.FILES.get("file")
+        if upload is None:
+            error = "Choose a file to import."
+        elif not upload.name.lower().endswith(IMPORT_FILE_TYPES):
+            error = "Upload a .csv or .xlsx file."
+        else:
+            job = ImportJob.objects.create(
+                file=upload,
+                original_filename=upload.name[:255],
+                requested_by=request.user,
+            )
+            from .tasks import validate_asset_import
+
+            transaction.on_commit(lambda: validate_asset_import.delay(job.pk))
+            return redirect("assets:import_job_status", job_id=job.job_id)
+
+    recent_jobs = ImportJob.objects.filter(requested_by=request.user)[:5]
+    return render(
+        request,
+        "assets/asset_import.html",
+        {
+            "columns": IMPORT_COLUMNS,
+            "max_rows": MAX_IMPORT_ROWS,
+            "recent_jobs": recent_jobs,
+            "error": error,
+        },
+        status=400 if error else 200,
+    )
+
+
+@login_required
+def import_job_status(request, job_id):
+    """Show an import's validation result or progress; polled over HTMX."""
+    job = _get_import_job(request, job_id)
+    template = "assets/import_job.html"
+    if getattr(request, "htmx", False):
+        template = "assets/partials/import_job_status.html"
+    return render(request, template, {"job": job})
+
+
+@login_required
+def import_job_commit(request, job_id):
+    """Start importing a job that validated cleanly."""
+    if request.method != "POST":
+        return HttpResponseNotAllowed(["POST"])
+    job = _get_import_job(request, job_id)
+    from .services.asset_import import queue_import_job
+
+    if not queue_import_job(job):
+        messages.error(request, "This import is not ready to run.")
+    return redirect("assets:import_job_status", job_id=job.job_id)
+
+
 # --- Bulk Operations ---
 
 
+def _bulk_job_messages(request, job) -> None:
+    """Flash the outcome of a completed or failed bulk job."""
+    if job.status == "failed":
+        messages.error(request, f"Bulk action failed: {job.error_message}")
+        return
+    messages.success(request, f"{job.succeeded} asset(s) {job.result_label}.")
+    skipped = job.skipped
+    if not job.skipped_count:
+        return
+    if job.action == "transfer":
+        messages.warning(
+            request,
+            f"{job.skipped_count} checked-out asset(s) were skipped: "
+            f"{', '.join(skipped)}. Check them in before transferring.",
+        )
+    elif job.action == "status_change":
+        fail_summary = "; ".join(skipped[:5])
+        if job.skipped_count > 5:
+            fail_summary += f" and {job.skipped_count - 5} more"
+        messages.warning(
+            request,
+            f"{job.skipped_count} asset(s) could not be updated: "
+            f"{fail_summary}",
+        )
+    else:
+        reason = (
+            "already checked out"
+            if job.action == "checkout"
+            else "not checked out"
+        )
+        messages.warning(
+            request,
+            f"{job.skipped_count} asset(s) skipped ({reason}): "
+            f"{', '.join(skipped[:5])}",
+        )
+
+
+@login_required
+def bulk_job_status(request, job_id):
+    """Show a background bulk operation's progress; polled over HTMX."""
+    job = get_object_or_404(BulkJob, job_id=job_id)
+    if job.requested_by_id != request.user.pk and (
+        get_user_role(request.user) != "system_admin"
+    ):
+        raise PermissionDenied
+    template = "assets/bulk_job.html"
+    if getattr(request, "htmx", False):
+        template = "assets/partials/bulk_job_status.html"
+    return render(request, template, {"job": job})
+
+
 @login_required
 def bulk_actions(request):
     """Handle bulk actions on selected assets."""
@@ -4240,8 +4552,10 @@ def bulk_actions(request):
             "is_kit": request.POST.get("filter_is_kit", ""),
         }
         filters = validate_filter_params(raw_filters)
-        queryset = build_asset_filter_queryset(filters)
-        asset_ids = list(queryset.values_list("pk", flat=True))
+        asset_ids = cached_asset_pks(filters)
+        if asset_ids is None:
+            queryset = build_asset_filter_queryset(filters)
+            asset_ids = list(queryset.values_list("pk", flat=True))
         asset_ids = [str(i) for i in asset_ids]
     else:
         asset_ids = request.POST.getlist("asset_ids")
@@ -4257,42 +4571,30 @@ def bulk_actions(request):
         if not location_id:
             messages.error(request, "Please select a location for transfer.")
             return redirect("assets:asset_list")
-        from .services.bulk import bulk_transfer
-
-        result = bulk_transfer(
-            [int(i) for i in asset_ids], int(location_id), request.user
+        job = start_bulk_job(
+            "transfer",
+            asset_ids,
+            {"location_id": int(location_id)},
+            request.user,
         )
-        count = result["transferred"]
-        skipped = result["skipped"]
-        messages.success(request, f"{count} asset(s) transferred.")
-        if skipped:
-            skipped_list = ", ".join(skipped)
-            messages.warning(
-                request,
-                f"{len(skipped)} checked-out asset(s) were skipped: "
-                f"{skipped_list}. Check them in before transferring.",
-            )
+        if job.is_in_flight:
+            return redirect("assets:bulk_job_status", job_id=job.job_id)
+        _bulk_job_messages(request, job)
 
     elif action == "status_change":
         new_status = request.POST.get("new_status")
         if not new_status:
             messages.error(request, "Please select a status.")
             return redirect("assets:asset_list")
-        from .services.bulk import bulk_status_change
-
-        count, failures = bulk_status_change(
-            [int(i) for i in asset_ids], new_status, request.user
+        job = start_bulk_job(
+            "status_change",
+            asset_ids,
+            {"new_status": new_status},
+            request.user,
         )
-        messages.success(request, f"{count} asset(s) updated.")
-        if failures:
-            fail_summary = "; ".join(failures[:5])
-            if len(failures) > 5:
-                fail_summary += f" and {len(failures) - 5} more"
-            messages.warning(
-                request,
-                f"{len(failures)} asset(s) could not be updated: "
-                f"{fail_summary}",
-            )
+        if job.is_in_flight:
+            return redirect("assets:bulk_job_status", job_id=job.job_id)
+        _bulk_job_messages(request, job)
 
     elif action == "bulk_edit":
         edit_category = request.POST.get("edit_category")
@@ -4329,24 +4631,21 @@ def bulk_actions(request):
                     action_date = timezone.make_aware(action_date)
                 if action_date <= timezone.now():
                     bulk_timestamp = action_date
-        from .services.bulk import bulk_checkout
-
-        result = bulk_checkout(
-            [int(i) for i in asset_ids],
-            int(borrower_id),
+        job = start_bulk_job(
+            "checkout",
+            asset_ids,
+            {
+                "borrower_id": int(borrower_id),
+                "notes": "Bulk checkout",
+                "timestamp": (
+                    bulk_timestamp.isoformat() if bulk_timestamp else None
+                ),
+            },
             request.user,
-            notes="Bulk checkout",
-            timestamp=bulk_timestamp,
-        )
-        messages.success(
-            request, f"{result['checked_out']} asset(s) checked out."
         )
-        if result["skipped"]:
-            messages.warning(
-                request,
-                f"{len(result['skipped'])} asset(s) skipped "
-                f"(already checked out): {', '.join(result['skipped'][:5])}",
-            )
+        if job.is_in_flight:
+            return redirect("assets:bulk_job_status", job_id=job.job_id)
+        _bulk_job_messages(request, job)
 
     elif action == "bulk_checkin":
         checkin_location_id = request.POST.get("bulk_checkin_location")
@@ -4364,24 +4663,21 @@ def bulk_actions(request):
                     action_date = timezone.make_aware(action_date)
                 if action_date <= timezone.now():
                     bulk_timestamp = action_date
-        from .services.bulk import bulk_checkin
-
-        result = bulk_checkin(
-            [int(i) for i in asset_ids],
-            int(checkin_location_id),
+        job = start_bulk_job(
+            "checkin",
+            asset_ids,
+            {
+                "location_id": int(checkin_location_id),
+                "notes": "Bulk check-in",
+                "timestamp": (
+                    bulk_timestamp.isoformat() if bulk_timestamp else None
+                ),
+            },
             request.user,
-            notes="Bulk check-in",
-            timestamp=bulk_timestamp,
-        )
-        messages.success(
-            request, f"{result['checked_in']} asset(s) checked in."
         )
-        if result["skipped"]:
-            messages.warning(
-                request,
-                f"{len(result['skipped'])} asset(s) skipped "
-                f"(not checked out): {', '.join(result['skipped'][:5])}",
-            )
+        if job.is_in_flight:
+            return redirect("assets:bulk_job_status", job_id=job.job_id)
+        _bulk_job_messages(request, job)
 
     elif action == "print_labels":
         assets = Asset.objects.filter(pk__in=asset_ids)
@@ -5123,9 +5419,13 @@ def holdlist_list(request):
     statuses = HoldListStatus.objects.all()
 
     # L24: Pagination
-    paginator = Paginator(qs, 25)
-    page_number = request.GET.get("page", 1)
-    page_obj = paginator.get_page(page_number)
+    page_obj = paginate(
+        request,
+        qs,
+        25,
+        ordering=["-created_at"],
+        estimate=not (status_filter or project_filter),
+    )
 
     return render(
         request,
@@ -5155,7 +5455,9 @@ def holdlist_detail(request, pk):
     ).prefetch_related(
         Prefetch(
             "asset__images",
-            queryset=AssetImage.objects.filter(is_primary=True),
+            queryset=AssetImage.objects.filter(
+                is_primary=True
+            ).prefetch_related("renditions"),
             to_attr="primary_images",
         )
     )
@@ -4,6 +4,7 @@ import os
 from pathlib import Path
 
 import sentry_sdk
+from celery.schedules import crontab
 
 from django.urls import reverse_lazy
 
@@ -273,6 +274,25 @@ CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
+# Installed into django_celery_beat's DatabaseScheduler on beat startup
+CELERY_BEAT_SCHEDULE = {
+    "checkpoint-transaction-ledger": {
+        "task": "assets.tasks.checkpoint_transaction_ledger",
+        "schedule": 15 * 60,
+    },
+    "resume-stale-bulk-jobs": {
+        "task": "assets.tasks.resume_stale_bulk_jobs",
+        "schedule": 5 * 60,
+    },
+    "reconcile-asset-statistics": {
+        "task": "assets.tasks.reconcile_asset_statistics",
+        "schedule": crontab(hour=3, minute=30),
+    },
+    "advance-movement-rollups": {
+        "task": "assets.tasks.advance_movement_rollups",
+        "schedule": 15 * 60,
+    },
+}
 
 # Django Channels — Redis channel layer (§4.10.7)
 CHANNEL_LAYERS = {
@@ -309,6 +329,12 @@ AI_ANALYSIS_DAILY_LIMIT = int(os.environ.get("AI_ANALYSIS_DAILY_LIMIT", "100"))
 AI_MAX_IMAGE_PIXELS = int(os.environ.get("AI_MAX_IMAGE_PIXELS", "3000000"))
 AI_REQUEST_TIMEOUT = int(os.environ.get("AI_REQUEST_TIMEOUT", "60"))
 
+# Responsive image renditions: WebP is always built; AVIF encodes are
+# several times slower, so it is opt-in.
+IMAGE_AVIF_RENDITIONS = os.environ.get(
+    "IMAGE_AVIF_RENDITIONS", "False"
+).lower() in ("true", "1", "yes")
+
 # Brand colour palette for unfold theme
 from props.colors import generate_oklch_palette
 
@@ -8,6 +8,10 @@ from django.http import FileResponse, Http404, JsonResponse
 
 def media_proxy(request, path):
     """Proxy media files from S3 storage through Django."""
+    # Export files are only served through signed download links;
+    # uploaded import sheets are never served
+    if path.startswith(("exports/", "imports/")):
+        raise Http404
     try:
         f = default_storage.open(path)
     except Exception: